@@ -5,6 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException, Response, status
 from app.core.auth import require_auth
 from app.core.config import settings
 from app.core.exceptions import SupabaseAuthError, ValidationError
+from app.core.rate_limit import limit_by_client
+from app.core.routing import SessionReleasingRoute
 from app.models.domain.user import User
 from app.models.requests import TokenRequest
 from app.models.responses import (
@@ -16,7 +18,7 @@ from app.models.responses import (
 from app.services.auth_service import AuthService
 from app.services.dependencies import get_auth_service
 
-router = APIRouter()
+router = APIRouter(route_class=SessionReleasingRoute)
 
 
 @router.get("/me", response_model=UserPublic, operation_id="getCurrentUser")
@@ -26,7 +28,12 @@ async def get_current_user_info(
     return UserPublic.model_validate(authenticated_user)
 
 
-@router.post("/login", response_model=LoginResponse, operation_id="login")
+@router.post(
+    "/login",
+    response_model=LoginResponse,
+    operation_id="login",
+    dependencies=[Depends(limit_by_client)],
+)
 async def login_with_cookie(
     token_request: TokenRequest,
     response: Response,
@@ -57,7 +64,12 @@ async def login_with_cookie(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.post("/refresh", response_model=RefreshResponse, operation_id="refreshToken")
+@router.post(
+    "/refresh",
+    response_model=RefreshResponse,
+    operation_id="refreshToken",
+    openapi_extra={"x-rate-limit": "auth"},
+)
 async def refresh_token(
     response: Response,
     authenticated_user: Annotated[User, Depends(require_auth)],
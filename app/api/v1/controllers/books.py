@@ -1,18 +1,40 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
 from app.core.auth import RequirePermission
+from app.core.etag import compute_etag, etag_matches, not_modified
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.pagination import PageResult
 from app.core.permissions import Permission
+from app.core.responses import model_response
+from app.core.routing import SessionReleasingRoute
 from app.models.domain.user import User
-from app.models.requests.book_requests import BookCreate, BookUpdate
-from app.models.responses.book_responses import BookPublic
+from app.models.requests.book_requests import (
+    BookBatchGetRequest,
+    BookCreate,
+    BookUpdate,
+)
+from app.models.responses.book_responses import (
+    BookBatchResponse,
+    BookImportResult,
+    BookPublic,
+    BookSuggestion,
+)
+from app.models.responses.page_responses import Page
+from app.services.book_import_service import BookImportService
 from app.services.book_service import BookService
-from app.services.dependencies import get_book_service
+from app.services.book_suggestions import MIN_PREFIX_LENGTH
+from app.services.dependencies import get_book_import_service, get_book_service
+
+router = APIRouter(route_class=SessionReleasingRoute)
 
-router = APIRouter()
+
+def _page_etag(page: PageResult) -> str:
+    return compute_etag(
+        page.next_cursor, *((book.id, book.updated_at) for book in page.items)
+    )
 
 
 @router.post("/", response_model=BookPublic, status_code=201, operation_id="createBook")
@@ -30,34 +52,116 @@ async def create_book(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/", response_model=List[BookPublic], operation_id="getBooks")
+@router.post(
+    "/bulk",
+    response_model=BookImportResult,
+    operation_id="importBooks",
+    openapi_extra={"x-rate-limit": "bulk"},
+)
+async def import_books(
+    request: Request,
+    authenticated_user: Annotated[
+        User, Depends(RequirePermission(Permission.IMPORT_BOOKS))
+    ],
+    import_service: Annotated[BookImportService, Depends(get_book_import_service)],
+    file_format: Optional[str] = Query(
+        None,
+        alias="format",
+        description="ndjson or csv, defaults to the request content type",
+    ),
+) -> BookImportResult:
+    if file_format is None:
+        content_type = request.headers.get("content-type", "")
+        file_format = "csv" if content_type.startswith("text/csv") else "ndjson"
+
+    try:
+        return await import_service.import_books(request.stream(), file_format)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/", response_model=Page[BookPublic], operation_id="getBooks")
 async def get_books(
+    request: Request,
     authenticated_user: Annotated[
         User, Depends(RequirePermission(Permission.VIEW_BOOK))
     ],
     book_service: Annotated[BookService, Depends(get_book_service)],
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
-) -> List[BookPublic]:
-    if search:
-        books = await book_service.search_books(search)
-    else:
-        books = await book_service.get_all_books(skip=skip, limit=limit)
-    return [BookPublic.model_validate(book) for book in books]
+) -> Response:
+    try:
+        if search:
+            page = await book_service.search_books(search, cursor=cursor, limit=limit)
+        else:
+            if "if-none-match" in request.headers:
+                versions = await book_service.get_all_books_versions(cursor, limit)
+                etag = _page_etag(versions)
+                if etag_matches(request, etag):
+                    return not_modified(etag)
+            page = await book_service.get_all_books(cursor=cursor, limit=limit)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    etag = _page_etag(page)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return await model_response(Page[BookPublic], page, headers={"ETag": etag})
+
+
+@router.post(
+    "/batch-get",
+    response_model=BookBatchResponse,
+    operation_id="batchGetBooks",
+    openapi_extra={"x-rate-limit": "bulk", "x-read-only": True},
+)
+async def batch_get_books(
+    request: BookBatchGetRequest,
+    authenticated_user: Annotated[
+        User, Depends(RequirePermission(Permission.VIEW_BOOK))
+    ],
+    book_service: Annotated[BookService, Depends(get_book_service)],
+) -> Response:
+    books, missing = await book_service.get_books_by_ids(request.ids)
+    return await model_response(BookBatchResponse, {"items": books, "missing": missing})
+
+
+@router.get(
+    "/suggest", response_model=list[BookSuggestion], operation_id="suggestBooks"
+)
+async def suggest_books(
+    authenticated_user: Annotated[
+        User, Depends(RequirePermission(Permission.VIEW_BOOK))
+    ],
+    book_service: Annotated[BookService, Depends(get_book_service)],
+    prefix: str = Query(..., min_length=MIN_PREFIX_LENGTH, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+) -> Response:
+    return await model_response(
+        list[BookSuggestion], await book_service.suggest_books(prefix, limit)
+    )
 
 
 @router.get("/{book_id}", response_model=BookPublic, operation_id="getBook")
 async def get_book(
     book_id: UUID,
+    request: Request,
     authenticated_user: Annotated[
         User, Depends(RequirePermission(Permission.VIEW_BOOK))
     ],
     book_service: Annotated[BookService, Depends(get_book_service)],
-) -> BookPublic:
+) -> Response:
     try:
+        if "if-none-match" in request.headers:
+            updated_at = await book_service.get_book_version(book_id)
+            etag = compute_etag(book_id, updated_at)
+            if updated_at and etag_matches(request, etag):
+                return not_modified(etag)
+
         book = await book_service.get_book_by_id(book_id)
-        return BookPublic.model_validate(book)
+        etag = compute_etag(book.id, book.updated_at)
+        return await model_response(BookPublic, book, headers={"ETag": etag})
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -1,11 +1,17 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, Literal, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.core.auth import RequirePermission
+from app.core.database import session_scope
+from app.core.etag import compute_etag, etag_matches, not_modified
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.pagination import PageResult
 from app.core.permissions import Permission
+from app.core.responses import model_response
+from app.core.routing import SessionReleasingRoute
 from app.models.domain.reading_entry import ReadingStatus
 from app.models.domain.user import User
 from app.models.requests.reading_entry_requests import (
@@ -13,17 +19,28 @@ from app.models.requests.reading_entry_requests import (
     UpdateProgressRequest,
     UpdateReviewRequest,
 )
-from app.models.responses.reading_entry_responses import ReadingEntryPublic
+from app.models.responses.page_responses import Page
+from app.models.responses.reading_entry_responses import (
+    ReadingEntryPublic,
+    ReadingEntryWithBook,
+)
 from app.services.dependencies import get_reading_entry_service
-from app.services.reading_entry_service import ReadingEntryService
+from app.services.reading_entry_service import ReadingEntryService, entry_version
+
+router = APIRouter(route_class=SessionReleasingRoute)
+
 
-router = APIRouter()
+def _page_etag(versions: PageResult[tuple], include_book: bool) -> str:
+    return compute_etag(include_book, versions.next_cursor, *versions.items)
 
 
 @router.get(
-    "/", response_model=List[ReadingEntryPublic], operation_id="getReadingEntries"
+    "/",
+    response_model=Page[Union[ReadingEntryWithBook, ReadingEntryPublic]],
+    operation_id="getReadingEntries",
 )
 async def get_reading_entries(
+    request: Request,
     service: Annotated[ReadingEntryService, Depends(get_reading_entry_service)],
     authenticated_user: Annotated[
         User, Depends(RequirePermission(Permission.VIEW_OWN_READING_ENTRIES))
@@ -32,24 +49,97 @@ async def get_reading_entries(
     status: Optional[ReadingStatus] = Query(
         None, description="Filter by reading status"
     ),
-) -> List[ReadingEntryPublic]:
-    entries = await service.get_user_entries(user_id, status)
-    return [ReadingEntryPublic.model_validate(entry) for entry in entries]
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    include: Optional[Literal["book"]] = Query(
+        None, description="Embed related resources"
+    ),
+) -> Response:
+    include_book = include == "book"
+    response_model = ReadingEntryWithBook if include_book else ReadingEntryPublic
+    try:
+        if "if-none-match" in request.headers:
+            versions = await service.get_user_entries_versions(
+                user_id, status, cursor, limit, include_book=include_book
+            )
+            etag = _page_etag(versions, include_book)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+        page = await service.get_user_entries(
+            user_id, status, cursor, limit, include_book=include_book
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = _page_etag(
+        PageResult(
+            [entry_version(entry, include_book) for entry in page.items],
+            page.next_cursor,
+        ),
+        include_book,
+    )
+    return await model_response(Page[response_model], page, headers={"ETag": etag})
+
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get(
+    "/export",
+    operation_id="exportReadingEntries",
+    openapi_extra={"x-rate-limit": "bulk"},
+)
+async def export_reading_entries(
+    authenticated_user: Annotated[
+        User, Depends(RequirePermission(Permission.VIEW_OWN_READING_ENTRIES))
+    ],
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+) -> StreamingResponse:
+    user_id = authenticated_user.id
+
+    async def stream_library():
+        # The request-scoped session is closed before the body is streamed,
+        # so the export owns its session for the lifetime of the response.
+        async with session_scope() as session:
+            service = ReadingEntryService(session)
+            async for chunk in service.export_library(user_id, format):
+                yield chunk
+
+    return StreamingResponse(
+        stream_library(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="library.{format}"'},
+    )
 
 
 @router.get(
-    "/{entry_id}", response_model=ReadingEntryPublic, operation_id="getReadingEntry"
+    "/{entry_id}",
+    response_model=Union[ReadingEntryWithBook, ReadingEntryPublic],
+    operation_id="getReadingEntry",
 )
 async def get_reading_entry(
     entry_id: UUID,
+    request: Request,
     authenticated_user: Annotated[
         User, Depends(RequirePermission(Permission.VIEW_READING_ENTRY))
     ],
     service: Annotated[ReadingEntryService, Depends(get_reading_entry_service)],
-) -> ReadingEntryPublic:
+    include: Optional[Literal["book"]] = Query(
+        None, description="Embed related resources"
+    ),
+) -> Response:
+    include_book = include == "book"
+    response_model = ReadingEntryWithBook if include_book else ReadingEntryPublic
     try:
-        entry = await service.get_entry_by_id(entry_id)
-        return ReadingEntryPublic.model_validate(entry)
+        if "if-none-match" in request.headers:
+            version = await service.get_entry_version(entry_id, include_book)
+            etag = compute_etag(include_book, *(version or ()))
+            if version and etag_matches(request, etag):
+                return not_modified(etag)
+
+        entry = await service.get_entry_by_id(entry_id, include_book=include_book)
+        etag = compute_etag(include_book, *entry_version(entry, include_book))
+        return await model_response(response_model, entry, headers={"ETag": etag})
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
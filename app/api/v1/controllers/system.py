@@ -0,0 +1,34 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.auth import RequirePermission
+from app.core.database import engine, replica_engine
+from app.core.permissions import Permission
+from app.core.routing import SessionReleasingRoute
+from app.models.domain.user import User
+from app.models.responses.system_responses import PoolStatsPublic
+
+router = APIRouter(route_class=SessionReleasingRoute)
+
+
+@router.get("/pool", response_model=PoolStatsPublic, operation_id="getPoolStats")
+async def get_pool_stats(
+    authenticated_user: Annotated[
+        User, Depends(RequirePermission(Permission.VIEW_SYSTEM_STATS))
+    ],
+    replica: bool = Query(False, description="Report the read replica's pool"),
+) -> PoolStatsPublic:
+    """Connection pool state of the worker that serves this request"""
+    if replica and replica_engine is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="No read replica configured"
+        )
+
+    stats = (replica_engine if replica else engine).pool.stats()
+    return PoolStatsPublic(
+        **stats._asdict(),
+        wait_seconds_avg=(
+            stats.wait_seconds_total / stats.checkouts if stats.checkouts else 0.0
+        ),
+    )
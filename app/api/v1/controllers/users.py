@@ -1,34 +1,42 @@
-from typing import Annotated, List
+from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from app.core.auth import RequirePermission, require_auth
 from app.core.exceptions import NotFoundError, ValidationError
 from app.core.permissions import Permission
+from app.core.responses import model_response
+from app.core.routing import SessionReleasingRoute
 from app.models.domain.user import User
 from app.models.requests.user_requests import UserUpdate
+from app.models.responses.page_responses import Page
+from app.models.responses.reading_stats_responses import UserReadingStatsPublic
 from app.models.responses.user_responses import UserPublic
-from app.services.dependencies import get_user_service
+from app.services.dependencies import get_reading_stats_service, get_user_service
+from app.services.reading_stats_service import ReadingStatsService
 from app.services.user_service import UserService
 
-router = APIRouter()
+router = APIRouter(route_class=SessionReleasingRoute)
 
 
-@router.get("/", response_model=List[UserPublic], operation_id="getUsers")
+@router.get("/", response_model=Page[UserPublic], operation_id="getUsers")
 async def get_users(
     authenticated_user: Annotated[
         User, Depends(RequirePermission(Permission.VIEW_ALL_USERS))
     ],
     user_service: Annotated[UserService, Depends(get_user_service)],
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
     limit: int = Query(100, ge=1, le=1000),
     active_only: bool = Query(True),
-) -> List[UserPublic]:
-    users = await user_service.get_all_users(
-        skip=skip, limit=limit, active_only=active_only
-    )
-    return [UserPublic.model_validate(user) for user in users]
+) -> Response:
+    try:
+        page = await user_service.get_all_users(
+            cursor=cursor, limit=limit, active_only=active_only
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return await model_response(Page[UserPublic], page)
 
 
 @router.get("/{user_id}", response_model=UserPublic, operation_id="getUser")
@@ -38,14 +46,30 @@ async def get_user(
         User, Depends(RequirePermission(Permission.VIEW_USER_PROFILE))
     ],
     user_service: Annotated[UserService, Depends(get_user_service)],
-) -> UserPublic:
+) -> Response:
     try:
         user = await user_service.get_user_by_id(user_id)
-        return UserPublic.model_validate(user)
+        return await model_response(UserPublic, user)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
+@router.get(
+    "/{user_id}/stats",
+    response_model=UserReadingStatsPublic,
+    operation_id="getUserReadingStats",
+)
+async def get_user_reading_stats(
+    user_id: UUID,
+    authenticated_user: Annotated[
+        User, Depends(RequirePermission(Permission.VIEW_USER_PROFILE))
+    ],
+    stats_service: Annotated[ReadingStatsService, Depends(get_reading_stats_service)],
+    months: int = Query(12, ge=1, le=120, description="Months of completion history"),
+) -> UserReadingStatsPublic:
+    return await stats_service.get_user_stats(user_id, months)
+
+
 @router.put("/me", response_model=UserPublic, operation_id="updateOwnProfile")
 async def update_own_profile(
     user_update: UserUpdate,
@@ -61,3 +85,37 @@ async def update_own_profile(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch(
+    "/{user_id}/activate", response_model=UserPublic, operation_id="activateUser"
+)
+async def activate_user(
+    user_id: UUID,
+    authenticated_user: Annotated[
+        User, Depends(RequirePermission(Permission.ACTIVATE_USER))
+    ],
+    user_service: Annotated[UserService, Depends(get_user_service)],
+) -> UserPublic:
+    try:
+        user = await user_service.set_active(user_id, True)
+        return UserPublic.model_validate(user)
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.patch(
+    "/{user_id}/deactivate", response_model=UserPublic, operation_id="deactivateUser"
+)
+async def deactivate_user(
+    user_id: UUID,
+    authenticated_user: Annotated[
+        User, Depends(RequirePermission(Permission.DEACTIVATE_USER))
+    ],
+    user_service: Annotated[UserService, Depends(get_user_service)],
+) -> UserPublic:
+    try:
+        user = await user_service.set_active(user_id, False)
+        return UserPublic.model_validate(user)
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 
 from app.core.api import APIRoutes
-from .controllers import books, reading_entries, users, auth
+from .controllers import books, reading_entries, users, auth, system
 
 api_router = APIRouter()
 
@@ -28,3 +28,9 @@ api_router.include_router(
     prefix=APIRoutes.USERS.prefix,
     tags=APIRoutes.USERS.tags
 )
+
+api_router.include_router(
+    system.router,
+    prefix=APIRoutes.SYSTEM.prefix,
+    tags=APIRoutes.SYSTEM.tags
+)
@@ -0,0 +1,33 @@
+"""Recompute per-user reading statistics from reading entries.
+
+    python -m app.commands.rebuild_reading_stats
+    python -m app.commands.rebuild_reading_stats --user-id <uuid>
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from app.core.database import engine, session_scope
+from app.core.logging import setup_logging
+from app.services.reading_stats_service import ReadingStatsService
+
+
+async def rebuild(user_id: Optional[UUID]) -> None:
+    async with session_scope() as session:
+        await ReadingStatsService(session).rebuild(user_id)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild reading statistics")
+    parser.add_argument("--user-id", type=UUID, help="Only rebuild this user")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(rebuild(args.user_id))
+
+
+if __name__ == "__main__":
+    main()
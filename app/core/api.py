@@ -7,6 +7,7 @@ class APIRoutePrefix(StrEnum):
     BOOKS = "/books"
     READING_ENTRIES = "/reading-entries"
     USERS = "/users"
+    SYSTEM = "/system"
 
 
 class APITags(StrEnum):
@@ -14,6 +15,7 @@ class APITags(StrEnum):
     BOOKS = "books"
     READING_ENTRIES = "reading_entries"
     USERS = "users"
+    SYSTEM = "system"
 
 
 class APIRoute(NamedTuple):
@@ -43,6 +45,11 @@ class APIRoutes:
         tags=[APITags.USERS],
         description="Operations with users",
     )
+    SYSTEM = APIRoute(
+        prefix=APIRoutePrefix.SYSTEM,
+        tags=[APITags.SYSTEM],
+        description="Service diagnostics",
+    )
 
 
 api_metadata = {
@@ -57,5 +64,6 @@ api_metadata = {
             "description": "Manage reading progress and reviews",
         },
         {"name": APITags.USERS, "description": "Manage users and authentication"},
+        {"name": APITags.SYSTEM, "description": "Inspect the running service"},
     ]
 }
@@ -2,8 +2,11 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException, Request, status
 
+from app.core import logging as log_context
+from app.core import timing
 from app.core.config import settings
 from app.core.permissions import Permission, user_has_permission
+from app.core.rate_limit import limit_by_user
 from app.models.domain.user import User
 from app.services.auth_service import AuthService
 from app.services.dependencies import get_auth_service
@@ -29,7 +32,8 @@ async def require_auth(
             detail="Authentication required - please login",
         )
 
-    user = await auth_service.get_current_user(token)
+    with timing.measure("auth"):
+        user = await auth_service.get_current_user(token)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,6 +43,9 @@ async def require_auth(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
+
+    log_context.user_id.set(str(user.id))
+    await limit_by_user(request, user.id)
     return user
 
 
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from sqlmodel import Field
 from pydantic import PostgresDsn
@@ -39,6 +41,43 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Optional read replica; GET requests are served from it when set
+    POSTGRES_REPLICA_HOST: Optional[str] = Field(default=None)
+    POSTGRES_REPLICA_PORT: Optional[int] = Field(default=None)
+    # After a write, the client reads from the primary for this long
+    DB_READ_YOUR_WRITES_SECONDS: int = Field(default=5)
+    DB_PRIMARY_COOKIE_NAME: str = Field(default="db_primary_until")
+
+    @property
+    def DATABASE_REPLICA_URL(self) -> Optional[PostgresDsn]:
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_REPLICA_HOST,
+            port=self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        )
+
+    # Connection budget for the whole server, split evenly across workers
+    DB_POOL_SIZE: int = Field(default=20)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_POOL_TIMEOUT_SECONDS: float = Field(default=10.0)
+    DB_POOL_RECYCLE_SECONDS: int = Field(default=1800)
+    DB_POOL_PRE_PING: bool = Field(default=True)
+    DB_POOL_WARMUP: bool = Field(default=True)
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=500)
+
+    @property
+    def DB_POOL_SIZE_PER_WORKER(self) -> int:
+        return max(1, -(-self.DB_POOL_SIZE // max(1, self.SERVER_WORKERS_COUNT)))
+
+    @property
+    def DB_MAX_OVERFLOW_PER_WORKER(self) -> int:
+        return -(-self.DB_MAX_OVERFLOW // max(1, self.SERVER_WORKERS_COUNT))
+
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Book Tracker API"
 
@@ -58,6 +97,46 @@ class Settings(BaseSettings):
     CORS_ALLOW_HEADERS: list[str]
 
     TRUSTED_HOSTS: list[str]
+    # Add a Server-Timing header (auth, db, app, serialize, total) to responses
+    SERVER_TIMING: bool = Field(default=True)
+
+    # Logs go through a bounded queue to a writer thread; records that do not
+    # fit are dropped and counted. Sample rates keep a share of INFO/DEBUG
+    # records per logger, e.g. {"app.services.reading_entry_service": 0.1}
+    LOG_FORMAT: Literal["json", "text"] = Field(default="json")
+    LOG_QUEUE_SIZE: int = Field(default=10_000)
+    LOG_SAMPLE_RATES: dict[str, float] = Field(default_factory=dict)
+
+    # Statements slower than this are logged with their plan (0 disables)
+    SLOW_QUERY_SECONDS: float = Field(default=0.5)
+    SLOW_QUERY_EXPLAIN: bool = Field(default=True)
+    # Warn when one request runs the same statement more often (0 disables);
+    # with N_PLUS_ONE_RAISE the request fails instead, meant for tests
+    N_PLUS_ONE_THRESHOLD: int = Field(default=20)
+    N_PLUS_ONE_RAISE: bool = Field(default=False)
+
+    # Prometheus metrics at /metrics. Set METRICS_MULTIPROC_DIR when running
+    # several workers so the endpoint reports all of them
+    METRICS_ENABLED: bool = Field(default=True)
+    METRICS_MULTIPROC_DIR: Optional[str] = Field(default=None)
+
+    # Token-bucket rate limits per user (per client address for login)
+    RATE_LIMIT_ENABLED: bool = Field(default=True)
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = Field(default="memory")
+    RATE_LIMIT_REDIS_URL: str = Field(default="redis://localhost:6379/0")
+    RATE_LIMIT_AUTH_PER_MINUTE: int = Field(default=10, gt=0)
+    RATE_LIMIT_READ_PER_MINUTE: int = Field(default=600, gt=0)
+    RATE_LIMIT_WRITE_PER_MINUTE: int = Field(default=120, gt=0)
+    RATE_LIMIT_BULK_PER_MINUTE: int = Field(default=10, gt=0)
+
+    # In-memory copy of the book table for id lookups, kept fresh via NOTIFY
+    BOOK_CATALOG_ENABLED: bool = Field(default=False)
+    BOOK_CATALOG_MAX_MB: int = Field(default=256)
+    # Per-worker budget of the title/author suggestion index (~550 B per book)
+    BOOK_SUGGESTIONS_MAX_MB: int = Field(default=512)
+
+    USER_CACHE_TTL_SECONDS: float = Field(default=30.0)
+    USER_CACHE_MAX_SIZE: int = Field(default=10_000)
 
 
 settings = Settings()  # type: ignore
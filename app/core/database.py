@@ -1,16 +1,70 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import AsyncGenerator
+from pathlib import Path
+from typing import AsyncGenerator, AsyncIterator, Mapping, Optional
 
-from sqlalchemy import event
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from fastapi import Request, Response
+from pydantic import PostgresDsn
+from sqlalchemy import event, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlmodel import SQLModel
 
 from .config import settings
+from .pool import InstrumentedAsyncQueuePool
+from .query_monitor import instrument_engine
 
-engine = create_async_engine(
-    str(settings.DATABASE_URL),
-    echo=settings.SQL_ECHO,
-    future=True,
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PATH = Path(__file__).resolve().parent.parent / "migrations"
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+# OpenAPI extra that marks a route as read-only (or not) regardless of method
+READ_ONLY_EXTRA = "x-read-only"
+
+# The session handed out by get_session for the current request
+request_session: ContextVar[Optional[AsyncSession]] = ContextVar(
+    "request_session", default=None
+)
+
+
+def create_engine(url: PostgresDsn, **kwargs) -> AsyncEngine:
+    async_engine = create_async_engine(
+        str(url),
+        echo=settings.SQL_ECHO,
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE_PER_WORKER,
+        max_overflow=settings.DB_MAX_OVERFLOW_PER_WORKER,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        },
+        **kwargs,
+    )
+    instrument_engine(async_engine)
+    return async_engine
+
+
+engine = create_engine(settings.DATABASE_URL)
+
+# Replica transactions are read-only, so a replica pointed at the primary
+# (a "fake replica" for local testing) still rejects writes like a real one.
+replica_engine: Optional[AsyncEngine] = (
+    create_engine(
+        settings.DATABASE_REPLICA_URL,
+        execution_options={"postgresql_readonly": True},
+    )
+    if settings.DATABASE_REPLICA_URL
+    else None
 )
 
 
@@ -20,11 +74,144 @@ def auto_update_timestamp(mapper, connection, target):
         target.updated_at = datetime.utcnow()
 
 
-async def init_db():
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+def expected_schema_revisions() -> set[str]:
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_PATH))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+async def check_schema_version():
+    """Fail startup unless the database is at the latest migration.
+
+    Schema changes are applied with `alembic upgrade head` before deploying;
+    workers only compare one row against the migration scripts on disk.
+    """
+    expected = expected_schema_revisions()
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars())
+    except ProgrammingError:
+        current = set()
+
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at {sorted(current) or 'no revision'}, "
+            f"expected {sorted(expected)}; run `alembic upgrade head`"
+        )
+    logger.info("Database schema at revision %s", ", ".join(sorted(current)))
+
+
+def all_engines() -> list[AsyncEngine]:
+    return [engine, replica_engine] if replica_engine else [engine]
+
+
+async def warm_up_pool():
+    """Open every persistent pool connection before serving traffic"""
+    if not settings.DB_POOL_WARMUP:
+        return
+    for pool_engine in all_engines():
+        connections = await asyncio.gather(
+            *(pool_engine.connect() for _ in range(settings.DB_POOL_SIZE_PER_WORKER))
+        )
+        for connection in connections:
+            await connection.close()
+        logger.info(
+            "Warmed up %d connections to %s", len(connections), pool_engine.url.host
+        )
+
+
+async def dispose_engines():
+    for pool_engine in all_engines():
+        await pool_engine.dispose()
+
+
+@asynccontextmanager
+async def session_scope(
+    bind: Optional[AsyncEngine] = None,
+) -> AsyncIterator[AsyncSession]:
+    """Session for work outside a request dependency (startup, streaming)"""
+    async with AsyncSession(bind or engine, expire_on_commit=False) as session:
+        yield session
+
+
+def is_read_only(request: Request) -> bool:
+    """The route's `x-read-only` OpenAPI extra, else GET/HEAD are reads"""
+    route = request.scope.get("route")
+    extra = getattr(route, "openapi_extra", None) or {}
+    if READ_ONLY_EXTRA in extra:
+        return bool(extra[READ_ONLY_EXTRA])
+    return request.method in READ_METHODS
+
+
+def reads_from_replica(read_only: bool, cookies: Mapping[str, str]) -> bool:
+    """Whether a request may be served from the replica.
+
+    Reads go to the primary while the client's read-your-writes window from
+    its last write is still open, so it never sees its own change missing.
+    """
+    if replica_engine is None or not read_only:
+        return False
+    return not primary_window_open(cookies)
+
+
+def primary_window_open(cookies: Mapping[str, str]) -> bool:
+    """Whether the client wrote recently enough that it must read from the
+    primary rather than a replica or an in-memory copy. Malformed cookies are
+    ignored.
+    """
+    try:
+        primary_until = float(cookies.get(settings.DB_PRIMARY_COOKIE_NAME, 0))
+    except ValueError:
+        return False
+    return primary_until > time.time()
+
+
+def set_primary_window(request: Request, response: Response) -> None:
+    """Open the client's read-your-writes window after a write.
+
+    Called by the route on the response actually sent, since FastAPI drops
+    cookies set on a dependency's response when the endpoint returns its own.
+    """
+    if not getattr(request.state, "writes_to_primary", False):
+        return
+    window = settings.DB_READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        key=settings.DB_PRIMARY_COOKIE_NAME,
+        value=str(int(time.time()) + window),
+        max_age=window,
+        httponly=True,
+        secure=settings.ENVIRONMENT == "production",
+        samesite="lax",
+    )
+
+
+async def release_request_session():
+    """Return the request's connection to the pool.
+
+    Called once the endpoint has finished its service calls so the connection
+    is not held while the response is serialized and sent. The session stays
+    usable and reconnects lazily if anything runs another statement.
+    """
+    session = request_session.get()
+    if session is not None:
+        await session.close()
+
 
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Request session; a connection is only checked out on its first statement"""
+    read_only = is_read_only(request)
+    if reads_from_replica(read_only, request.cookies):
+        async with session_scope(replica_engine) as session:
+            request_session.set(session)
+            yield session
+        return
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSession(engine, expire_on_commit=False) as session:
+    # The book catalog also lags other workers' writes, so it needs the window
+    # too even without a replica
+    request.state.writes_to_primary = not read_only and (
+        replica_engine is not None or settings.BOOK_CATALOG_ENABLED
+    )
+    async with session_scope() as session:
+        request_session.set(session)
         yield session
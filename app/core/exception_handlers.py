@@ -13,7 +13,7 @@ async def integrity_error_handler(
     request: Request, exc: IntegrityError
 ) -> JSONResponse:
     """Handle database integrity constraint violations"""
-    logger.warning(f"Database integrity error: {exc}")
+    logger.warning("Database integrity error: %s", exc)
 
     error_msg = str(exc.orig).lower() if exc.orig else str(exc).lower()
 
@@ -36,7 +36,7 @@ async def operational_error_handler(
     request: Request, exc: OperationalError
 ) -> JSONResponse:
     """Handle database operational errors (connection issues, etc.)"""
-    logger.error(f"Database operational error: {exc}", exc_info=True)
+    logger.error("Database operational error: %s", exc, exc_info=True)
 
     if settings.ENVIRONMENT == "development":
         return JSONResponse(
@@ -57,7 +57,7 @@ async def sqlalchemy_error_handler(
     request: Request, exc: SQLAlchemyError
 ) -> JSONResponse:
     """Handle general SQLAlchemy errors"""
-    logger.error(f"Database error: {exc}", exc_info=True)
+    logger.error("Database error: %s", exc, exc_info=True)
 
     if settings.ENVIRONMENT == "development":
         return JSONResponse(
@@ -77,7 +77,7 @@ async def sqlalchemy_error_handler(
 
 async def generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """Catch-all handler for unexpected exceptions"""
-    logger.exception(f"Unhandled exception: {exc}")
+    logger.exception("Unhandled exception: %s", exc)
 
     # In development, provide more details to help with debugging
     if settings.ENVIRONMENT == "development":
@@ -1,19 +1,169 @@
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Mapping, Optional
 
 from .config import settings
 
+# Correlation ids attached to every record logged while handling a request
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+user_id: ContextVar[Optional[str]] = ContextVar("user_id", default=None)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class ContextFilter(logging.Filter):
+    """Copy the correlation ids onto the record in the thread that logs it"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        record.user_id = user_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a share of INFO and DEBUG records from high-volume loggers.
+
+    Rates are per logger name and apply to its children too; the longest
+    matching name wins. Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: Mapping[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._resolved: dict[str, float] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not self.rates:
+            return True
+        rate = self._resolved.get(record.name)
+        if rate is None:
+            rate = self._resolved[record.name] = self._rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+    def _rate_for(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with correlation ids when present"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in ("request_id", "user_id"):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Hands records to the listener thread without ever blocking.
+
+    When the queue is full the record is dropped and counted; the next record
+    that fits is preceded by a warning with the number lost in between.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting and JSON encoding happen on the listener thread; only the
+        # arguments are merged here so later mutations cannot change the message
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self._unreported:
+                self.queue.put_nowait(self._drop_report())
+                self._unreported = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+
+    def _drop_report(self) -> logging.LogRecord:
+        return logging.LogRecord(
+            __name__,
+            logging.WARNING,
+            __file__,
+            0,
+            f"Dropped {self._unreported} log records because the log queue was "
+            f"full ({self.dropped} in total)",
+            None,
+            None,
+        )
+
+
+class LogWriter(QueueListener):
+    """Writes queued records on its own thread"""
+
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full at shutdown; wait for the writer to make room
+        self.queue.put(self._sentinel)
+
+
+queue_handler: Optional[BoundedQueueHandler] = None
+_listener: Optional[LogWriter] = None
+
 
 def setup_logging() -> None:
+    """Route all logging through a bounded queue to a stdout writer thread"""
+    global queue_handler, _listener
+    stop_logging()
+
     log_level = logging.DEBUG if settings.DEBUG else logging.INFO
 
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
-        force=True,
-    )
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    queue_handler = BoundedQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+    queue_handler.addFilter(ContextFilter())
+    _listener = LogWriter(queue_handler.queue, output)
+    _listener.start()
+
+    logging.basicConfig(level=log_level, handlers=[queue_handler], force=True)
 
     if not settings.DEBUG:
         logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
         logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
+
+def stop_logging() -> None:
+    """Write out everything still queued and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,193 @@
+import os
+import time
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import database
+from . import logging as app_logging
+from .config import settings
+from .pool import PoolStats
+from .timing import request_timings
+
+# prometheus_client picks its storage when imported, so the directory shared by
+# the workers has to be in the environment first
+if settings.METRICS_MULTIPROC_DIR:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.METRICS_MULTIPROC_DIR)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Requests that did not match a route are grouped under one label, so probes
+# for random paths cannot create unbounded series
+UNMATCHED = "unmatched"
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the end of its response",
+    ["operation", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    "http_requests",
+    "Completed requests by response status",
+    ["operation", "method", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled by an endpoint",
+    ["operation"],
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Histogram(
+    "db_queries_per_request",
+    "Statements executed while handling a request",
+    ["operation"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_SECONDS = Histogram(
+    "db_seconds_per_request",
+    "Time spent executing statements while handling a request",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Pooled connections by state",
+    ["engine", "state"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts", "Connections handed out by the pool", ["engine"]
+)
+POOL_WAIT_SECONDS = Counter(
+    "db_pool_wait_seconds",
+    "Time requests spent waiting for a pooled connection",
+    ["engine"],
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts", "Checkouts that gave up waiting for a connection", ["engine"]
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped", "Log records dropped because the log queue was full"
+)
+
+
+def operation_name(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED
+    return getattr(route, "operation_id", None) or route.name
+
+
+class MetricsMiddleware:
+    """Records latency, status and database usage per operation.
+
+    The operation is the matched route's operation_id, which the router leaves
+    in the scope, so the labels are known once the app returns.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._log_drops_reported = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.observe(scope, status_code, time.perf_counter() - started)
+
+    def observe(self, scope: Scope, status_code: int, seconds: float) -> None:
+        operation = operation_name(scope)
+        method = scope["method"]
+        REQUEST_DURATION.labels(operation, method).observe(seconds)
+        REQUESTS.labels(operation, method, str(status_code)).inc()
+
+        timings = request_timings.get()
+        if timings is not None and operation != UNMATCHED:
+            DB_QUERIES.labels(operation).observe(timings.queries)
+            DB_SECONDS.labels(operation).observe(timings.durations.get("db", 0.0))
+        pool_metrics.update()
+        self.update_log_drops()
+
+    def update_log_drops(self) -> None:
+        handler = app_logging.queue_handler
+        if handler is not None and handler.dropped > self._log_drops_reported:
+            LOG_RECORDS_DROPPED.inc(handler.dropped - self._log_drops_reported)
+            self._log_drops_reported = handler.dropped
+
+
+class PoolMetrics:
+    """Mirrors the engines' pool counters into Prometheus.
+
+    Pool state only moves while requests run, so updating after each one keeps
+    every worker's series current without a background task. Counters advance
+    by the difference since the previous update.
+    """
+
+    def __init__(self) -> None:
+        self._last: dict[str, PoolStats] = {}
+
+    def update(self) -> None:
+        self._update("primary", database.engine.pool.stats())
+        if database.replica_engine is not None:
+            self._update("replica", database.replica_engine.pool.stats())
+
+    def _update(self, engine: str, stats: PoolStats) -> None:
+        POOL_CONNECTIONS.labels(engine, "checked_out").set(stats.checked_out)
+        POOL_CONNECTIONS.labels(engine, "checked_in").set(stats.checked_in)
+        POOL_CONNECTIONS.labels(engine, "overflow").set(stats.overflow)
+
+        last = self._last.get(engine)
+        if last is None or stats.checkouts < last.checkouts:
+            last = stats._replace(checkouts=0, wait_seconds_total=0.0, timeouts=0)
+        POOL_CHECKOUTS.labels(engine).inc(stats.checkouts - last.checkouts)
+        POOL_WAIT_SECONDS.labels(engine).inc(
+            stats.wait_seconds_total - last.wait_seconds_total
+        )
+        POOL_TIMEOUTS.labels(engine).inc(stats.timeouts - last.timeouts)
+        self._last[engine] = stats
+
+
+pool_metrics = PoolMetrics()
+
+
+def metrics_endpoint(request: Request) -> Response:
+    """Prometheus exposition of this worker, or of all workers in multiprocess
+    mode"""
+    registry = REGISTRY
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the shared directory on shutdown"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
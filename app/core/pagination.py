@@ -0,0 +1,73 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Generic, NamedTuple, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+
+from app.core.exceptions import ValidationError
+
+T = TypeVar("T")
+
+
+class PageResult(NamedTuple, Generic[T]):
+    items: Sequence[T]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode keyset values into an opaque, URL-safe cursor"""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else str(v) for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError("Invalid cursor")
+
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        raise ValidationError("Invalid cursor")
+    return values
+
+
+def decode_created_at_cursor(cursor: str) -> tuple[datetime, UUID]:
+    values = decode_cursor(cursor)
+    try:
+        created_at, entity_id = values
+        return datetime.fromisoformat(created_at), UUID(entity_id)
+    except ValueError:
+        raise ValidationError("Invalid cursor")
+
+
+def paginate_by_created_at(
+    statement: Select, model: Any, cursor: Optional[str], limit: int
+) -> Select:
+    """Order by the indexed (created_at, id) pair and seek past the cursor.
+
+    One extra row is fetched so the caller can tell whether a next page exists.
+    """
+    if cursor:
+        created_at, entity_id = decode_created_at_cursor(cursor)
+        statement = statement.where(
+            tuple_(model.created_at, model.id) > tuple_(created_at, entity_id)
+        )
+
+    return statement.order_by(model.created_at, model.id).limit(limit + 1)
+
+
+def created_at_page(rows: Sequence[T], limit: int) -> PageResult[T]:
+    if len(rows) <= limit:
+        return PageResult(rows, None)
+
+    items = rows[:limit]
+    last: Any = items[-1]
+    return PageResult(items, encode_cursor(last.created_at, last.id))
@@ -21,6 +21,7 @@ class Permission(str, Enum):
     EDIT_OWN_BOOK = "edit_own_book"
     DELETE_BOOK = "delete_book"
     DELETE_OWN_BOOK = "delete_own_book"
+    IMPORT_BOOKS = "import_books"
 
     # Reading entry permissions
     CREATE_READING_ENTRY = "create_reading_entry"
@@ -31,6 +32,9 @@ class Permission(str, Enum):
     DELETE_READING_ENTRY = "delete_reading_entry"
     DELETE_OWN_READING_ENTRY = "delete_own_reading_entry"
 
+    # System permissions (Admin only)
+    VIEW_SYSTEM_STATS = "view_system_stats"
+
 
 # Role-to-permission mapping
 ROLE_PERMISSIONS: Dict[RoleType, Set[Permission]] = {
@@ -63,6 +67,7 @@ ROLE_PERMISSIONS: Dict[RoleType, Set[Permission]] = {
         Permission.EDIT_OWN_BOOK,
         Permission.DELETE_BOOK,
         Permission.DELETE_OWN_BOOK,
+        Permission.IMPORT_BOOKS,
         # Admins have full control over all reading entries
         Permission.CREATE_READING_ENTRY,
         Permission.VIEW_READING_ENTRY,
@@ -71,6 +76,8 @@ ROLE_PERMISSIONS: Dict[RoleType, Set[Permission]] = {
         Permission.EDIT_OWN_READING_ENTRY,
         Permission.DELETE_READING_ENTRY,
         Permission.DELETE_OWN_READING_ENTRY,
+        # Admins can inspect the running service
+        Permission.VIEW_SYSTEM_STATS,
     },
 }
 
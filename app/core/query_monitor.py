@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import Select, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.dml import UpdateBase
+
+from .config import settings
+from .timing import request_timings
+
+logger = logging.getLogger(__name__)
+
+# A statement is explained at most once per cooldown, however often it is slow
+EXPLAIN_COOLDOWN_SECONDS = 300.0
+EXPLAIN_TIMEOUT_MS = 10_000
+
+
+class NPlusOneError(RuntimeError):
+    """One request ran the same statement more than N_PLUS_ONE_THRESHOLD times"""
+
+
+class QueryMonitor:
+    """Per-request query statistics, slow-query logging and N+1 detection.
+
+    Statements are compared by their SQL text, which SQLAlchemy renders with
+    placeholders, so the same query with different parameters has one shape.
+    Slow statements are logged at once; their plan is fetched in the
+    background on a separate connection and logged when it arrives.
+    """
+
+    def __init__(self, async_engine: AsyncEngine):
+        self.engine = async_engine
+        self._explained_at: dict[str, float] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def install(self) -> None:
+        sync_engine = self.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self.before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self.after_execute)
+
+    def before_execute(self, conn, cursor, statement, parameters, context, many):
+        conn.info["query_started"] = time.perf_counter()
+
+    def after_execute(self, conn, cursor, statement, parameters, context, many):
+        elapsed = time.perf_counter() - conn.info.pop("query_started")
+        if conn.info.get("explaining"):
+            return
+
+        timings = request_timings.get()
+        if timings is not None:
+            timings.add("db", elapsed)
+            timings.queries += 1
+            count = timings.statements.get(statement, 0) + 1
+            timings.statements[statement] = count
+            threshold = settings.N_PLUS_ONE_THRESHOLD
+            if threshold and count == threshold + 1:
+                self.report_repeated(statement, count)
+
+        if settings.SLOW_QUERY_SECONDS and elapsed >= settings.SLOW_QUERY_SECONDS:
+            logger.warning("Slow query (%.3fs): %s", elapsed, statement)
+            if settings.SLOW_QUERY_EXPLAIN and not many:
+                self.schedule_explain(
+                    statement, parameters, self.can_analyze(context)
+                )
+
+    def report_repeated(self, statement: str, count: int) -> None:
+        message = (
+            f"Statement ran {count} times in one request, a likely N+1 query: "
+            f"{statement}"
+        )
+        if settings.N_PLUS_ONE_RAISE:
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+    @staticmethod
+    def can_analyze(context) -> bool:
+        """Whether EXPLAIN ANALYZE may run the statement a second time.
+
+        Only plain reads from tables qualify: no INSERT, UPDATE or DELETE (also
+        inside a CTE), no row locks, and no FROM-less SELECT, which is how
+        functions with side effects such as pg_notify() are called. Textual
+        SQL is never analyzed since it cannot be inspected.
+        """
+        if context is None or context.isinsert or context.isupdate:
+            return False
+        if context.isdelete or context.compiled is None:
+            return False
+        statement = context.compiled.statement
+        ctes = context.compiled.ctes or {}
+        return (
+            isinstance(statement, Select)
+            and statement._for_update_arg is None
+            and bool(statement.get_final_froms())
+            and not any(isinstance(cte.element, UpdateBase) for cte in ctes)
+        )
+
+    def schedule_explain(self, statement: str, parameters, analyze: bool) -> None:
+        now = time.monotonic()
+        last = self._explained_at.get(statement)
+        if last is not None and now - last < EXPLAIN_COOLDOWN_SECONDS:
+            return
+        self._explained_at[statement] = now
+
+        task = asyncio.get_running_loop().create_task(
+            self.explain(statement, parameters, analyze)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def explain(self, statement: str, parameters, analyze: bool) -> None:
+        explain = "EXPLAIN (ANALYZE, BUFFERS)" if analyze else "EXPLAIN"
+        try:
+            async with self.engine.connect() as conn:
+                conn.sync_connection.info["explaining"] = True
+                try:
+                    await conn.execute(
+                        text(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+                    )
+                    result = await conn.exec_driver_sql(
+                        f"{explain} {statement}", parameters
+                    )
+                    plan = "\n".join(row[0] for row in result)
+                finally:
+                    conn.sync_connection.info.pop("explaining", None)
+                    await conn.rollback()
+        except Exception as e:
+            logger.warning("Could not explain slow query: %s", e)
+            return
+        logger.warning("Plan for slow query: %s\n%s", statement, plan)
+
+
+def instrument_engine(async_engine: AsyncEngine) -> QueryMonitor:
+    """Attach a QueryMonitor to the engine.
+
+    SQLAlchemy runs async driver calls in greenlets that share the caller's
+    context, so the current request's timings are visible from these hooks.
+    """
+    monitor = QueryMonitor(async_engine)
+    monitor.install()
+    return monitor
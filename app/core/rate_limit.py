@@ -0,0 +1,189 @@
+import logging
+import math
+import time
+from enum import StrEnum
+from typing import NamedTuple, Protocol
+
+import redis.asyncio as redis
+from fastapi import HTTPException, Request, status
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitClass(StrEnum):
+    AUTH = "auth"
+    READ = "read"
+    WRITE = "write"
+    BULK = "bulk"
+
+
+# Budgets are per minute, so any bucket is full again after this long
+BUCKET_REFILL_SECONDS = 60
+
+
+class Budget(NamedTuple):
+    capacity: float
+    refill_per_second: float
+
+    @classmethod
+    def per_minute(cls, requests: float) -> "Budget":
+        """A bucket that allows `requests` per minute with bursts of that size"""
+        return cls(requests, requests / BUCKET_REFILL_SECONDS)
+
+
+class RateLimitBackend(Protocol):
+    async def take(self, key: str, budget: Budget) -> float:
+        """Take one token; return 0 if allowed, else seconds until one is free"""
+        ...
+
+
+class MemoryBackend:
+    """Token buckets in this process's memory, a few microseconds per hit.
+
+    Each worker gets an equal share of every budget, but never less than one
+    token, so the server-wide limit holds only roughly and only as long as
+    the process manager spreads clients across workers. Use RedisBackend for
+    exact limits with several workers.
+    """
+
+    # Buckets idle long enough to have refilled completely are dropped once
+    # the table reaches this size
+    PRUNE_AT = 100_000
+
+    def __init__(self, workers: int = 1) -> None:
+        self.workers = max(1, workers)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._prune_at = self.PRUNE_AT
+
+    async def take(self, key: str, budget: Budget) -> float:
+        # A budget smaller than the worker count would otherwise reject every
+        # request, since no worker's bucket could ever hold a whole token
+        capacity = max(1.0, budget.capacity / self.workers)
+        rate = budget.refill_per_second / self.workers
+        now = time.monotonic()
+
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / rate
+
+        if len(self._buckets) >= self._prune_at:
+            self._prune(now)
+        self._buckets[key] = (tokens - 1, now)
+        return 0.0
+
+    def _prune(self, now: float) -> None:
+        self._buckets = {
+            key: bucket
+            for key, bucket in self._buckets.items()
+            if now - bucket[1] < BUCKET_REFILL_SECONDS
+        }
+        self._prune_at = max(self.PRUNE_AT, len(self._buckets) * 2)
+
+
+# Refill, take and persist in one atomic round trip. Callers pass the time so
+# every worker uses the same clock source (the host's wall clock).
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+# A check that takes longer than this is skipped rather than holding up the
+# request
+REDIS_TIMEOUT_SECONDS = 0.5
+
+
+class RedisBackend:
+    """Token buckets shared by all workers in Redis (or a compatible server).
+
+    Fails open: while Redis is unreachable requests are allowed, not rejected.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.client = redis.from_url(
+            url,
+            socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+            socket_timeout=REDIS_TIMEOUT_SECONDS,
+        )
+        self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, budget: Budget) -> float:
+        try:
+            retry_after = await self.script(
+                keys=[f"ratelimit:{key}"],
+                args=[budget.capacity, budget.refill_per_second, time.time()],
+            )
+        except redis.RedisError as e:
+            logger.warning("Rate limit check skipped, Redis unavailable: %s", e)
+            return 0.0
+        return float(retry_after)
+
+
+BUDGETS = {
+    RateLimitClass.AUTH: Budget.per_minute(settings.RATE_LIMIT_AUTH_PER_MINUTE),
+    RateLimitClass.READ: Budget.per_minute(settings.RATE_LIMIT_READ_PER_MINUTE),
+    RateLimitClass.WRITE: Budget.per_minute(settings.RATE_LIMIT_WRITE_PER_MINUTE),
+    RateLimitClass.BULK: Budget.per_minute(settings.RATE_LIMIT_BULK_PER_MINUTE),
+}
+
+backend: RateLimitBackend = (
+    RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+    if settings.RATE_LIMIT_BACKEND == "redis"
+    else MemoryBackend(settings.SERVER_WORKERS_COUNT)
+)
+
+
+def rate_limit_class(request: Request) -> RateLimitClass:
+    """The route's `x-rate-limit` OpenAPI extra, else read/write by method"""
+    route = request.scope.get("route")
+    extra = getattr(route, "openapi_extra", None) or {}
+    if "x-rate-limit" in extra:
+        return RateLimitClass(extra["x-rate-limit"])
+    if request.method in ("GET", "HEAD", "OPTIONS"):
+        return RateLimitClass.READ
+    return RateLimitClass.WRITE
+
+
+async def enforce_rate_limit(key: str, limit_class: RateLimitClass) -> None:
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    retry_after = await backend.take(f"{limit_class}:{key}", BUDGETS[limit_class])
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+async def limit_by_user(request: Request, user_id: object) -> None:
+    await enforce_rate_limit(f"user:{user_id}", rate_limit_class(request))
+
+
+async def limit_by_client(request: Request) -> None:
+    """Dependency for unauthenticated routes, keyed by client address.
+
+    Behind a proxy run uvicorn with --proxy-headers and --forwarded-allow-ips
+    so the address is the real client's.
+    """
+    client = request.client.host if request.client else "unknown"
+    await enforce_rate_limit(f"client:{client}", RateLimitClass.AUTH)
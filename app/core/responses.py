@@ -0,0 +1,39 @@
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core import database, timing
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+async def model_response(
+    response_type: Any,
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Validate `content` as `response_type` once and render it to JSON bytes.
+
+    `content` may be ORM objects, named tuples or dicts; fields are read by
+    attribute. Returning the Response directly skips FastAPI's second
+    response_model validation and its jsonable_encoder/json.dumps pass, and
+    pydantic-core writes the JSON. Keep `response_model` on the route for the
+    OpenAPI schema.
+
+    The request's connection goes back to the pool first, so it is not held
+    while large pages are validated and dumped.
+    """
+    await database.release_request_session()
+    with timing.measure("serialize"):
+        adapter = _adapter(response_type)
+        validated = adapter.validate_python(content, from_attributes=True)
+        body = adapter.dump_json(validated)
+    return Response(
+        body, status_code=status_code, headers=headers, media_type="application/json"
+    )
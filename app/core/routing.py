@@ -0,0 +1,68 @@
+import inspect
+import time
+from functools import wraps
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core import database, metrics, timing
+from app.core.config import settings
+
+
+class SessionReleasingRoute(APIRoute):
+    """Route that releases the request's database connection when the
+    endpoint returns, before FastAPI validates and serializes its result.
+
+    Without this the connection stays checked out until the session
+    dependency is torn down, after the response has been rendered. The route
+    also reports endpoint ("app") and serialization time to Server-Timing,
+    counts its requests in progress and sets the read-your-writes cookie on
+    the final response of a write.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _release_session_after(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        in_progress = metrics.REQUESTS_IN_PROGRESS.labels(
+            self.operation_id or self.name
+        )
+
+        async def timed_handler(request: Request) -> Response:
+            if settings.METRICS_ENABLED:
+                in_progress.inc()
+            try:
+                response = await handler(request)
+            finally:
+                if settings.METRICS_ENABLED:
+                    in_progress.dec()
+            timings = timing.request_timings.get()
+            if timings is not None and timings.endpoint_done is not None:
+                timings.add("serialize", time.perf_counter() - timings.endpoint_done)
+            database.set_primary_window(request, response)
+            return response
+
+        return timed_handler
+
+
+def _release_session_after(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        timings = timing.request_timings.get()
+        # model_response serializes inside the endpoint; keep that out of "app"
+        serialized = timings.durations.get("serialize", 0.0) if timings else 0.0
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            await database.release_request_session()
+            if timings is not None:
+                timings.endpoint_done = time.perf_counter()
+                serialized = timings.durations.get("serialize", 0.0) - serialized
+                timings.add("app", timings.endpoint_done - started - serialized)
+
+    return wrapper
@@ -1,15 +1,89 @@
-from typing import Callable
+from typing import Sequence
+from uuid import uuid4
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core import logging as log_context
+from app.core.timing import RequestTimings, request_timings
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
+MAX_REQUEST_ID_LENGTH = 128
 
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+]
 
-        return response
+
+class SecurityMiddleware:
+    """Host validation, security headers, request ids and Server-Timing in one
+    ASGI layer.
+
+    Unlike BaseHTTPMiddleware this does not run the app in a separate task
+    or re-stream the body; it only edits the headers of http.response.start.
+    Host matching follows Starlette's TrustedHostMiddleware: the port is
+    ignored and "*.example.com" matches subdomains. A client-supplied
+    X-Request-ID is kept (if short enough) so logs can be joined across
+    services; otherwise one is generated. Either way it is echoed back.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allowed_hosts: Sequence[str] = ("*",),
+        server_timing: bool = True,
+    ):
+        self.app = app
+        self.allow_any_host = "*" in allowed_hosts
+        self.exact_hosts = frozenset(h for h in allowed_hosts if not h.startswith("*"))
+        self.host_suffixes = tuple(h[1:] for h in allowed_hosts if h.startswith("*."))
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        if not self.is_allowed_host(scope):
+            response = PlainTextResponse("Invalid host header", status_code=400)
+            await response(scope, receive, send)
+            return
+
+        if scope["type"] == "websocket":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        request_timings.set(timings)
+        request_id = self.request_id(scope)
+        log_context.request_id.set(request_id)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.extend(SECURITY_HEADERS)
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                if self.server_timing:
+                    headers.append((b"server-timing", timings.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    def request_id(scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == b"x-request-id" and 0 < len(value) <= MAX_REQUEST_ID_LENGTH:
+                return value.decode("latin-1")
+        return uuid4().hex
+
+    def is_allowed_host(self, scope: Scope) -> bool:
+        if self.allow_any_host:
+            return True
+        host = ""
+        for name, value in scope["headers"]:
+            if name == b"host":
+                host = value.decode("latin-1").split(":")[0]
+                break
+        return host in self.exact_hosts or host.endswith(self.host_suffixes)
@@ -0,0 +1,53 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class RequestTimings:
+    """Durations collected while handling one request, in seconds"""
+
+    __slots__ = ("started", "durations", "queries", "statements", "endpoint_done")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations: dict[str, float] = {}
+        self.queries = 0
+        # Executions per SQL text, for N+1 detection
+        self.statements: dict[str, int] = {}
+        # When the endpoint returned; serialization time is measured from here
+        self.endpoint_done: Optional[float] = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """Render as a Server-Timing header value (milliseconds)"""
+        total = time.perf_counter() - self.started
+        entries = [
+            f"{name};dur={seconds * 1000:.1f}"
+            for name, seconds in self.durations.items()
+        ]
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def record(name: str, seconds: float) -> None:
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
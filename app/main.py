@@ -3,10 +3,6 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
 
 from app.core.exception_handlers import (
@@ -16,24 +12,33 @@ from app.core.exception_handlers import (
     sqlalchemy_error_handler,
 )
 from app.core.logging import setup_logging
-from app.core.security_middleware import SecurityHeadersMiddleware
+from app.core.metrics import MetricsMiddleware, mark_process_dead, metrics_endpoint
+from app.core.security_middleware import SecurityMiddleware
+from app.services.book_catalog import book_change_listener
 
 from .api.v1.router import api_router
 from .core.api import api_metadata
 from .core.config import settings
-from .core.database import init_db
+from .core.database import (
+    check_schema_version,
+    dispose_engines,
+    warm_up_pool,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
+    await check_schema_version()
+    await warm_up_pool()
+    await book_change_listener.start()
     yield
+    await book_change_listener.stop()
+    await dispose_engines()
+    mark_process_dead()
 
 
 setup_logging()
 
-limiter = Limiter(key_func=get_remote_address)
-
 app = FastAPI(
     lifespan=lifespan,
     debug=settings.DEBUG,
@@ -46,9 +51,6 @@ app = FastAPI(
     openapi_tags=api_metadata["tags"],
 )
 
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # Database exception handlers
 app.add_exception_handler(IntegrityError, integrity_error_handler)
 app.add_exception_handler(OperationalError, operational_error_handler)
@@ -57,10 +59,6 @@ app.add_exception_handler(SQLAlchemyError, sqlalchemy_error_handler)
 # Catch-all exception handler (must be last)
 app.add_exception_handler(Exception, generic_exception_handler)
 
-app.add_middleware(SecurityHeadersMiddleware)
-
-app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.TRUSTED_HOSTS)
-
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 app.add_middleware(
@@ -71,4 +69,17 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Outermost, so hosts are rejected first and Server-Timing covers the stack
+app.add_middleware(
+    SecurityMiddleware,
+    allowed_hosts=settings.TRUSTED_HOSTS,
+    server_timing=settings.SERVER_TIMING,
+)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+
+if settings.METRICS_ENABLED:
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
@@ -0,0 +1,65 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import Column
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401 - registers every table on SQLModel.metadata
+from app.core.config import settings
+
+config = context.config
+
+if config.config_file_name is not None:
+    # Keep loggers configured before an in-process upgrade (tests) working
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = SQLModel.metadata
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # Expression indexes come back from Postgres as normalized SQL that never
+    # equals the model's text, so autogenerate would recreate them every time
+    if type_ == "index":
+        return all(isinstance(e, Column) for e in object.expressions)
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=str(settings.DATABASE_URL),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    engine = create_async_engine(str(settings.DATABASE_URL))
+
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,95 @@
+"""Initial schema
+
+The tables and indexes SQLModel.metadata.create_all built for the original
+user, book and reading entry models, before migrations existed. Databases
+created that way should be stamped with this revision instead of upgraded
+through it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("avatar_url", sa.String(), nullable=True),
+        sa.Column("display_name", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column(
+            "role",
+            sa.Enum("ADMIN", "STANDARD_USER", name="roletype"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+
+    op.create_table(
+        "book",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("author", sa.String(), nullable=False),
+        sa.Column("isbn", sa.String(), nullable=True),
+        sa.Column("olid", sa.String(), nullable=True),
+        sa.Column("cover_url", sa.String(), nullable=True),
+        sa.Column("openlibrary_url", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    op.create_table(
+        "readingentry",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("book_id", sa.Uuid(), nullable=False),
+        sa.Column("start_date", sa.DateTime(), nullable=True),
+        sa.Column("end_date", sa.DateTime(), nullable=True),
+        sa.Column("progress", sa.Numeric(), nullable=False),
+        sa.Column("rating", sa.Integer(), nullable=True),
+        sa.Column("review", sa.String(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "WANT_TO_READ",
+                "IN_PROGRESS",
+                "COMPLETED",
+                "ABANDONED",
+                name="readingstatus",
+            ),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["book_id"], ["book.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_readingentry_user_id", "readingentry", ["user_id"])
+    op.create_index("ix_readingentry_start_date", "readingentry", ["start_date"])
+    op.create_index("ix_readingentry_status", "readingentry", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_table("readingentry")
+    op.drop_table("book")
+    op.drop_table("user")
+    sa.Enum(name="readingstatus").drop(op.get_bind())
+    sa.Enum(name="roletype").drop(op.get_bind())
@@ -0,0 +1,51 @@
+"""Keyset pagination indexes
+
+(created_at, id) indexes behind the cursor-paginated user and book lists, and
+(user_id, created_at, id) for a user's reading entries. Built CONCURRENTLY so
+the upgrade does not block writes; IF NOT EXISTS because databases created by
+create_all after the models declared them already have them.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:10:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_user_created_at_id",
+            "user",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_book_created_at_id",
+            "book",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_readingentry_user_id_created_at_id",
+            "readingentry",
+            ["user_id", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_readingentry_user_id_created_at_id", table_name="readingentry")
+    op.drop_index("ix_book_created_at_id", table_name="book")
+    op.drop_index("ix_user_created_at_id", table_name="user")
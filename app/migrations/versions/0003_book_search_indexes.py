@@ -0,0 +1,62 @@
+"""Book search indexes
+
+The GIN tsvector index for full-text search and the trigram indexes for fuzzy
+title/author matches, which need the pg_trgm extension. Built CONCURRENTLY;
+IF NOT EXISTS because databases created by create_all after the models
+declared them already have them.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:20:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BOOK_SEARCH_DOCUMENT = "to_tsvector('simple', title || ' ' || author)"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_book_search_document",
+            "book",
+            [sa.text(BOOK_SEARCH_DOCUMENT)],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_book_title_trgm",
+            "book",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_book_author_trgm",
+            "book",
+            ["author"],
+            postgresql_using="gin",
+            postgresql_ops={"author": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    # pg_trgm stays installed; other objects in the database may use it
+    op.drop_index("ix_book_author_trgm", table_name="book")
+    op.drop_index("ix_book_title_trgm", table_name="book")
+    op.drop_index("ix_book_search_document", table_name="book")
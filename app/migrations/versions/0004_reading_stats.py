@@ -0,0 +1,83 @@
+"""Reading stats tables
+
+Per-user status counts and ratings, and completions per month, kept in step
+with reading entry changes. Both are filled from the existing entries, which
+also repairs them on databases where create_all made the tables before this
+revision was applied.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REBUILD_STATS = (
+    "DELETE FROM usermonthlycompletions",
+    "DELETE FROM userreadingstats",
+    """
+    INSERT INTO userreadingstats (
+        user_id, want_to_read, in_progress, completed, abandoned,
+        rating_count, rating_sum, updated_at
+    )
+    SELECT user_id,
+           count(*) FILTER (WHERE status = 'WANT_TO_READ'),
+           count(*) FILTER (WHERE status = 'IN_PROGRESS'),
+           count(*) FILTER (WHERE status = 'COMPLETED'),
+           count(*) FILTER (WHERE status = 'ABANDONED'),
+           count(rating),
+           coalesce(sum(rating), 0),
+           timezone('utc', now())
+    FROM readingentry
+    GROUP BY user_id
+    """,
+    """
+    INSERT INTO usermonthlycompletions (user_id, month, completed)
+    SELECT user_id, date_trunc('month', end_date)::date, count(*)
+    FROM readingentry
+    WHERE status = 'COMPLETED' AND end_date IS NOT NULL
+    GROUP BY 1, 2
+    """,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "userreadingstats",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("want_to_read", sa.Integer(), nullable=False),
+        sa.Column("in_progress", sa.Integer(), nullable=False),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.Column("abandoned", sa.Integer(), nullable=False),
+        sa.Column("rating_count", sa.Integer(), nullable=False),
+        sa.Column("rating_sum", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("user_id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "usermonthlycompletions",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("user_id", "month"),
+        if_not_exists=True,
+    )
+
+    for statement in REBUILD_STATS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_table("usermonthlycompletions")
+    op.drop_table("userreadingstats")
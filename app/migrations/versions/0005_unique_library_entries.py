@@ -0,0 +1,92 @@
+"""Unique library entries
+
+The unique (user_id, book_id) constraint behind the idempotent library add.
+Duplicate entries predate it, so all but the oldest of each pair are deleted
+first and, if any were, the reading stats are rebuilt without them. The index
+is built CONCURRENTLY and then attached as the constraint; databases created
+by create_all after the model declared it already have it and are left alone.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 09:40:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONSTRAINT = "uq_readingentry_user_id_book_id"
+
+# Same rebuild as revision 0004
+REBUILD_STATS = (
+    "DELETE FROM usermonthlycompletions",
+    "DELETE FROM userreadingstats",
+    """
+    INSERT INTO userreadingstats (
+        user_id, want_to_read, in_progress, completed, abandoned,
+        rating_count, rating_sum, updated_at
+    )
+    SELECT user_id,
+           count(*) FILTER (WHERE status = 'WANT_TO_READ'),
+           count(*) FILTER (WHERE status = 'IN_PROGRESS'),
+           count(*) FILTER (WHERE status = 'COMPLETED'),
+           count(*) FILTER (WHERE status = 'ABANDONED'),
+           count(rating),
+           coalesce(sum(rating), 0),
+           timezone('utc', now())
+    FROM readingentry
+    GROUP BY user_id
+    """,
+    """
+    INSERT INTO usermonthlycompletions (user_id, month, completed)
+    SELECT user_id, date_trunc('month', end_date)::date, count(*)
+    FROM readingentry
+    WHERE status = 'COMPLETED' AND end_date IS NOT NULL
+    GROUP BY 1, 2
+    """,
+)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    constraints = sa.inspect(connection).get_unique_constraints("readingentry")
+    if any(constraint["name"] == CONSTRAINT for constraint in constraints):
+        return
+
+    removed = connection.execute(
+        sa.text(
+            """
+            DELETE FROM readingentry r
+            USING readingentry keep
+            WHERE r.user_id = keep.user_id
+              AND r.book_id = keep.book_id
+              AND (keep.created_at, keep.id) < (r.created_at, r.id)
+            """
+        )
+    ).rowcount
+    if removed:
+        for statement in REBUILD_STATS:
+            op.execute(statement)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            CONSTRAINT,
+            "readingentry",
+            ["user_id", "book_id"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.execute(
+            f"ALTER TABLE readingentry ADD CONSTRAINT {CONSTRAINT} "
+            f"UNIQUE USING INDEX {CONSTRAINT}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_constraint(CONSTRAINT, "readingentry", type_="unique")
@@ -0,0 +1,82 @@
+"""Performance indexes
+
+Adds the per-user status and sync indexes and the isbn/olid lookups used by
+the bulk import dedupe, then drops the single-column user_id index they make
+redundant. Indexes are built CONCURRENTLY so the upgrade does not block writes
+on a live database; IF NOT EXISTS because databases created by create_all
+after the models declared them already have them.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 09:50:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_readingentry_user_id_status",
+            "readingentry",
+            ["user_id", "status"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_readingentry_user_id_updated_at",
+            "readingentry",
+            ["user_id", "updated_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_book_isbn",
+            "book",
+            ["isbn"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_book_olid",
+            "book",
+            ["olid"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_book_updated_at",
+            "book",
+            ["updated_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Every per-user query is covered by an index leading with user_id
+        op.drop_index(
+            "ix_readingentry_user_id",
+            table_name="readingentry",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_readingentry_user_id",
+            "readingentry",
+            ["user_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_book_updated_at", table_name="book")
+        op.drop_index("ix_book_olid", table_name="book")
+        op.drop_index("ix_book_isbn", table_name="book")
+        op.drop_index("ix_readingentry_user_id_updated_at", table_name="readingentry")
+        op.drop_index("ix_readingentry_user_id_status", table_name="readingentry")
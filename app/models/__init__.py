@@ -4,10 +4,11 @@ from .base import BaseModel
 from .domain.user import User
 from .domain.book import Book
 from .domain.reading_entry import ReadingEntry, ReadingStatus
+from .domain.reading_stats import UserMonthlyCompletions, UserReadingStats
 
 # Request models
 from .requests.user_requests import UserCreate, UserUpdate
-from .requests.book_requests import BookCreate, BookUpdate
+from .requests.book_requests import BookBatchGetRequest, BookCreate, BookUpdate
 from .requests.reading_entry_requests import (
     AddBookRequest,
     UpdateProgressRequest,
@@ -17,8 +18,20 @@ from .requests.reading_entry_requests import (
 
 # Response models
 from .responses.user_responses import UserPublic
-from .responses.book_responses import BookPublic
-from .responses.reading_entry_responses import ReadingEntryPublic
+from .responses.book_responses import (
+    BookBatchResponse,
+    BookImportError,
+    BookImportResult,
+    BookPublic,
+    BookSuggestion,
+)
+from .responses.reading_entry_responses import ReadingEntryPublic, ReadingEntryWithBook
+from .responses.page_responses import Page
+from .responses.reading_stats_responses import (
+    MonthlyCompletionsPublic,
+    UserReadingStatsPublic,
+)
+from .responses.system_responses import PoolStatsPublic
 
 __all__ = [
     "BaseModel",
@@ -27,11 +40,14 @@ __all__ = [
     "Book",
     "ReadingEntry",
     "ReadingStatus",
+    "UserReadingStats",
+    "UserMonthlyCompletions",
     # Request models
     "UserCreate",
     "UserUpdate",
     "BookCreate",
     "BookUpdate",
+    "BookBatchGetRequest",
     "AddBookRequest",
     "UpdateProgressRequest",
     "UpdateReviewRequest",
@@ -39,5 +55,14 @@ __all__ = [
     # Response models
     "UserPublic",
     "BookPublic",
+    "BookBatchResponse",
+    "BookSuggestion",
+    "BookImportError",
+    "BookImportResult",
     "ReadingEntryPublic",
+    "ReadingEntryWithBook",
+    "Page",
+    "UserReadingStatsPublic",
+    "MonthlyCompletionsPublic",
+    "PoolStatsPublic",
 ]
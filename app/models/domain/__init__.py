@@ -1,10 +1,13 @@
 from .user import User
 from .book import Book
 from .reading_entry import ReadingEntry, ReadingStatus
+from .reading_stats import UserMonthlyCompletions, UserReadingStats
 
 __all__ = [
     "User",
     "Book", 
     "ReadingEntry",
     "ReadingStatus",
+    "UserReadingStats",
+    "UserMonthlyCompletions",
 ]
@@ -1,3 +1,4 @@
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel, Relationship
 from pydantic import field_validator, StringConstraints
 from typing import Optional, Annotated, TYPE_CHECKING
@@ -8,11 +9,16 @@ if TYPE_CHECKING:
     from .reading_entry import ReadingEntry
 
 
+# Full-text document over title and author. Queries must use the exact same
+# expression for Postgres to match it against ix_book_search_document.
+BOOK_SEARCH_DOCUMENT = "to_tsvector('simple', title || ' ' || author)"
+
+
 class BookBase(SQLModel):
     title: Annotated[str, StringConstraints(min_length=1, max_length=200)] = Field(index=True)
     author: Annotated[str, StringConstraints(min_length=1, max_length=100)]
-    isbn: Optional[Annotated[str, StringConstraints(pattern=r'^(?:\d{10}|\d{13})$')]] = Field(default=None)
-    olid: Optional[Annotated[str, StringConstraints(pattern=r'^OL[0-9M]+[A-Z]$')]] = Field(default=None)
+    isbn: Optional[Annotated[str, StringConstraints(pattern=r'^(?:\d{10}|\d{13})$')]] = Field(default=None, index=True)
+    olid: Optional[Annotated[str, StringConstraints(pattern=r'^OL[0-9M]+[A-Z]$')]] = Field(default=None, index=True)
     cover_url: Optional[Annotated[str, StringConstraints(max_length=500)]] = Field(default=None)
     openlibrary_url: Optional[Annotated[str, StringConstraints(max_length=500)]] = Field(default=None)
 
@@ -24,4 +30,26 @@ class BookBase(SQLModel):
 
 
 class Book(BookBase, BaseModel, table=True):
+    __table_args__ = (
+        Index("ix_book_created_at_id", "created_at", "id"),
+        Index("ix_book_updated_at", "updated_at"),
+        Index(
+            "ix_book_search_document",
+            text(BOOK_SEARCH_DOCUMENT),
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_book_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_book_author_trgm",
+            "author",
+            postgresql_using="gin",
+            postgresql_ops={"author": "gin_trgm_ops"},
+        ),
+    )
+
     reading_entries: list["ReadingEntry"] = Relationship(back_populates="book")
@@ -1,12 +1,13 @@
+from sqlalchemy import Index, UniqueConstraint, case, func
 from sqlmodel import Field, SQLModel, Relationship
 from pydantic import StringConstraints, model_validator
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional, Annotated, TYPE_CHECKING
+from typing import Any, Optional, Annotated, TYPE_CHECKING
 from uuid import UUID
 from enum import Enum
 
-from ..base import BaseModel
+from ..base import BaseModel, utcnow
 
 if TYPE_CHECKING:
     from .user import User
@@ -21,7 +22,7 @@ class ReadingStatus(str, Enum):
 
 
 class ReadingEntryBase(SQLModel):
-    user_id: UUID = Field(foreign_key="user.id", index=True)
+    user_id: UUID = Field(foreign_key="user.id")
     book_id: UUID = Field(foreign_key="book.id")
     start_date: Optional[datetime] = Field(default=None, index=True)
     end_date: Optional[datetime] = Field(default=None)
@@ -53,6 +54,15 @@ class ReadingEntryBase(SQLModel):
 
 
 class ReadingEntry(ReadingEntryBase, BaseModel, table=True):
+    __table_args__ = (
+        Index("ix_readingentry_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_readingentry_user_id_status", "user_id", "status"),
+        Index("ix_readingentry_user_id_updated_at", "user_id", "updated_at"),
+        UniqueConstraint(
+            "user_id", "book_id", name="uq_readingentry_user_id_book_id"
+        ),
+    )
+
     user: Optional["User"] = Relationship(back_populates="reading_entries")
     book: Optional["Book"] = Relationship(back_populates="reading_entries")
 
@@ -93,3 +103,44 @@ class ReadingEntry(ReadingEntryBase, BaseModel, table=True):
             self.status = ReadingStatus.IN_PROGRESS
             if not self.start_date:
                 self.start_date = datetime.now(timezone.utc)
+
+    # The *_values classmethods express the transitions above as SET clauses
+    # for a single UPDATE, evaluated by Postgres against the current row.
+    # Timestamps are naive UTC to match the column type.
+
+    @classmethod
+    def completion_values(cls) -> dict[str, Any]:
+        already_completed = cls.status == ReadingStatus.COMPLETED
+        return {
+            "status": ReadingStatus.COMPLETED,
+            "progress": Decimal("100"),
+            "end_date": case((already_completed, cls.end_date), else_=utcnow()),
+            "start_date": func.coalesce(cls.start_date, cls.created_at),
+        }
+
+    @classmethod
+    def progress_values(cls, percentage: Decimal) -> dict[str, Any]:
+        if not (0 <= percentage <= 100):
+            raise ValueError("Progress must be between 0 and 100")
+
+        if percentage == 100:
+            return cls.completion_values()
+        if percentage == 0:
+            unchanged = cls.status == ReadingStatus.WANT_TO_READ
+            return {
+                "progress": percentage,
+                "status": ReadingStatus.WANT_TO_READ,
+                "start_date": case((unchanged, cls.start_date), else_=None),
+            }
+        return {"progress": percentage, **cls.start_reading_values()}
+
+    @classmethod
+    def start_reading_values(cls) -> dict[str, Any]:
+        return {
+            "status": ReadingStatus.IN_PROGRESS,
+            "start_date": func.coalesce(cls.start_date, utcnow()),
+        }
+
+    @classmethod
+    def abandon_values(cls) -> dict[str, Any]:
+        return {"status": ReadingStatus.ABANDONED}
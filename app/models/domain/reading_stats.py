@@ -0,0 +1,25 @@
+from datetime import date, datetime
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+from ..base import utcnow
+
+
+class UserReadingStats(SQLModel, table=True):
+    """Per-user aggregates kept in step with reading entry transitions"""
+
+    user_id: UUID = Field(foreign_key="user.id", primary_key=True)
+    want_to_read: int = Field(default=0)
+    in_progress: int = Field(default=0)
+    completed: int = Field(default=0)
+    abandoned: int = Field(default=0)
+    rating_count: int = Field(default=0)
+    rating_sum: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=utcnow, nullable=False)
+
+
+class UserMonthlyCompletions(SQLModel, table=True):
+    user_id: UUID = Field(foreign_key="user.id", primary_key=True)
+    month: date = Field(primary_key=True)
+    completed: int = Field(default=0)
@@ -2,6 +2,7 @@ from enum import Enum
 from typing import TYPE_CHECKING, Annotated, Optional
 
 from pydantic import EmailStr, StringConstraints
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from ..base import BaseModel
@@ -31,4 +32,6 @@ class UserBase(SQLModel):
 
 
 class User(UserBase, BaseModel, table=True):
+    __table_args__ = (Index("ix_user_created_at_id", "created_at", "id"),)
+
     reading_entries: list["ReadingEntry"] = Relationship(back_populates="user")
@@ -1,6 +1,6 @@
 from .auth_requests import TokenRequest
 from .user_requests import UserCreate, UserUpdate
-from .book_requests import BookCreate, BookUpdate
+from .book_requests import BookBatchGetRequest, BookCreate, BookUpdate
 from .reading_entry_requests import (
     AddBookRequest,
     UpdateProgressRequest,
@@ -13,6 +13,7 @@ __all__ = [
     "UserUpdate",
     "BookCreate", 
     "BookUpdate",
+    "BookBatchGetRequest",
     "AddBookRequest",
     "UpdateProgressRequest",
     "UpdateReviewRequest",
@@ -1,6 +1,9 @@
 from sqlmodel import Field, SQLModel
 from pydantic import field_validator, StringConstraints
 from typing import Optional, Annotated
+from uuid import UUID
+
+BATCH_GET_MAX_IDS = 100
 
 
 class BookCreate(SQLModel):
@@ -31,3 +34,7 @@ class BookUpdate(SQLModel):
         if value is not None and not value.startswith(('http://', 'https://')):
             raise ValueError('URL must start with http:// or https://')
         return value
+
+
+class BookBatchGetRequest(SQLModel):
+    ids: list[UUID] = Field(min_length=1, max_length=BATCH_GET_MAX_IDS)
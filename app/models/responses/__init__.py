@@ -1,7 +1,16 @@
 from .auth_responses import LoginResponse, RefreshResponse, LogoutResponse
 from .user_responses import UserPublic
-from .book_responses import BookPublic
-from .reading_entry_responses import ReadingEntryPublic
+from .book_responses import (
+    BookBatchResponse,
+    BookImportError,
+    BookImportResult,
+    BookPublic,
+    BookSuggestion,
+)
+from .reading_entry_responses import ReadingEntryPublic, ReadingEntryWithBook
+from .page_responses import Page
+from .reading_stats_responses import MonthlyCompletionsPublic, UserReadingStatsPublic
+from .system_responses import PoolStatsPublic
 
 __all__ = [
     "LoginResponse",
@@ -9,5 +18,14 @@ __all__ = [
     "LogoutResponse",
     "UserPublic",
     "BookPublic",
+    "BookBatchResponse",
+    "BookSuggestion",
+    "BookImportError",
+    "BookImportResult",
     "ReadingEntryPublic",
+    "ReadingEntryWithBook",
+    "Page",
+    "UserReadingStatsPublic",
+    "MonthlyCompletionsPublic",
+    "PoolStatsPublic",
 ]
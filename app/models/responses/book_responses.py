@@ -1,3 +1,4 @@
+from pydantic import BaseModel
 from sqlmodel import SQLModel
 from typing import Optional
 from uuid import UUID
@@ -13,3 +14,30 @@ class BookPublic(SQLModel):
     cover_url: Optional[str]
     openlibrary_url: Optional[str]
     created_at: datetime
+
+
+class BookBatchResponse(SQLModel):
+    items: list[BookPublic]
+    missing: list[UUID]
+
+
+class BookSuggestion(SQLModel):
+    id: UUID
+    title: str
+    author: str
+
+
+class BookImportError(BaseModel):
+    line: int
+    error: str
+
+
+class BookImportResult(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[BookImportError] = []
+    errors_truncated: bool = False
+    elapsed_seconds: float = 0.0
+    rows_per_second: int = 0
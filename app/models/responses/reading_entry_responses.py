@@ -5,6 +5,7 @@ from typing import Optional
 from uuid import UUID
 
 from ..domain.reading_entry import ReadingStatus
+from .book_responses import BookPublic
 
 
 class ReadingEntryPublic(SQLModel):
@@ -17,3 +18,7 @@ class ReadingEntryPublic(SQLModel):
     review: Optional[str]
     status: ReadingStatus
     created_at: datetime
+
+
+class ReadingEntryWithBook(ReadingEntryPublic):
+    book: BookPublic
@@ -0,0 +1,22 @@
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from sqlmodel import SQLModel
+
+
+class MonthlyCompletionsPublic(SQLModel):
+    month: date
+    completed: int
+
+
+class UserReadingStatsPublic(SQLModel):
+    user_id: UUID
+    total: int
+    want_to_read: int
+    in_progress: int
+    completed: int
+    abandoned: int
+    rating_count: int
+    average_rating: Optional[float]
+    completed_by_month: list[MonthlyCompletionsPublic]
@@ -0,0 +1,14 @@
+from sqlmodel import SQLModel
+
+
+class PoolStatsPublic(SQLModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_avg: float
+    timeouts: int
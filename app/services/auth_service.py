@@ -4,9 +4,11 @@ from typing import Optional, Tuple
 from uuid import UUID
 
 from jose import JWTError, jwt
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from app.core.cache import user_cache
 from app.core.config import settings
 from app.core.exceptions import SupabaseAuthError, ValidationError
 from app.models.domain.user import User
@@ -25,7 +27,15 @@ class AuthService:
         if not user_id:
             return None
 
-        return await self.session.get(User, user_id)
+        snapshot = user_cache.get(user_id)
+        if snapshot is not None:
+            return User.model_validate(snapshot)
+
+        user = await self.session.get(User, user_id)
+        if user:
+            user_cache.set(user_id, user.model_dump())
+
+        return user
 
     async def authenticate_with_supabase(self, supabase_token: str) -> User:
         """Authenticate using Supabase JWT and return user (for login only)"""
@@ -40,12 +50,6 @@ class AuthService:
         if not email:
             raise ValidationError("Email is required from Supabase token")
 
-        result = await self.session.execute(select(User).where(User.email == email))
-        existing_user = result.scalars().first()
-
-        if existing_user:
-            return existing_user
-
         user_metadata = supabase_user.get("user_metadata", {})
 
         username = (
@@ -60,12 +64,26 @@ class AuthService:
             email=email,
             avatar_url=avatar_url,
         )
-        user = User.model_validate(user_data)
-        self.session.add(user)
+        new_user = User.model_validate(user_data)
+
+        # Existing users are returned unchanged. DO NOTHING leaves their row
+        # untouched, so RETURNING is empty and the stored row is read instead;
+        # a concurrent first login is waited for by the insert, never raced.
+        statement = (
+            insert(User)
+            .values(**new_user.model_dump())
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
+        )
+        user = (await self.session.scalars(statement)).one_or_none()
+        if user is None:
+            user = (
+                await self.session.scalars(select(User).where(User.email == email))
+            ).one()
         await self.session.commit()
-        await self.session.refresh(user)
 
-        logger.info(f"Created new user from Supabase: {email}")
+        if user.id == new_user.id:
+            logger.info("Created new user from Supabase: %s", email)
         return user
 
     def create_api_jwt(self, user_id: UUID) -> Tuple[str, datetime]:
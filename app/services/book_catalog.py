@@ -0,0 +1,254 @@
+import asyncio
+import json
+import logging
+import sys
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import Uuid, any_, bindparam, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.models.domain.book import Book
+from app.services.book_suggestions import book_suggestions
+
+logger = logging.getLogger(__name__)
+
+BOOK_CHANGES_CHANNEL = "book_changes"
+# NOTIFY payloads are capped at 8000 bytes; 100 UUIDs stay well below that
+NOTIFY_IDS_PER_MESSAGE = 100
+LISTENER_RETRY_SECONDS = 5.0
+# Books re-read per query when applying changes
+REFRESH_BATCH_SIZE = 5000
+
+
+class CatalogBook:
+    """Read-only copy of a book row, a fraction of the size of an ORM instance"""
+
+    __slots__ = (
+        "id",
+        "created_at",
+        "updated_at",
+        "title",
+        "author",
+        "isbn",
+        "olid",
+        "cover_url",
+        "openlibrary_url",
+    )
+
+    def __init__(self, book: Any):
+        for field in self.__slots__:
+            setattr(self, field, getattr(book, field))
+
+    def size(self) -> int:
+        """Approximate bytes held by this entry, counting its field values"""
+        values = (getattr(self, field) for field in self.__slots__)
+        return sys.getsizeof(self) + sum(
+            sys.getsizeof(value) for value in values if value is not None
+        )
+
+
+class BookCatalog:
+    """In-memory replica of the book table for id lookups.
+
+    Loaded at startup and kept current through `book_changes` notifications.
+    If the rows outgrow BOOK_CATALOG_MAX_MB the catalog switches itself off and
+    lookups fall back to the database.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.enabled = False
+        self._books: dict[UUID, CatalogBook] = {}
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    async def load(self, session: AsyncSession) -> None:
+        books: dict[UUID, CatalogBook] = {}
+        total = 0
+        columns = [getattr(Book, field) for field in CatalogBook.__slots__]
+        result = await session.stream(
+            select(*columns).execution_options(yield_per=5000)
+        )
+        async for row in result:
+            entry = CatalogBook(row)
+            books[entry.id] = entry
+            total += entry.size()
+            if total > self.max_bytes:
+                await result.close()
+                self._disable("loading")
+                return
+
+        self._books, self._bytes, self.enabled = books, total, True
+        logger.info(
+            "Loaded %d books into the catalog (%.1f MiB)", len(books), total / 2**20
+        )
+
+    def get(self, book_id: UUID) -> Optional[CatalogBook]:
+        return self._books.get(book_id) if self.enabled else None
+
+    def upsert(self, book: Book) -> None:
+        if not self.enabled:
+            return
+        entry = CatalogBook(book)
+        previous = self._books.get(entry.id)
+        self._books[entry.id] = entry
+        self._bytes += entry.size() - (previous.size() if previous else 0)
+        if self._bytes > self.max_bytes:
+            self._disable("an update")
+
+    def remove(self, book_id: UUID) -> None:
+        previous = self._books.pop(book_id, None)
+        if previous:
+            self._bytes -= previous.size()
+
+    def _disable(self, during: str) -> None:
+        self.enabled = False
+        self._books, self._bytes = {}, 0
+        logger.warning(
+            "Book catalog exceeded %.0f MiB during %s; serving books from the "
+            "database",
+            self.max_bytes / 2**20,
+            during,
+        )
+
+
+book_catalog = BookCatalog(settings.BOOK_CATALOG_MAX_MB * 2**20)
+
+
+async def notify_book_changes(
+    session: AsyncSession, operation: str, book_ids: Iterable[UUID]
+) -> None:
+    """Queue a book_changes notification in the session's transaction.
+
+    Postgres only delivers it on commit, so other workers never see a change
+    that was rolled back.
+    """
+    ids = [str(book_id) for book_id in book_ids]
+    for start in range(0, len(ids), NOTIFY_IDS_PER_MESSAGE):
+        payload = json.dumps(
+            {"op": operation, "ids": ids[start : start + NOTIFY_IDS_PER_MESSAGE]}
+        )
+        await session.execute(select(func.pg_notify(BOOK_CHANGES_CHANNEL, payload)))
+
+
+class BookChangeListener:
+    """LISTENs on book_changes and applies changes to the catalog and the
+    suggestion index of this worker.
+
+    Notifications that arrive together are applied as one batch. Changed ids
+    are re-read rather than trusting the payload, so a batch always ends at
+    the rows' current state whatever order its changes came in, and deleted
+    books are simply the ones no longer found. Both in-memory copies are
+    (re)loaded once the LISTEN is in place, and again after every reconnect,
+    so no change can slip between a load and the subscription. If startup
+    gives up waiting for the LISTEN it loads anyway and reloads on the first
+    subscription.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Subscribe, load the suggestion index and catalog, then apply changes"""
+        subscribed = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._listen(subscribed))]
+        try:
+            await asyncio.wait_for(subscribed.wait(), LISTENER_RETRY_SECONDS)
+        except TimeoutError:
+            logger.warning("Book change listener is not connected yet")
+            # Load now, and again once subscribed, like after a reconnect
+            subscribed.set()
+
+        await self._reload()
+        self._tasks.append(asyncio.create_task(self._apply_changes()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _listen(self, subscribed: asyncio.Event) -> None:
+        dsn = str(settings.DATABASE_URL).replace("postgresql+asyncpg", "postgresql")
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(BOOK_CHANGES_CHANNEL, self._on_notify)
+                if subscribed.is_set():
+                    # Changes made while disconnected were never delivered
+                    self._queue.put_nowait(None)
+                subscribed.set()
+                await lost.wait()
+                logger.warning("Book change listener lost its connection")
+            except asyncio.CancelledError:
+                if connection is not None:
+                    await connection.close()
+                raise
+            except Exception as e:
+                logger.warning("Book change listener failed: %s", e)
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self._queue.put_nowait(payload)
+
+    async def _apply_changes(self) -> None:
+        while True:
+            payloads = [await self._queue.get()]
+            # A bulk import sends a burst of notifications on commit; apply
+            # whatever has arrived together so the burst costs one refresh
+            while not self._queue.empty():
+                payloads.append(self._queue.get_nowait())
+            try:
+                if None in payloads:
+                    await self._reload()
+                    continue
+                book_ids: dict[UUID, None] = {}
+                for payload in payloads:
+                    message = json.loads(payload)
+                    book_ids.update((UUID(book_id), None) for book_id in message["ids"])
+                await self._refresh(list(book_ids))
+            except Exception as e:
+                logger.error("Could not apply book changes %r: %s", payloads, e)
+
+    async def _refresh(self, book_ids: list[UUID]) -> None:
+        """Re-read changed books; those no longer in the table are removed"""
+        changed = []
+        for start in range(0, len(book_ids), REFRESH_BATCH_SIZE):
+            batch = book_ids[start : start + REFRESH_BATCH_SIZE]
+            async with session_scope() as session:
+                result = await session.execute(
+                    select(Book).where(
+                        Book.id == any_(bindparam("book_ids", batch, type_=ARRAY(Uuid)))
+                    )
+                )
+                books = {book.id: book for book in result.scalars()}
+
+            for book_id in batch:
+                book = books.get(book_id)
+                if book is None:
+                    book_catalog.remove(book_id)
+                    book_suggestions.remove(book_id)
+                else:
+                    book_catalog.upsert(book)
+                    changed.append((book.id, book.title, book.author))
+        book_suggestions.upsert_many(changed)
+
+    async def _reload(self) -> None:
+        async with session_scope() as session:
+            await book_suggestions.load(session)
+            if settings.BOOK_CATALOG_ENABLED:
+                await book_catalog.load(session)
+
+
+book_change_listener = BookChangeListener()
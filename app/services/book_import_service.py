@@ -0,0 +1,246 @@
+import csv
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Optional, Union
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationError
+from app.models.base import utcnow
+from app.models.requests.book_requests import BookCreate
+from app.models.responses.book_responses import BookImportError, BookImportResult
+from app.services.book_catalog import notify_book_changes
+from app.services.book_suggestions import book_suggestions
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+IMPORT_FORMATS = ("ndjson", "csv")
+# Far above the longest valid row; stops a newline-free body from being
+# buffered without limit
+MAX_LINE_BYTES = 16 * 1024
+
+STAGING_TABLE = "book_import"
+BOOK_COLUMNS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "title",
+    "author",
+    "isbn",
+    "olid",
+    "cover_url",
+    "openlibrary_url",
+)
+# Staged rows also carry their input line, which decides the first of several
+# rows for the same book
+COPY_COLUMNS = (*BOOK_COLUMNS, "line")
+
+CREATE_STAGING_TABLE = text(
+    f"CREATE TEMP TABLE {STAGING_TABLE} "
+    "(LIKE book INCLUDING DEFAULTS, line integer NOT NULL) ON COMMIT DROP"
+)
+
+# Rows whose ISBN or OLID already exists in the catalog, or that share either
+# one with an earlier row of the same batch, are skipped. Only rows that are
+# new to the catalog are numbered, so a row skipped for one identifier does not
+# hide a later row that shares only its other one.
+MERGE_STAGING_TABLE = text(
+    f"""
+    WITH new_rows AS (
+        SELECT s.*
+        FROM {STAGING_TABLE} s
+        WHERE NOT EXISTS (SELECT 1 FROM book b WHERE b.isbn = s.isbn)
+            AND NOT EXISTS (SELECT 1 FROM book b WHERE b.olid = s.olid)
+    ),
+    staged AS (
+        SELECT s.*,
+            row_number() OVER (PARTITION BY s.isbn ORDER BY s.line) AS isbn_seen,
+            row_number() OVER (PARTITION BY s.olid ORDER BY s.line) AS olid_seen
+        FROM new_rows s
+    )
+    INSERT INTO book ({", ".join(BOOK_COLUMNS)})
+    SELECT {", ".join(f"s.{column}" for column in BOOK_COLUMNS)}
+    FROM staged s
+    WHERE (s.isbn IS NULL OR s.isbn_seen = 1)
+        AND (s.olid IS NULL OR s.olid_seen = 1)
+    ORDER BY s.line
+    RETURNING id, title, author
+    """
+)
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            _check_line_length(line, line_number)
+            yield line.decode("utf-8-sig", errors="replace").rstrip("\r")
+        _check_line_length(buffer, line_number + 1)
+    if buffer:
+        yield buffer.decode("utf-8-sig", errors="replace").rstrip("\r")
+
+
+def _check_line_length(line: bytes, line_number: int) -> None:
+    if len(line) > MAX_LINE_BYTES:
+        raise ValidationError(
+            f"Line {line_number} is longer than {MAX_LINE_BYTES} bytes"
+        )
+
+
+def _format_validation_error(error: PydanticValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+class BookImportService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def import_books(
+        self, chunks: AsyncIterator[bytes], file_format: str
+    ) -> BookImportResult:
+        """Stream NDJSON or CSV rows into the catalog in COPY-sized batches.
+
+        Only one batch of input is held in memory at a time. Valid rows are
+        copied into a temporary staging table and merged into book with
+        ISBN/OLID dedupe; the whole import commits as a single transaction, and
+        only then are the inserted books added to the suggestion index.
+        """
+        if file_format not in IMPORT_FORMATS:
+            raise ValidationError(f"Unsupported import format: {file_format}")
+
+        started = time.perf_counter()
+        result = BookImportResult()
+
+        await self.session.execute(CREATE_STAGING_TABLE)
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection: Any = raw_connection.driver_connection
+
+        batch: list[tuple] = []
+        inserted: list[tuple[UUID, str, str]] = []
+        async for line_number, row in self._iter_rows(chunks, file_format):
+            result.received += 1
+
+            if isinstance(row, str):
+                self._record_error(result, line_number, row)
+                continue
+            try:
+                book = BookCreate.model_validate(row)
+            except PydanticValidationError as e:
+                self._record_error(result, line_number, _format_validation_error(e))
+                continue
+
+            now = utcnow()
+            batch.append(
+                (
+                    uuid4(),
+                    now,
+                    now,
+                    book.title,
+                    book.author,
+                    book.isbn,
+                    book.olid,
+                    book.cover_url,
+                    book.openlibrary_url,
+                    line_number,
+                )
+            )
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                inserted += await self._flush(driver_connection, batch, result)
+                batch = []
+
+        if batch:
+            inserted += await self._flush(driver_connection, batch, result)
+        await self.session.commit()
+        book_suggestions.upsert_many(inserted)
+
+        result.elapsed_seconds = round(time.perf_counter() - started, 3)
+        if result.elapsed_seconds:
+            result.rows_per_second = round(result.received / result.elapsed_seconds)
+
+        logger.info(
+            "Imported %d books (%d duplicates, %d failed) in %ss",
+            result.inserted,
+            result.duplicates,
+            result.failed,
+            result.elapsed_seconds,
+        )
+        return result
+
+    async def _flush(
+        self, driver_connection: Any, batch: list[tuple], result: BookImportResult
+    ) -> list[tuple[UUID, str, str]]:
+        """Merge one batch into book; returns (id, title, author) of new books"""
+        await driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=batch, columns=COPY_COLUMNS
+        )
+        inserted = (await self.session.execute(MERGE_STAGING_TABLE)).all()
+        await self.session.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+
+        result.inserted += len(inserted)
+        result.duplicates += len(batch) - len(inserted)
+        await notify_book_changes(
+            self.session, "upsert", (book_id for book_id, _, _ in inserted)
+        )
+        return [tuple(row) for row in inserted]
+
+    @staticmethod
+    def _record_error(result: BookImportResult, line: int, error: str) -> None:
+        result.failed += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(BookImportError(line=line, error=error))
+        else:
+            result.errors_truncated = True
+
+    @staticmethod
+    async def _iter_rows(
+        chunks: AsyncIterator[bytes], file_format: str
+    ) -> AsyncIterator[tuple[int, Union[dict, str]]]:
+        """Yield (line number, row dict) pairs, or an error string per bad line.
+
+        CSV input needs a header row and one record per line (no quoted
+        newlines), which keeps parsing incremental.
+        """
+        line_number = 0
+        header: Optional[list[str]] = None
+
+        async for line in _iter_lines(chunks):
+            line_number += 1
+            if not line.strip():
+                continue
+
+            if file_format == "ndjson":
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, f"Invalid JSON: {e.msg}"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_number, "Row must be a JSON object"
+                    continue
+                yield line_number, row
+                continue
+
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [column.strip() for column in values]
+                continue
+            if len(values) != len(header):
+                yield line_number, f"Expected {len(header)} columns, got {len(values)}"
+                continue
+            yield line_number, {
+                column: value or None for column, value in zip(header, values)
+            }
@@ -1,43 +1,120 @@
 import logging
-from typing import Sequence
+from datetime import datetime
+from typing import Any, Optional, Union
 from uuid import UUID
 
+from sqlalchemy import Uuid, and_, any_, bindparam, func, literal, literal_column, or_
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.core.exceptions import NotFoundError, ValidationError
-from app.models.domain.book import Book
+from app.core.pagination import (
+    PageResult,
+    created_at_page,
+    decode_cursor,
+    encode_cursor,
+    paginate_by_created_at,
+)
+from app.models.domain.book import BOOK_SEARCH_DOCUMENT, Book
 from app.models.requests.book_requests import BookCreate, BookUpdate
+from app.services.book_catalog import CatalogBook, book_catalog, notify_book_changes
+from app.services.book_suggestions import (
+    MIN_PREFIX_LENGTH,
+    SuggestedBook,
+    book_suggestions,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class BookService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, use_catalog: bool = True):
         self.session = session
+        self.use_catalog = use_catalog
 
     async def create_book(self, book_data: BookCreate) -> Book:
         book = Book.model_validate(book_data)
 
         self.session.add(book)
+        await self.session.flush()
+        await notify_book_changes(self.session, "upsert", [book.id])
         await self.session.commit()
         await self.session.refresh(book)
+        book_catalog.upsert(book)
+        book_suggestions.upsert(book.id, book.title, book.author)
 
-        logger.info(f"Created book {book.id}: {book.title}")
+        logger.info("Created book %s: %s", book.id, book.title)
         return book
 
-    async def get_book_by_id(self, book_id: UUID) -> Book:
+    async def get_book_by_id(self, book_id: UUID) -> Union[Book, CatalogBook]:
+        """Served from the in-memory catalog when it holds the book"""
+        cached = self._cached(book_id)
+        if cached is not None:
+            return cached
+
         book = await self.session.get(Book, book_id)
         if not book:
             raise NotFoundError("Book", str(book_id))
 
         return book
 
-    async def get_all_books(self, skip: int = 0, limit: int = 100) -> Sequence[Book]:
-        statement = select(Book).offset(skip).limit(limit)
+    async def get_book_version(self, book_id: UUID) -> Optional[datetime]:
+        """updated_at of a book without loading the row, None if it is missing"""
+        cached = self._cached(book_id)
+        if cached is not None:
+            return cached.updated_at
+
+        return await self.session.scalar(
+            select(Book.updated_at).where(Book.id == book_id)
+        )
+
+    async def get_books_by_ids(
+        self, book_ids: list[UUID]
+    ) -> tuple[list[Union[Book, CatalogBook]], list[UUID]]:
+        """Resolve ids from the catalog, then the rest with one `id = ANY(:ids)`
+        query.
+
+        Returns the found books in input order (duplicates collapsed) and the
+        ids that do not exist.
+        """
+        unique_ids = list(dict.fromkeys(book_ids))
+        found: dict[UUID, Union[Book, CatalogBook]] = {}
+        for book_id in unique_ids:
+            cached = self._cached(book_id)
+            if cached is not None:
+                found[book_id] = cached
+
+        uncached = [book_id for book_id in unique_ids if book_id not in found]
+        if uncached:
+            statement = select(Book).where(
+                Book.id == any_(bindparam("book_ids", uncached, type_=ARRAY(Uuid)))
+            )
+            result = await self.session.execute(statement)
+            found.update((book.id, book) for book in result.scalars())
+
+        books = [found[book_id] for book_id in unique_ids if book_id in found]
+        missing = [book_id for book_id in unique_ids if book_id not in found]
+        return books, missing
+
+    async def get_all_books(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> PageResult[Book]:
+        statement = paginate_by_created_at(select(Book), Book, cursor, limit)
         result = await self.session.execute(statement)
 
-        return result.scalars().all()
+        return created_at_page(result.scalars().all(), limit)
+
+    async def get_all_books_versions(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> PageResult[Any]:
+        """The page get_all_books would return, as (id, updated_at) rows only"""
+        statement = paginate_by_created_at(
+            select(Book.id, Book.created_at, Book.updated_at), Book, cursor, limit
+        )
+        result = await self.session.execute(statement)
+
+        return created_at_page(result.all(), limit)
 
     async def update_book(self, book_id: UUID, book_update: BookUpdate) -> Book:
         book = await self.session.get(Book, book_id)
@@ -53,10 +130,13 @@ class BookService:
             setattr(book, key, value)
 
         self.session.add(book)
+        await notify_book_changes(self.session, "upsert", [book.id])
         await self.session.commit()
         await self.session.refresh(book)
+        book_catalog.upsert(book)
+        book_suggestions.upsert(book.id, book.title, book.author)
 
-        logger.info(f"Updated book {book_id}")
+        logger.info("Updated book %s", book_id)
         return book
 
     async def delete_book(self, book_id: UUID) -> None:
@@ -65,14 +145,96 @@ class BookService:
             raise NotFoundError("Book", str(book_id))
 
         await self.session.delete(book)
+        await notify_book_changes(self.session, "delete", [book_id])
         await self.session.commit()
+        book_catalog.remove(book_id)
+        book_suggestions.remove(book_id)
 
-        logger.info(f"Deleted book {book_id}")
+        logger.info("Deleted book %s", book_id)
         return None
 
-    async def search_books(self, query: str) -> Sequence[Book]:
-        statement = select(Book).where(
-            (Book.title.ilike(f"%{query}%")) | (Book.author.ilike(f"%{query}%"))
+    async def suggest_books(
+        self, prefix: str, limit: int = 10
+    ) -> list[SuggestedBook]:
+        """Prefix suggestions served from memory.
+
+        Only while the index is switched off (over its memory budget) are they
+        matched against titles and authors in the database, unranked.
+        """
+        if book_suggestions.enabled:
+            return book_suggestions.suggest(prefix, limit)
+
+        prefix = prefix.strip()
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return []
+        pattern = (
+            prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
         )
-        result = await self.session.execute(statement)
-        return result.scalars().all()
+        result = await self.session.execute(
+            select(Book.id, Book.title, Book.author)
+            .where(
+                or_(
+                    Book.title.ilike(pattern, escape="\\"),
+                    Book.author.ilike(pattern, escape="\\"),
+                )
+            )
+            .order_by(Book.title, Book.id)
+            .limit(limit)
+        )
+        return [SuggestedBook(*row, popularity=0) for row in result]
+
+    async def search_books(
+        self, query: str, cursor: Optional[str] = None, limit: int = 100
+    ) -> PageResult[Book]:
+        """Ranked search over title and author.
+
+        Full-text matches are served by the GIN tsvector index, fuzzy and
+        misspelled ones by the trigram indexes (word similarity). Results are
+        ordered by relevance and paginated with a (rank, id) keyset cursor.
+        """
+        query = query.strip()
+        if not query:
+            return PageResult([], None)
+
+        document = literal_column(BOOK_SEARCH_DOCUMENT)
+        ts_query = func.websearch_to_tsquery(literal_column("'simple'"), query)
+        rank = func.greatest(
+            func.ts_rank(document, ts_query),
+            func.word_similarity(query, Book.title),
+            func.word_similarity(query, Book.author),
+        ).label("rank")
+
+        statement = select(Book, rank).where(
+            or_(
+                document.op("@@")(ts_query),
+                literal(query).op("<%")(Book.title),
+                literal(query).op("<%")(Book.author),
+            )
+        )
+
+        if cursor:
+            last_rank, last_id = self._decode_search_cursor(cursor)
+            statement = statement.where(
+                or_(rank < last_rank, and_(rank == last_rank, Book.id > last_id))
+            )
+
+        statement = statement.order_by(rank.desc(), Book.id).limit(limit + 1)
+        rows = (await self.session.execute(statement)).all()
+
+        books = [row[0] for row in rows[:limit]]
+        if len(rows) <= limit:
+            return PageResult(books, None)
+
+        last_book, last_rank = rows[limit - 1]
+        return PageResult(books, encode_cursor(last_rank, last_book.id))
+
+    def _cached(self, book_id: UUID) -> Optional[CatalogBook]:
+        return book_catalog.get(book_id) if self.use_catalog else None
+
+    @staticmethod
+    def _decode_search_cursor(cursor: str) -> tuple[float, UUID]:
+        try:
+            last_rank, last_id = decode_cursor(cursor)
+            return float(last_rank), UUID(last_id)
+        except ValueError:
+            raise ValidationError("Invalid cursor")
@@ -0,0 +1,288 @@
+import heapq
+import logging
+import sys
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Iterable, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models.domain.book import Book
+from app.models.domain.reading_entry import ReadingEntry
+
+logger = logging.getLogger(__name__)
+
+# Letters that NFKD does not decompose into a base letter plus accent
+_FOLD_LETTERS = str.maketrans({"ł": "l", "ø": "o", "đ": "d"})
+
+# Shorter prefixes match too much of the catalog to make useful suggestions
+MIN_PREFIX_LENGTH = 2
+# Prefixes matching more keys than this are answered from a ranked list kept
+# for the prefix instead of scanning the whole range on every keystroke
+MAX_SCAN_KEYS = 2_000
+# Twice the largest limit the endpoint accepts, so a ranked list survives a
+# number of removals before it has to be rebuilt
+TOP_SIZE = 100
+# Dict and list slots per book, on top of the objects themselves
+BOOK_OVERHEAD_BYTES = 100
+
+
+def normalize(value: str) -> str:
+    """Casefold, strip accents and collapse whitespace"""
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.translate(_FOLD_LETTERS).split())
+
+
+class SuggestedBook(NamedTuple):
+    id: UUID
+    title: str
+    author: str
+    popularity: int
+
+
+# Sort key of a suggestion: most popular first, then by title
+Rank = tuple[int, str, UUID]
+Key = tuple[str, UUID]
+
+
+class BookSuggestionIndex:
+    """In-memory prefix index over normalized book titles and authors.
+
+    Keys live in one sorted list of (normalized_text, book_id) pairs, so a
+    prefix lookup is two bisections plus a top-k pass over the matching range.
+    Ranges longer than MAX_SCAN_KEYS (prefixes of common words) are scanned
+    once; their best TOP_SIZE books are then kept per prefix and updated as
+    books change. A ranked list stays exact: every book left out ranks below
+    every book in it, so a listed book that falls back is dropped rather than
+    guessed at, and the list is rebuilt once it is shorter than a request.
+
+    The index takes roughly 550 bytes per book, about 0.5 GiB per worker for a
+    million books. If it outgrows max_bytes it switches itself off and
+    suggestions are served from the database.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.enabled = False
+        self._keys: list[Key] = []
+        self._books: dict[UUID, SuggestedBook] = {}
+        self._bytes = 0
+        self._top: dict[str, list[Rank]] = {}
+        self._top_lengths: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    @staticmethod
+    def _keys_for(book: SuggestedBook) -> set[Key]:
+        return {(normalize(book.title), book.id), (normalize(book.author), book.id)}
+
+    @staticmethod
+    def _rank(book: SuggestedBook) -> Rank:
+        return (-book.popularity, book.title, book.id)
+
+    @staticmethod
+    def _size(book: SuggestedBook, keys: set[Key]) -> int:
+        """Approximate bytes held for one book and its keys"""
+        return (
+            sys.getsizeof(book)
+            + sys.getsizeof(book.title)
+            + sys.getsizeof(book.author)
+            + sum(sys.getsizeof(key) + sys.getsizeof(key[0]) for key in keys)
+            + BOOK_OVERHEAD_BYTES
+        )
+
+    async def load(self, session: AsyncSession) -> None:
+        statement = (
+            select(Book.id, Book.title, Book.author, func.count(ReadingEntry.id))
+            .outerjoin(ReadingEntry, ReadingEntry.book_id == Book.id)
+            .group_by(Book.id)
+            .execution_options(yield_per=5000)
+        )
+        result = await session.stream(statement)
+
+        books: dict[UUID, SuggestedBook] = {}
+        keys: list[Key] = []
+        total = 0
+        async for book_id, title, author, popularity in result:
+            book = SuggestedBook(book_id, title, author, popularity)
+            book_keys = self._keys_for(book)
+            books[book_id] = book
+            keys.extend(book_keys)
+            total += self._size(book, book_keys)
+            if total > self.max_bytes:
+                await result.close()
+                self._disable("loading")
+                return
+        keys.sort()
+
+        self._books, self._keys, self._bytes = books, keys, total
+        self._top, self._top_lengths = {}, set()
+        self.enabled = True
+        logger.info(
+            "Loaded %d books into the suggestion index (%.1f MiB)",
+            len(books),
+            total / 2**20,
+        )
+
+    def upsert(self, book_id: UUID, title: str, author: str) -> None:
+        if not self.enabled:
+            return
+        previous = self._books.get(book_id)
+        if previous and (previous.title, previous.author) == (title, author):
+            return
+        popularity = previous.popularity if previous else 0
+        self._replace(previous, SuggestedBook(book_id, title, author, popularity))
+
+    def upsert_many(self, books: Iterable[tuple[UUID, str, str]]) -> None:
+        """Add or update many books, e.g. after a bulk import.
+
+        Keys of new books are sorted and merged into the key list in one pass
+        rather than inserted one by one, each insertion shifting the list.
+        """
+        if not self.enabled:
+            return
+        updated = []
+        added: list[Key] = []
+        for book_id, title, author in books:
+            if book_id in self._books:
+                updated.append((book_id, title, author))
+                continue
+            book = SuggestedBook(book_id, title, author, 0)
+            keys = self._keys_for(book)
+            self._books[book_id] = book
+            self._bytes += self._size(book, keys)
+            added.extend(keys)
+            if self._top:
+                self._update_top(None, set(), book, keys)
+
+        if added:
+            added.sort()
+            self._keys = list(heapq.merge(self._keys, added))
+        if self._bytes > self.max_bytes:
+            self._disable("an update")
+        for book_id, title, author in updated:
+            self.upsert(book_id, title, author)
+
+    def remove(self, book_id: UUID) -> None:
+        previous = self._books.get(book_id)
+        if previous:
+            self._replace(previous, None)
+
+    def adjust_popularity(self, book_id: UUID, delta: int) -> None:
+        book = self._books.get(book_id)
+        if book:
+            self._replace(
+                book, book._replace(popularity=max(0, book.popularity + delta))
+            )
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[SuggestedBook]:
+        needle = normalize(prefix)
+        if len(needle) < MIN_PREFIX_LENGTH:
+            return []
+
+        start = bisect_left(self._keys, (needle,))
+        end = bisect_left(self._keys, (needle + "\U0010ffff",), lo=start)
+        if end - start <= MAX_SCAN_KEYS:
+            if self._top.pop(needle, None) is not None:
+                self._top_lengths = {len(hot) for hot in self._top}
+            ranked = self._rank_range(start, end, limit)
+        else:
+            ranked = self._top.get(needle, [])
+            if len(ranked) < limit:
+                ranked = self._top[needle] = self._rank_range(start, end, TOP_SIZE)
+                self._top_lengths.add(len(needle))
+
+        return [self._books[book_id] for _, _, book_id in ranked[:limit]]
+
+    def _rank_range(self, start: int, end: int, count: int) -> list[Rank]:
+        candidates = {book_id for _, book_id in self._keys[start:end]}
+        return heapq.nsmallest(
+            count, (self._rank(self._books[book_id]) for book_id in candidates)
+        )
+
+    def _replace(
+        self, previous: Optional[SuggestedBook], book: Optional[SuggestedBook]
+    ) -> None:
+        old_keys = self._keys_for(previous) if previous else set()
+        new_keys = self._keys_for(book) if book else set()
+        for key in old_keys - new_keys:
+            self._remove_key(key)
+        for key in new_keys - old_keys:
+            insort(self._keys, key)
+
+        if book:
+            self._books[book.id] = book
+            self._bytes += self._size(book, new_keys)
+        if previous:
+            if not book:
+                del self._books[previous.id]
+            self._bytes -= self._size(previous, old_keys)
+
+        if self._top:
+            self._update_top(previous, old_keys, book, new_keys)
+        if self._bytes > self.max_bytes:
+            self._disable("an update")
+
+    def _update_top(
+        self,
+        previous: Optional[SuggestedBook],
+        old_keys: set[Key],
+        book: Optional[SuggestedBook],
+        new_keys: set[Key],
+    ) -> None:
+        old_rank = self._rank(previous) if previous else None
+        new_rank = self._rank(book) if book else None
+        new_hot = self._hot_prefixes(new_keys)
+
+        for prefix in self._hot_prefixes(old_keys) | new_hot:
+            ranked = self._top[prefix]
+            listed = old_rank is not None and self._discard(ranked, old_rank)
+            if new_rank is None or prefix not in new_hot:
+                continue
+            # Only a book known to rank above every book left out is listed
+            if (ranked and new_rank < ranked[-1]) or (
+                listed and new_rank <= old_rank
+            ):
+                insort(ranked, new_rank)
+                del ranked[TOP_SIZE:]
+
+    def _hot_prefixes(self, keys: set[Key]) -> set[str]:
+        return {
+            text[:length]
+            for text, _ in keys
+            for length in self._top_lengths
+            if length <= len(text) and text[:length] in self._top
+        }
+
+    @staticmethod
+    def _discard(ranked: list[Rank], rank: Rank) -> bool:
+        position = bisect_left(ranked, rank)
+        if position < len(ranked) and ranked[position] == rank:
+            del ranked[position]
+            return True
+        return False
+
+    def _remove_key(self, key: Key) -> None:
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    def _disable(self, during: str) -> None:
+        self.enabled = False
+        self._books, self._keys, self._bytes = {}, [], 0
+        self._top, self._top_lengths = {}, set()
+        logger.warning(
+            "Book suggestion index exceeded %.0f MiB during %s; serving "
+            "suggestions from the database",
+            self.max_bytes / 2**20,
+            during,
+        )
+
+
+book_suggestions = BookSuggestionIndex(settings.BOOK_SUGGESTIONS_MAX_MB * 2**20)
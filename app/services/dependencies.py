@@ -1,16 +1,31 @@
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_session
+from app.core.database import get_session, primary_window_open
 from app.services.auth_service import AuthService
+from app.services.book_import_service import BookImportService
 from app.services.book_service import BookService
 from app.services.reading_entry_service import ReadingEntryService
+from app.services.reading_stats_service import ReadingStatsService
 from app.services.user_service import UserService
 
 
-def get_book_service(session: AsyncSession = Depends(get_session)) -> BookService:
-    """Dependency to get BookService instance."""
-    return BookService(session)
+def get_book_service(
+    request: Request, session: AsyncSession = Depends(get_session)
+) -> BookService:
+    """Dependency to get BookService instance.
+
+    Clients that just wrote skip the book catalog, which may not have caught
+    up with their change yet.
+    """
+    return BookService(session, use_catalog=not primary_window_open(request.cookies))
+
+
+def get_book_import_service(
+    session: AsyncSession = Depends(get_session),
+) -> BookImportService:
+    """Dependency to get BookImportService instance."""
+    return BookImportService(session)
 
 
 def get_reading_entry_service(
@@ -20,6 +35,13 @@ def get_reading_entry_service(
     return ReadingEntryService(session)
 
 
+def get_reading_stats_service(
+    session: AsyncSession = Depends(get_session),
+) -> ReadingStatsService:
+    """Dependency to get ReadingStatsService instance."""
+    return ReadingStatsService(session)
+
+
 def get_user_service(session: AsyncSession = Depends(get_session)) -> UserService:
     """Dependency to get UserService instance."""
     return UserService(session)
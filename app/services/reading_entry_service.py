@@ -1,141 +1,284 @@
+import csv
+import io
+import json
 import logging
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional, Sequence
+from typing import Any, AsyncIterator, Optional
 from uuid import UUID
 
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from sqlmodel import select
 
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.pagination import PageResult, created_at_page, paginate_by_created_at
+from app.models.base import utcnow
 from app.models.domain.book import Book
 from app.models.domain.reading_entry import ReadingEntry, ReadingStatus
-from app.models.domain.user import User
+from app.services.book_suggestions import book_suggestions
+from app.services.reading_stats_service import EntryStatsSnapshot, ReadingStatsService
 
 logger = logging.getLogger(__name__)
 
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    "id",
+    "book_id",
+    "title",
+    "author",
+    "status",
+    "progress",
+    "rating",
+    "review",
+    "start_date",
+    "end_date",
+    "created_at",
+)
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, ReadingStatus):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def entry_version(entry: Any, include_book: bool = False) -> tuple:
+    """ETag parts for an entry; covers the embedded book when it is included.
+
+    Accepts loaded entries and the rows of the *_version queries alike.
+    """
+    if not include_book:
+        return (entry.id, entry.updated_at)
+    book_updated_at = (
+        entry.book.updated_at
+        if isinstance(entry, ReadingEntry)
+        else entry.book_updated_at
+    )
+    return (entry.id, entry.updated_at, book_updated_at)
+
 
 class ReadingEntryService:
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.stats = ReadingStatsService(session)
 
-    async def get_entry_by_id(self, entry_id: UUID) -> ReadingEntry:
-        entry = await self.session.get(ReadingEntry, entry_id)
+    async def get_entry_by_id(
+        self, entry_id: UUID, include_book: bool = False
+    ) -> ReadingEntry:
+        options = [joinedload(ReadingEntry.book)] if include_book else None
+        entry = await self.session.get(ReadingEntry, entry_id, options=options)
         if not entry:
             raise NotFoundError("Reading entry", str(entry_id))
         return entry
 
+    async def get_entry_version(
+        self, entry_id: UUID, include_book: bool = False
+    ) -> Optional[tuple]:
+        """entry_version() of an entry without loading it, None if it is missing"""
+        statement = self._version_query(include_book).where(
+            ReadingEntry.id == entry_id
+        )
+        row = (await self.session.execute(statement)).first()
+        return entry_version(row, include_book) if row else None
+
     async def get_user_entries(
-        self, user_id: UUID, status: Optional[ReadingStatus] = None
-    ) -> Sequence[ReadingEntry]:
+        self,
+        user_id: UUID,
+        status: Optional[ReadingStatus] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        include_book: bool = False,
+    ) -> PageResult[ReadingEntry]:
         statement = select(ReadingEntry).where(ReadingEntry.user_id == user_id)
 
         if status:
             statement = statement.where(ReadingEntry.status == status)
+        if include_book:
+            # Many-to-one, so the book is joined into the same single query
+            statement = statement.options(joinedload(ReadingEntry.book))
 
+        statement = paginate_by_created_at(statement, ReadingEntry, cursor, limit)
         result = await self.session.execute(statement)
-        return result.scalars().all()
-
-    async def add_book_to_library(self, user_id: UUID, book_id: UUID) -> ReadingEntry:
-        user = await self.session.get(User, user_id)
-        if not user:
-            raise NotFoundError("User", str(user_id))
+        return created_at_page(result.scalars().all(), limit)
+
+    async def get_user_entries_versions(
+        self,
+        user_id: UUID,
+        status: Optional[ReadingStatus] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        include_book: bool = False,
+    ) -> PageResult[tuple]:
+        """The page get_user_entries would return, as entry_version() tuples"""
+        statement = self._version_query(include_book).where(
+            ReadingEntry.user_id == user_id
+        )
+        if status:
+            statement = statement.where(ReadingEntry.status == status)
 
-        book = await self.session.get(Book, book_id)
-        if not book:
-            raise NotFoundError("Book", str(book_id))
+        statement = paginate_by_created_at(statement, ReadingEntry, cursor, limit)
+        result = await self.session.execute(statement)
+        page = created_at_page(result.all(), limit)
+        return PageResult(
+            [entry_version(row, include_book) for row in page.items],
+            page.next_cursor,
+        )
 
-        result = await self.session.execute(
-            select(ReadingEntry).where(
-                ReadingEntry.user_id == user_id,
-                ReadingEntry.book_id == book_id,
+    def _version_query(self, include_book: bool):
+        statement = select(
+            ReadingEntry.id, ReadingEntry.created_at, ReadingEntry.updated_at
+        )
+        if include_book:
+            statement = statement.add_columns(
+                Book.updated_at.label("book_updated_at")
+            ).join(Book, Book.id == ReadingEntry.book_id)
+        return statement
+
+    async def export_library(
+        self, user_id: UUID, file_format: str
+    ) -> AsyncIterator[bytes]:
+        """Stream a user's entries joined with book title/author.
+
+        Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE and
+        are encoded one batch per chunk, so memory stays flat for any library.
+        """
+        statement = (
+            select(
+                ReadingEntry.id,
+                ReadingEntry.book_id,
+                Book.title,
+                Book.author,
+                ReadingEntry.status,
+                ReadingEntry.progress,
+                ReadingEntry.rating,
+                ReadingEntry.review,
+                ReadingEntry.start_date,
+                ReadingEntry.end_date,
+                ReadingEntry.created_at,
             )
+            .join(Book, Book.id == ReadingEntry.book_id)
+            .where(ReadingEntry.user_id == user_id)
+            .order_by(ReadingEntry.created_at, ReadingEntry.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
         )
-        existing_entry = result.scalars().first()
+        result = await self.session.stream(statement)
+
+        if file_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            async for rows in result.partitions():
+                writer.writerows([_export_value(v) for v in row] for row in rows)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+        else:
+            async for rows in result.partitions():
+                yield "".join(
+                    json.dumps(
+                        {c: _export_value(v) for c, v in zip(EXPORT_COLUMNS, row)}
+                    )
+                    + "\n"
+                    for row in rows
+                ).encode()
 
-        if existing_entry:
-            logger.info(f"Book {book_id} already in library for user {user_id}")
-            return existing_entry
+    async def add_book_to_library(self, user_id: UUID, book_id: UUID) -> ReadingEntry:
+        """Idempotently add a book with INSERT ... ON CONFLICT DO NOTHING.
 
+        The unique (user_id, book_id) constraint makes concurrent adds resolve
+        to a single row. When the book is already in the library RETURNING is
+        empty and the existing entry is read instead, leaving its row
+        untouched.
+        """
         entry = ReadingEntry(
             user_id=user_id, book_id=book_id, status=ReadingStatus.WANT_TO_READ
         )
+        statement = (
+            insert(ReadingEntry)
+            .values(**entry.model_dump())
+            .on_conflict_do_nothing(
+                index_elements=[ReadingEntry.user_id, ReadingEntry.book_id]
+            )
+            .returning(ReadingEntry)
+        )
+
+        try:
+            stored_entry = (await self.session.scalars(statement)).one_or_none()
+        except IntegrityError as e:
+            await self.session.rollback()
+            # asyncpg's error, with the violated constraint, is the cause of
+            # the DBAPI error SQLAlchemy wraps
+            constraint = getattr(e.orig.__cause__, "constraint_name", None)
+            if constraint == "readingentry_book_id_fkey":
+                raise NotFoundError("Book", str(book_id))
+            raise NotFoundError("User", str(user_id))
 
-        self.session.add(entry)
+        if stored_entry is None:
+            stored_entry = (
+                await self.session.scalars(
+                    select(ReadingEntry).where(
+                        ReadingEntry.user_id == user_id,
+                        ReadingEntry.book_id == book_id,
+                    )
+                )
+            ).one()
+            await self.session.commit()
+            logger.info("Book %s already in library for user %s", book_id, user_id)
+            return stored_entry
+
+        await self.stats.apply_change(user_id, None, EntryStatsSnapshot.of(entry))
         await self.session.commit()
-        await self.session.refresh(entry)
+        book_suggestions.adjust_popularity(book_id, 1)
 
-        logger.info(f"Added book {book_id} to library for user {user_id}")
-        return entry
+        logger.info("Added book %s to library for user %s", book_id, user_id)
+        return stored_entry
 
     async def start_reading(self, entry_id: UUID) -> ReadingEntry:
-        entry = await self.session.get(ReadingEntry, entry_id)
-        if not entry:
-            raise NotFoundError("Reading entry", str(entry_id))
-
-        entry.start_reading()
-        self.session.add(entry)
-        await self.session.commit()
-        await self.session.refresh(entry)
+        entry = await self._transition(entry_id, ReadingEntry.start_reading_values())
 
-        logger.info(f"Started reading entry {entry_id}")
+        logger.info("Started reading entry %s", entry_id)
         return entry
 
     async def update_reading_progress(
         self, entry_id: UUID, progress: Decimal
     ) -> ReadingEntry:
-        entry = await self.session.get(ReadingEntry, entry_id)
-        if not entry:
-            raise NotFoundError("Reading entry", str(entry_id))
+        try:
+            values = ReadingEntry.progress_values(progress)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        entry = await self._transition(entry_id, values)
 
-        entry.update_progress(progress)
-        self.session.add(entry)
-        await self.session.commit()
-        await self.session.refresh(entry)
-
-        logger.info(f"Updated progress for entry {entry_id} to {progress}%")
+        logger.info("Updated progress for entry %s to %s%%", entry_id, progress)
         return entry
 
     async def complete_reading(self, entry_id: UUID) -> ReadingEntry:
-        entry = await self.session.get(ReadingEntry, entry_id)
-        if not entry:
-            raise NotFoundError("Reading entry", str(entry_id))
+        entry = await self._transition(entry_id, ReadingEntry.completion_values())
 
-        entry.mark_completed()
-        self.session.add(entry)
-        await self.session.commit()
-        await self.session.refresh(entry)
-
-        logger.info(f"Completed reading entry {entry_id}")
+        logger.info("Completed reading entry %s", entry_id)
         return entry
 
     async def abandon_reading(self, entry_id: UUID) -> ReadingEntry:
-        entry = await self.session.get(ReadingEntry, entry_id)
-        if not entry:
-            raise NotFoundError("Reading entry", str(entry_id))
-
-        entry.mark_abandoned()
-        self.session.add(entry)
-        await self.session.commit()
-        await self.session.refresh(entry)
+        entry = await self._transition(entry_id, ReadingEntry.abandon_values())
 
-        logger.info(f"Abandoned reading entry {entry_id}")
+        logger.info("Abandoned reading entry %s", entry_id)
         return entry
 
     async def update_review(
         self, entry_id: UUID, rating: int, review: Optional[str] = None
     ) -> ReadingEntry:
-        entry = await self.session.get(ReadingEntry, entry_id)
-        if not entry:
-            raise NotFoundError("Reading entry", str(entry_id))
+        entry = await self._transition(entry_id, {"rating": rating, "review": review})
 
-        entry.rating = rating
-        entry.review = review
-
-        self.session.add(entry)
-        await self.session.commit()
-        await self.session.refresh(entry)
-
-        logger.info(f"Updated review for entry {entry_id}")
+        logger.info("Updated review for entry %s", entry_id)
         return entry
 
     async def delete_entry(self, entry_id: UUID) -> None:
@@ -144,7 +287,53 @@ class ReadingEntryService:
             raise NotFoundError("Reading entry", str(entry_id))
 
         await self.session.delete(entry)
+        await self.stats.apply_change(entry.user_id, EntryStatsSnapshot.of(entry), None)
         await self.session.commit()
+        book_suggestions.adjust_popularity(entry.book_id, -1)
 
-        logger.info(f"Deleted reading entry {entry_id}")
+        logger.info("Deleted reading entry %s", entry_id)
         return None
+
+    async def _transition(
+        self, entry_id: UUID, values: dict[str, Any]
+    ) -> ReadingEntry:
+        """Apply a transition as one conditional UPDATE ... RETURNING.
+
+        The row is locked and its previous state read in a CTE, so the stats
+        delta comes from the exact version the update replaced.
+        """
+        previous = (
+            select(
+                ReadingEntry.id,
+                ReadingEntry.status,
+                ReadingEntry.rating,
+                ReadingEntry.end_date,
+            )
+            .where(ReadingEntry.id == entry_id)
+            .with_for_update()
+            .cte("previous")
+        )
+        statement = (
+            update(ReadingEntry)
+            .where(ReadingEntry.id == previous.c.id)
+            .values(**values, updated_at=utcnow())
+            .returning(
+                ReadingEntry,
+                previous.c.status,
+                previous.c.rating,
+                previous.c.end_date,
+            )
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        row = (await self.session.execute(statement)).first()
+        if row is None:
+            raise NotFoundError("Reading entry", str(entry_id))
+
+        entry, previous_status, previous_rating, previous_end_date = row
+        await self.stats.apply_change(
+            entry.user_id,
+            EntryStatsSnapshot(previous_status, previous_rating, previous_end_date),
+            EntryStatsSnapshot.of(entry),
+        )
+        await self.session.commit()
+        return entry
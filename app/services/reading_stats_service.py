@@ -0,0 +1,221 @@
+import logging
+from collections import Counter
+from datetime import date, datetime
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import Date, cast, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.exceptions import NotFoundError
+from app.models.base import utcnow
+from app.models.domain.reading_entry import ReadingEntry, ReadingStatus
+from app.models.domain.reading_stats import UserMonthlyCompletions, UserReadingStats
+from app.models.domain.user import User
+from app.models.responses.reading_stats_responses import (
+    MonthlyCompletionsPublic,
+    UserReadingStatsPublic,
+)
+
+logger = logging.getLogger(__name__)
+
+STATUS_COLUMNS = {
+    ReadingStatus.WANT_TO_READ: "want_to_read",
+    ReadingStatus.IN_PROGRESS: "in_progress",
+    ReadingStatus.COMPLETED: "completed",
+    ReadingStatus.ABANDONED: "abandoned",
+}
+
+
+class EntryStatsSnapshot(NamedTuple):
+    """The parts of a reading entry that feed the user's aggregates"""
+
+    status: ReadingStatus
+    rating: Optional[int]
+    end_date: Optional[datetime]
+
+    @classmethod
+    def of(cls, entry: ReadingEntry) -> "EntryStatsSnapshot":
+        return cls(entry.status, entry.rating, entry.end_date)
+
+    @property
+    def completed_month(self) -> Optional[date]:
+        if self.status != ReadingStatus.COMPLETED or not self.end_date:
+            return None
+        return date(self.end_date.year, self.end_date.month, 1)
+
+
+class ReadingStatsService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def apply_change(
+        self,
+        user_id: UUID,
+        before: Optional[EntryStatsSnapshot],
+        after: Optional[EntryStatsSnapshot],
+    ) -> None:
+        """Fold one entry transition into the aggregates.
+
+        Runs inside the caller's transaction and does not commit, so the
+        aggregates and the entry change land atomically.
+        """
+        if before == after:
+            return
+
+        deltas: Counter[str] = Counter()
+        months: Counter[date] = Counter()
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if snapshot is None:
+                continue
+            deltas[STATUS_COLUMNS[snapshot.status]] += sign
+            if snapshot.rating is not None:
+                deltas["rating_count"] += sign
+                deltas["rating_sum"] += sign * snapshot.rating
+            if snapshot.completed_month:
+                months[snapshot.completed_month] += sign
+
+        deltas = Counter({k: v for k, v in deltas.items() if v})
+        if deltas:
+            await self._upsert_totals(user_id, deltas)
+        for month, delta in months.items():
+            if delta:
+                await self._upsert_month(user_id, month, delta)
+
+    async def get_user_stats(
+        self, user_id: UUID, months: int = 12
+    ) -> UserReadingStatsPublic:
+        stats = await self.session.get(UserReadingStats, user_id)
+        if stats is None:
+            # No row until the first reading entry; tell that from a bad id
+            user_exists = await self.session.scalar(
+                select(User.id).where(User.id == user_id)
+            )
+            if user_exists is None:
+                raise NotFoundError("User", str(user_id))
+            stats = UserReadingStats(user_id=user_id)
+
+        today = utcnow().date()
+        first_month = today.year * 12 + today.month - 1 - (months - 1)
+        since = date(first_month // 12, first_month % 12 + 1, 1)
+        result = await self.session.execute(
+            select(UserMonthlyCompletions)
+            .where(
+                UserMonthlyCompletions.user_id == user_id,
+                UserMonthlyCompletions.month >= since,
+                UserMonthlyCompletions.completed > 0,
+            )
+            .order_by(UserMonthlyCompletions.month.desc())
+        )
+
+        return UserReadingStatsPublic(
+            user_id=user_id,
+            total=stats.want_to_read
+            + stats.in_progress
+            + stats.completed
+            + stats.abandoned,
+            want_to_read=stats.want_to_read,
+            in_progress=stats.in_progress,
+            completed=stats.completed,
+            abandoned=stats.abandoned,
+            rating_count=stats.rating_count,
+            average_rating=(
+                round(stats.rating_sum / stats.rating_count, 2)
+                if stats.rating_count
+                else None
+            ),
+            completed_by_month=[
+                MonthlyCompletionsPublic(month=row.month, completed=row.completed)
+                for row in result.scalars()
+            ],
+        )
+
+    async def rebuild(self, user_id: Optional[UUID] = None) -> None:
+        """Recompute the aggregates from reading entries and commit"""
+        stats_delete = delete(UserReadingStats)
+        months_delete = delete(UserMonthlyCompletions)
+        entries = select(ReadingEntry.user_id)
+        if user_id:
+            stats_delete = stats_delete.where(UserReadingStats.user_id == user_id)
+            months_delete = months_delete.where(
+                UserMonthlyCompletions.user_id == user_id
+            )
+            entries = entries.where(ReadingEntry.user_id == user_id)
+
+        await self.session.execute(stats_delete)
+        await self.session.execute(months_delete)
+
+        def count_status(status: ReadingStatus):
+            return func.count().filter(ReadingEntry.status == status)
+
+        totals = entries.add_columns(
+            *(count_status(status) for status in STATUS_COLUMNS),
+            func.count(ReadingEntry.rating),
+            func.coalesce(func.sum(ReadingEntry.rating), 0),
+            func.timezone("utc", func.now()),
+        ).group_by(ReadingEntry.user_id)
+        await self.session.execute(
+            insert(UserReadingStats).from_select(
+                [
+                    "user_id",
+                    *STATUS_COLUMNS.values(),
+                    "rating_count",
+                    "rating_sum",
+                    "updated_at",
+                ],
+                totals,
+            )
+        )
+
+        month = cast(func.date_trunc("month", ReadingEntry.end_date), Date)
+        monthly = (
+            entries.add_columns(month, func.count())
+            .where(
+                ReadingEntry.status == ReadingStatus.COMPLETED,
+                ReadingEntry.end_date.is_not(None),
+            )
+            .group_by(ReadingEntry.user_id, month)
+        )
+        await self.session.execute(
+            insert(UserMonthlyCompletions).from_select(
+                ["user_id", "month", "completed"], monthly
+            )
+        )
+
+        await self.session.commit()
+        logger.info("Rebuilt reading stats for %s", user_id or "all users")
+
+    async def _upsert_totals(self, user_id: UUID, deltas: Counter[str]) -> None:
+        statement = insert(UserReadingStats).values(
+            user_id=user_id, updated_at=utcnow(), **deltas
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[UserReadingStats.user_id],
+            set_={
+                "updated_at": statement.excluded.updated_at,
+                **{
+                    column: getattr(UserReadingStats, column)
+                    + statement.excluded[column]
+                    for column in deltas
+                },
+            },
+        )
+        await self.session.execute(statement)
+
+    async def _upsert_month(self, user_id: UUID, month: date, delta: int) -> None:
+        statement = insert(UserMonthlyCompletions).values(
+            user_id=user_id, month=month, completed=delta
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[
+                UserMonthlyCompletions.user_id,
+                UserMonthlyCompletions.month,
+            ],
+            set_={
+                "completed": UserMonthlyCompletions.completed
+                + statement.excluded.completed
+            },
+        )
+        await self.session.execute(statement)
@@ -1,11 +1,13 @@
 import logging
-from typing import Sequence
+from typing import Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from app.core.cache import user_cache
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.pagination import PageResult, created_at_page, paginate_by_created_at
 from app.models.domain.user import User
 from app.models.requests.user_requests import UserUpdate
 
@@ -23,15 +25,16 @@ class UserService:
         return user
 
     async def get_all_users(
-        self, skip: int = 0, limit: int = 100, active_only: bool = True
-    ) -> Sequence[User]:
-        statement = select(User).offset(skip).limit(limit)
+        self, cursor: Optional[str] = None, limit: int = 100, active_only: bool = True
+    ) -> PageResult[User]:
+        statement = select(User)
 
         if active_only:
             statement = statement.where(User.is_active)
 
+        statement = paginate_by_created_at(statement, User, cursor, limit)
         result = await self.session.execute(statement)
-        return result.scalars().all()
+        return created_at_page(result.scalars().all(), limit)
 
     async def update_user(self, user_id: UUID, user_update: UserUpdate) -> User:
         user = await self.session.get(User, user_id)
@@ -49,6 +52,22 @@ class UserService:
         self.session.add(user)
         await self.session.commit()
         await self.session.refresh(user)
-        
-        logger.info(f"Updated user {user_id}")
+        user_cache.invalidate(user_id)
+
+        logger.info("Updated user %s", user_id)
+        return user
+
+    async def set_active(self, user_id: UUID, is_active: bool) -> User:
+        user = await self.session.get(User, user_id)
+        if not user:
+            raise NotFoundError("User", str(user_id))
+
+        user.is_active = is_active
+
+        self.session.add(user)
+        await self.session.commit()
+        await self.session.refresh(user)
+        user_cache.invalidate(user_id)
+
+        logger.info("Set user %s active=%s", user_id, is_active)
         return user
@@ -0,0 +1,5 @@
+"""Load-test harness: seed a scale dataset, then drive every API route.
+
+    python -m benchmarks.loadtest.seed --help
+    python -m benchmarks.loadtest.run --help
+"""
@@ -0,0 +1,225 @@
+"""Drive the API at fixed concurrency and report latency per operation_id.
+
+Samples users, books and reading entries from a database seeded with
+benchmarks.loadtest.seed, mints API JWTs for them with
+AuthService.create_api_jwt and runs --concurrency virtual users against a
+running server for --duration seconds, each drawing scenarios from --mix.
+Start the server against the same database with RATE_LIMIT_ENABLED=false (and
+the worker count you want to measure).
+
+Results can be saved as JSON and compared with an earlier run; operations
+whose p95 grew, or whose throughput fell, by more than --tolerance percent are
+reported as regressions and make the command exit with status 1.
+
+    python -m benchmarks.loadtest.run --concurrency 64 --duration 60 \\
+        --save baseline.json
+    python -m benchmarks.loadtest.run --concurrency 64 --duration 60 \\
+        --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.database import engine, session_scope
+from app.models.domain.book import Book
+from app.models.domain.reading_entry import ReadingEntry
+from app.models.domain.user import User
+from app.services.auth_service import AuthService
+from benchmarks.loadtest.scenarios import MIXES, Dataset, Recorder, VirtualUser
+from benchmarks.loadtest.seed import ADMIN_EMAIL, EMAIL_DOMAIN
+
+SAMPLE_BOOKS = 10_000
+SPARE_USERS = 20
+
+
+async def load_dataset(users: int) -> Dataset:
+    async with session_scope() as session:
+        result = await session.execute(
+            select(User.id)
+            .where(User.email.like(f"load%@{EMAIL_DOMAIN}"))
+            .order_by(func.random())
+            .limit(users + SPARE_USERS)
+        )
+        user_ids = list(result.scalars())
+        if len(user_ids) <= SPARE_USERS:
+            sys.exit("No load test users found; run benchmarks.loadtest.seed first")
+        spare_user_ids, user_ids = user_ids[:SPARE_USERS], user_ids[SPARE_USERS:]
+
+        admin_id = await session.scalar(
+            select(User.id).where(User.email == ADMIN_EMAIL)
+        )
+        result = await session.execute(
+            select(Book.id).order_by(func.random()).limit(SAMPLE_BOOKS)
+        )
+        book_ids = list(result.scalars())
+
+        result = await session.execute(
+            select(ReadingEntry.user_id, ReadingEntry.id).where(
+                ReadingEntry.user_id.in_(user_ids)
+            )
+        )
+        entry_ids: dict = {}
+        for user_id, entry_id in result:
+            entry_ids.setdefault(user_id, []).append(entry_id)
+
+        auth = AuthService(session)
+        tokens = {user_id: auth.create_api_jwt(user_id)[0] for user_id in user_ids}
+        admin_token = auth.create_api_jwt(admin_id)[0]
+
+    return Dataset(
+        book_ids=book_ids,
+        user_ids=user_ids,
+        spare_user_ids=spare_user_ids,
+        tokens=tokens,
+        entry_ids=entry_ids,
+        admin_token=admin_token,
+    )
+
+
+async def virtual_user(
+    http: httpx.AsyncClient,
+    dataset: Dataset,
+    recorder: Recorder,
+    mix: str,
+    deadline: float,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    scenarios = list(MIXES[mix])
+    weights = list(MIXES[mix].values())
+    user = VirtualUser(http, dataset, recorder, rng.choice(dataset.user_ids), rng)
+    while time.perf_counter() < deadline:
+        scenario = rng.choices(scenarios, weights)[0]
+        await scenario(user)
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[max(0, int(len(ordered) * fraction) - 1)]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict[str, dict[str, Any]]:
+    summary = {}
+    for operation, latencies in sorted(recorder.latencies.items()):
+        latencies.sort()
+        summary[operation] = {
+            "requests": len(latencies),
+            "errors": recorder.errors.get(operation, 0),
+            "rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+        }
+    return summary
+
+
+def print_summary(summary: dict[str, dict[str, Any]]) -> None:
+    print(
+        f"{'operation':<24} {'requests':>9} {'errors':>7} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for operation, row in summary.items():
+        print(
+            f"{operation:<24} {row['requests']:>9} {row['errors']:>7} "
+            f"{row['rps']:>8.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+            f"{row['p99_ms']:>8.1f}"
+        )
+
+
+def compare(
+    summary: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    tolerance: float,
+) -> list[str]:
+    """Describe every operation that is slower than the baseline allows"""
+    regressions = []
+    limit = 1 + tolerance / 100
+    for operation, row in summary.items():
+        before = baseline.get(operation)
+        if before is None:
+            continue
+        if row["p95_ms"] > before["p95_ms"] * limit:
+            regressions.append(
+                f"{operation}: p95 {before['p95_ms']:.1f}ms -> {row['p95_ms']:.1f}ms"
+            )
+        if row["rps"] * limit < before["rps"]:
+            regressions.append(
+                f"{operation}: {before['rps']:.1f} -> {row['rps']:.1f} req/s"
+            )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict[str, Any]]:
+    dataset = await load_dataset(args.users)
+    await engine.dispose()
+    print(
+        f"{len(dataset.user_ids)} users, {len(dataset.book_ids)} sampled books, "
+        f"mix {args.mix}, concurrency {args.concurrency}, {args.duration}s"
+    )
+
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30.0
+    ) as http:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                virtual_user(http, dataset, recorder, args.mix, deadline, seed)
+                for seed in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    return summarize(recorder, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--base-url", default=f"http://localhost:{settings.SERVER_PORT}"
+    )
+    parser.add_argument("--mix", choices=sorted(MIXES), default="read-heavy")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--users", type=int, default=1000, help="users to sample")
+    parser.add_argument("--save", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with saved results")
+    parser.add_argument(
+        "--tolerance", type=float, default=10.0, help="allowed regression, percent"
+    )
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args))
+    print_summary(summary)
+
+    if args.save:
+        args.save.write_text(json.dumps(summary, indent=2))
+        print(f"saved results to {args.save}")
+
+    if args.baseline:
+        regressions = compare(
+            summary, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        if regressions:
+            print(f"regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"no regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
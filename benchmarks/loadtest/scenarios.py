@@ -0,0 +1,320 @@
+"""User journeys for the load test and the mixes they are drawn from.
+
+A scenario is one step of a virtual user: it sends one or more requests and
+each is recorded under the operation_id of the route it hits. Together the
+scenarios cover every route in app/api/v1/controllers except login, which
+needs a Supabase token.
+"""
+
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+import httpx
+
+from app.core.api import APIRoutePrefix
+from app.core.config import settings
+from benchmarks.search_books import WORDS
+
+API = settings.API_V1_STR
+BOOKS = f"{API}{APIRoutePrefix.BOOKS}"
+ENTRIES = f"{API}{APIRoutePrefix.READING_ENTRIES}"
+USERS = f"{API}{APIRoutePrefix.USERS}"
+AUTH = f"{API}{APIRoutePrefix.AUTH}"
+SYSTEM = f"{API}{APIRoutePrefix.SYSTEM}"
+
+# Re-imported on every run; after the first import they are all duplicates,
+# so the catalog does not grow with the length of the test
+IMPORT_ROWS = "\n".join(
+    json.dumps(
+        {
+            "title": f"Load test import {i}",
+            "author": "Load Tester",
+            "isbn": f"{9799000000000 + i}",
+        }
+    )
+    for i in range(100)
+)
+
+
+@dataclass
+class Dataset:
+    """Ids sampled from the seeded database, shared by all virtual users"""
+
+    book_ids: list[UUID]
+    user_ids: list[UUID]
+    # Users that only admin scenarios deactivate and reactivate
+    spare_user_ids: list[UUID]
+    tokens: dict[UUID, str]
+    entry_ids: dict[UUID, list[UUID]]
+    admin_token: str
+
+
+@dataclass
+class Recorder:
+    """Latencies in milliseconds and failures, per operation_id"""
+
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+
+class VirtualUser:
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        dataset: Dataset,
+        recorder: Recorder,
+        user_id: UUID,
+        rng: random.Random,
+    ):
+        self.http = http
+        self.dataset = dataset
+        self.recorder = recorder
+        self.user_id = user_id
+        self.rng = rng
+
+    async def call(
+        self,
+        operation: str,
+        method: str,
+        url: str,
+        admin: bool = False,
+        **kwargs,
+    ) -> Optional[httpx.Response]:
+        token = self.dataset.admin_token if admin else self.dataset.tokens[self.user_id]
+        started = time.perf_counter()
+        try:
+            response = await self.http.request(
+                method, url, cookies={settings.API_JWT_COOKIE_NAME: token}, **kwargs
+            )
+        except httpx.HTTPError:
+            response = None
+        elapsed = (time.perf_counter() - started) * 1000
+
+        self.recorder.latencies.setdefault(operation, []).append(elapsed)
+        if response is None or response.status_code >= 400:
+            self.recorder.errors[operation] = self.recorder.errors.get(operation, 0) + 1
+            return None
+        return response
+
+    def book_id(self) -> str:
+        return str(self.rng.choice(self.dataset.book_ids))
+
+    def entry_id(self) -> Optional[str]:
+        entries = self.dataset.entry_ids.get(self.user_id)
+        return str(self.rng.choice(entries)) if entries else None
+
+
+Scenario = Callable[[VirtualUser], Awaitable[None]]
+
+
+async def browse_books(user: VirtualUser) -> None:
+    response = await user.call("getBooks", "GET", f"{BOOKS}/", params={"limit": 50})
+    cursor = response.json()["next_cursor"] if response is not None else None
+    if cursor:
+        await user.call(
+            "getBooks", "GET", f"{BOOKS}/", params={"limit": 50, "cursor": cursor}
+        )
+
+
+async def search_books(user: VirtualUser) -> None:
+    words = " ".join(user.rng.sample(WORDS, 2))
+    await user.call("getBooks", "GET", f"{BOOKS}/", params={"search": words})
+
+
+async def view_book(user: VirtualUser) -> None:
+    await user.call("getBook", "GET", f"{BOOKS}/{user.book_id()}")
+
+
+async def batch_get_books(user: VirtualUser) -> None:
+    ids = [user.book_id() for _ in range(50)]
+    await user.call("batchGetBooks", "POST", f"{BOOKS}/batch-get", json={"ids": ids})
+
+
+async def suggest_books(user: VirtualUser) -> None:
+    prefix = user.rng.choice(WORDS)[: user.rng.randint(2, 5)]
+    await user.call(
+        "suggestBooks", "GET", f"{BOOKS}/suggest", params={"prefix": prefix}
+    )
+
+
+async def view_library(user: VirtualUser) -> None:
+    params = {"user_id": str(user.user_id), "limit": 50}
+    if user.rng.random() < 0.5:
+        params["include"] = "book"
+    await user.call("getReadingEntries", "GET", f"{ENTRIES}/", params=params)
+
+
+async def view_entry(user: VirtualUser) -> None:
+    entry_id = user.entry_id()
+    if entry_id:
+        await user.call(
+            "getReadingEntry",
+            "GET",
+            f"{ENTRIES}/{entry_id}",
+            params={"include": "book"},
+        )
+
+
+async def export_library(user: VirtualUser) -> None:
+    await user.call(
+        "exportReadingEntries",
+        "GET",
+        f"{ENTRIES}/export",
+        params={"format": user.rng.choice(["ndjson", "csv"])},
+    )
+
+
+async def view_profile(user: VirtualUser) -> None:
+    other = user.rng.choice(user.dataset.user_ids)
+    await user.call("getUser", "GET", f"{USERS}/{other}")
+    await user.call("getUserReadingStats", "GET", f"{USERS}/{other}/stats")
+
+
+async def view_self(user: VirtualUser) -> None:
+    await user.call("getCurrentUser", "GET", f"{AUTH}/me")
+
+
+async def read_book(user: VirtualUser) -> None:
+    """Add a book and take it through to a review, then remove it again"""
+    response = await user.call(
+        "addBookToLibrary",
+        "POST",
+        f"{ENTRIES}/",
+        json={"user_id": str(user.user_id), "book_id": user.book_id()},
+    )
+    if response is None:
+        return
+    entry = f"{ENTRIES}/{response.json()['id']}"
+    await user.call("startReading", "PATCH", f"{entry}/start-reading")
+    await user.call(
+        "updateProgress", "PATCH", f"{entry}/progress", json={"progress": 40}
+    )
+    await user.call("completeReading", "PATCH", f"{entry}/complete")
+    await user.call(
+        "updateReview",
+        "PATCH",
+        f"{entry}/review",
+        json={"rating": user.rng.randint(1, 5), "review": "Load test review"},
+    )
+    await user.call("deleteReadingEntry", "DELETE", entry)
+
+
+async def abandon_book(user: VirtualUser) -> None:
+    response = await user.call(
+        "addBookToLibrary",
+        "POST",
+        f"{ENTRIES}/",
+        json={"user_id": str(user.user_id), "book_id": user.book_id()},
+    )
+    if response is None:
+        return
+    entry = f"{ENTRIES}/{response.json()['id']}"
+    await user.call("abandonReading", "PATCH", f"{entry}/abandon")
+    await user.call("deleteReadingEntry", "DELETE", entry)
+
+
+async def edit_profile(user: VirtualUser) -> None:
+    await user.call(
+        "updateOwnProfile",
+        "PUT",
+        f"{USERS}/me",
+        json={"display_name": f"Load Tester {user.rng.randint(1, 10**6)}"},
+    )
+
+
+async def renew_session(user: VirtualUser) -> None:
+    # Response cookies are discarded, so the user keeps its minted token
+    await user.call("refreshToken", "POST", f"{AUTH}/refresh")
+    await user.call("logout", "DELETE", f"{AUTH}/logout")
+
+
+async def manage_books(user: VirtualUser) -> None:
+    response = await user.call(
+        "createBook",
+        "POST",
+        f"{BOOKS}/",
+        admin=True,
+        json={"title": "Load test book", "author": "Load Tester"},
+    )
+    if response is None:
+        return
+    book = f"{BOOKS}/{response.json()['id']}"
+    await user.call(
+        "updateBook", "PUT", book, admin=True, json={"title": "Load test book v2"}
+    )
+    await user.call("deleteBook", "DELETE", book, admin=True)
+
+
+async def import_books(user: VirtualUser) -> None:
+    await user.call(
+        "importBooks",
+        "POST",
+        f"{BOOKS}/bulk",
+        admin=True,
+        content=IMPORT_ROWS,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+
+async def manage_users(user: VirtualUser) -> None:
+    await user.call("getUsers", "GET", f"{USERS}/", admin=True, params={"limit": 50})
+    target = f"{USERS}/{user.rng.choice(user.dataset.spare_user_ids)}"
+    await user.call("deactivateUser", "PATCH", f"{target}/deactivate", admin=True)
+    await user.call("activateUser", "PATCH", f"{target}/activate", admin=True)
+
+
+async def inspect_pool(user: VirtualUser) -> None:
+    await user.call("getPoolStats", "GET", f"{SYSTEM}/pool", admin=True)
+
+
+READ_SCENARIOS: dict[Scenario, int] = {
+    browse_books: 15,
+    search_books: 10,
+    view_book: 20,
+    batch_get_books: 5,
+    suggest_books: 10,
+    view_library: 20,
+    view_entry: 10,
+    export_library: 1,
+    view_profile: 5,
+    view_self: 4,
+}
+WRITE_SCENARIOS: dict[Scenario, int] = {
+    read_book: 5,
+    abandon_book: 2,
+    edit_profile: 2,
+    renew_session: 1,
+}
+ADMIN_SCENARIOS: dict[Scenario, int] = {
+    manage_books: 2,
+    import_books: 1,
+    manage_users: 1,
+    inspect_pool: 1,
+}
+
+
+def _scaled(scenarios: dict[Scenario, int], factor: float) -> dict[Scenario, float]:
+    return {scenario: weight * factor for scenario, weight in scenarios.items()}
+
+
+MIXES: dict[str, dict[Scenario, float]] = {
+    "read-heavy": {
+        **_scaled(READ_SCENARIOS, 0.90 / sum(READ_SCENARIOS.values())),
+        **_scaled(WRITE_SCENARIOS, 0.09 / sum(WRITE_SCENARIOS.values())),
+        **_scaled(ADMIN_SCENARIOS, 0.01 / sum(ADMIN_SCENARIOS.values())),
+    },
+    "write-heavy": {
+        **_scaled(READ_SCENARIOS, 0.50 / sum(READ_SCENARIOS.values())),
+        **_scaled(WRITE_SCENARIOS, 0.45 / sum(WRITE_SCENARIOS.values())),
+        **_scaled(ADMIN_SCENARIOS, 0.05 / sum(ADMIN_SCENARIOS.values())),
+    },
+    # Every scenario equally often, to exercise each route
+    "uniform": {
+        scenario: 1.0
+        for scenario in (*READ_SCENARIOS, *WRITE_SCENARIOS, *ADMIN_SCENARIOS)
+    },
+}
@@ -0,0 +1,204 @@
+"""Seed a scratch database with a scale dataset for the load test.
+
+Users, books and reading entries are generated deterministically from --seed
+and written with COPY, then reading stats are rebuilt from the entries. Load
+test users get @loadtest.example.com addresses, plus one admin. Point the
+POSTGRES_* settings at a migrated scratch database; --truncate empties the
+user, book and reading entry tables first.
+
+    python -m benchmarks.loadtest.seed --users 100000 --books 1000000 \\
+        --entries 10000000 --truncate
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.database import engine, session_scope
+from app.services.reading_stats_service import ReadingStatsService
+from benchmarks.search_books import FIRST_NAMES, LAST_NAMES, WORDS
+
+EMAIL_DOMAIN = "loadtest.example.com"
+ADMIN_EMAIL = f"admin@{EMAIL_DOMAIN}"
+COPY_BATCH_SIZE = 50_000
+EPOCH = datetime(2022, 1, 1)
+DATASET_DAYS = 3 * 365
+
+USER_COLUMNS = [
+    "id", "created_at", "updated_at", "username", "email",
+    "avatar_url", "display_name", "is_active", "role",
+]
+BOOK_COLUMNS = [
+    "id", "created_at", "updated_at", "title", "author",
+    "isbn", "olid", "cover_url", "openlibrary_url",
+]
+ENTRY_COLUMNS = [
+    "id", "created_at", "updated_at", "user_id", "book_id", "start_date",
+    "end_date", "progress", "rating", "review", "status",
+]
+# Share of a library in each status; enums are stored by name
+STATUS_WEIGHTS = {
+    "WANT_TO_READ": 40,
+    "IN_PROGRESS": 20,
+    "COMPLETED": 35,
+    "ABANDONED": 5,
+}
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _timestamp(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(seconds=rng.randrange(DATASET_DAYS * 86_400))
+
+
+def _user(rng: random.Random, index: int) -> tuple:
+    created = _timestamp(rng)
+    return (
+        _uuid(rng), created, created, f"load{index}", f"load{index}@{EMAIL_DOMAIN}",
+        None, f"Load Tester {index}", True, "STANDARD_USER",
+    )
+
+
+def _book(rng: random.Random, index: int) -> tuple:
+    created = _timestamp(rng)
+    title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).title()
+    author = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return (
+        _uuid(rng), created, created, title, author,
+        f"{9780000000000 + index}", f"OL{index}M", None,
+        f"https://openlibrary.org/books/OL{index}M",
+    )
+
+
+def _entry(rng: random.Random, user_id: UUID, book_id: UUID, status: str) -> tuple:
+    created = _timestamp(rng)
+    start = end = rating = review = None
+    progress = 0
+    if status != "WANT_TO_READ":
+        start = created + timedelta(days=rng.randint(0, 60))
+        progress = rng.randint(1, 99)
+    if status == "COMPLETED":
+        end = start + timedelta(days=rng.randint(1, 90))
+        progress = 100
+        if rng.random() < 0.6:
+            rating = rng.randint(1, 5)
+            review = "Seeded review" if rng.random() < 0.3 else None
+    updated = end or start or created
+    return (
+        _uuid(rng), created, updated, user_id, book_id, start,
+        end, Decimal(progress), rating, review, status,
+    )
+
+
+async def _copy(conn: asyncpg.Connection, table: str, columns, rows) -> int:
+    """COPY rows from an iterator in batches; returns the number written"""
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == COPY_BATCH_SIZE:
+            await conn.copy_records_to_table(table, records=batch, columns=columns)
+            written += len(batch)
+            batch = []
+            if written % (COPY_BATCH_SIZE * 20) == 0:
+                print(f"  {table}: {written:,}")
+    if batch:
+        await conn.copy_records_to_table(table, records=batch, columns=columns)
+        written += len(batch)
+    return written
+
+
+async def seed(users: int, books: int, entries: int, seed: int, truncate: bool):
+    rng = random.Random(seed)
+    conn = await asyncpg.connect(
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+        database=settings.POSTGRES_DB,
+    )
+    started = time.perf_counter()
+    try:
+        if truncate:
+            await conn.execute(
+                'TRUNCATE "user", book, readingentry, userreadingstats, '
+                "usermonthlycompletions"
+            )
+
+        user_rows = [_user(rng, i) for i in range(users)]
+        admin_created = _timestamp(rng)
+        user_rows.append(
+            (
+                _uuid(rng), admin_created, admin_created, "loadadmin", ADMIN_EMAIL,
+                None, "Load Test Admin", True, "ADMIN",
+            )
+        )
+        await _copy(conn, "user", USER_COLUMNS, user_rows)
+        user_ids = [row[0] for row in user_rows[:users]]
+        print(f"seeded {len(user_rows):,} users")
+
+        book_ids: list[UUID] = []
+
+        def book_rows():
+            for i in range(books):
+                row = _book(rng, i)
+                book_ids.append(row[0])
+                yield row
+
+        await _copy(conn, "book", BOOK_COLUMNS, book_rows())
+        print(f"seeded {books:,} books")
+
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        per_user, remainder = divmod(min(entries, users * books), users)
+
+        def entry_rows():
+            for index, user_id in enumerate(user_ids):
+                # Consecutive books from a random start are distinct per user
+                first = rng.randrange(books)
+                count = per_user + (index < remainder)
+                for status, offset in zip(
+                    rng.choices(statuses, weights, k=count), range(count)
+                ):
+                    book_id = book_ids[(first + offset) % books]
+                    yield _entry(rng, user_id, book_id, status)
+
+        written = await _copy(conn, "readingentry", ENTRY_COLUMNS, entry_rows())
+        print(f"seeded {written:,} reading entries")
+
+        await conn.execute('ANALYZE "user", book, readingentry')
+    finally:
+        await conn.close()
+
+    async with session_scope() as session:
+        await ReadingStatsService(session).rebuild()
+    await engine.dispose()
+    print(f"seeding took {time.perf_counter() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--truncate", action="store_true", help="empty the tables before seeding"
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        seed(args.users, args.books, args.entries, args.seed, args.truncate)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Microbenchmarks for CPU hot spots in the auth and serialization paths.
+
+Each case is timed with timeit: the loop count is picked so one repeat takes
+about 0.2s, and the median of --repeat repeats is reported per call. No
+database needed; the whole suite runs in a few seconds. Results can be saved
+as JSON and compared with an earlier run; cases more than --tolerance percent
+slower are reported and make the command exit with status 1.
+
+    python -m benchmarks.microbench --save micro.json
+    python -m benchmarks.microbench --baseline micro.json
+    python -m benchmarks.microbench --filter jwt
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Coroutine
+from uuid import uuid4
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+from starlette.requests import Request
+
+from app.core.exception_handlers import (
+    generic_exception_handler,
+    integrity_error_handler,
+    operational_error_handler,
+)
+from app.core.permissions import Permission, user_has_permission
+from app.models.domain.reading_entry import (
+    ReadingEntry,
+    ReadingEntryBase,
+    ReadingStatus,
+)
+from app.models.domain.user import RoleType
+from app.models.responses.book_responses import BookPublic
+from app.models.responses.reading_entry_responses import ReadingEntryPublic
+from app.services.auth_service import AuthService
+from benchmarks.serialization import make_books
+
+LIST_SIZE = 100
+
+
+def make_entries(count: int) -> list[ReadingEntry]:
+    started = datetime(2024, 1, 1)
+    user_id = uuid4()
+    return [
+        ReadingEntry(
+            id=uuid4(),
+            user_id=user_id,
+            book_id=uuid4(),
+            start_date=started,
+            end_date=started + timedelta(days=i % 30 + 1),
+            progress=Decimal("100"),
+            rating=i % 5 + 1,
+            review="A benchmark review" if i % 3 else None,
+            status=ReadingStatus.COMPLETED,
+            created_at=started,
+            updated_at=started,
+        )
+        for i in range(count)
+    ]
+
+
+def run_handler(coroutine: Coroutine) -> Any:
+    """Drive a handler that never suspends without an event loop"""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("Exception handler awaited something")
+
+
+def build_cases() -> dict[str, Callable[[], Any]]:
+    auth = AuthService(session=None)  # type: ignore[arg-type]
+    user_id = uuid4()
+    token, _ = auth.create_api_jwt(user_id)
+
+    books = make_books(LIST_SIZE)
+    entries = make_entries(LIST_SIZE)
+    entry_data = {
+        "user_id": uuid4(),
+        "book_id": uuid4(),
+        "start_date": datetime(2024, 1, 1),
+        "end_date": datetime(2024, 2, 1),
+        "progress": Decimal("100"),
+        "rating": 4,
+        "status": ReadingStatus.COMPLETED,
+    }
+    entry = ReadingEntryBase.model_validate(entry_data)
+
+    request = Request({"type": "http", "method": "POST", "path": "/", "headers": []})
+    integrity_error = IntegrityError(
+        "INSERT INTO readingentry ...",
+        {},
+        Exception(
+            'duplicate key value violates unique constraint '
+            '"uq_readingentry_user_id_book_id"'
+        ),
+    )
+    operational_error = OperationalError(
+        "SELECT 1", {}, Exception("connection to server was lost")
+    )
+    unexpected_error = ValueError("unexpected")
+
+    return {
+        "jwt.create": lambda: auth.create_api_jwt(user_id),
+        "jwt.verify": lambda: auth.verify_api_jwt(token),
+        "jwt.verify_invalid": lambda: auth.verify_api_jwt(token[:-4] + "AAAA"),
+        f"validate.book_public_x{LIST_SIZE}": lambda: [
+            BookPublic.model_validate(book) for book in books
+        ],
+        f"validate.reading_entry_public_x{LIST_SIZE}": lambda: [
+            ReadingEntryPublic.model_validate(item) for item in entries
+        ],
+        "validate.reading_entry_base": lambda: ReadingEntryBase.model_validate(
+            entry_data
+        ),
+        "validate.dates_and_status": entry.validate_dates_and_status,
+        "permissions.granted": lambda: user_has_permission(
+            RoleType.STANDARD_USER, Permission.VIEW_BOOK
+        ),
+        "permissions.denied": lambda: user_has_permission(
+            RoleType.STANDARD_USER, Permission.VIEW_SYSTEM_STATS
+        ),
+        "handlers.integrity_error": lambda: run_handler(
+            integrity_error_handler(request, integrity_error)
+        ),
+        "handlers.operational_error": lambda: run_handler(
+            operational_error_handler(request, operational_error)
+        ),
+        "handlers.generic_exception": lambda: run_handler(
+            generic_exception_handler(request, unexpected_error)
+        ),
+    }
+
+
+def measure(case: Callable[[], Any], repeat: int) -> dict[str, float]:
+    timer = timeit.Timer(case)
+    number, _ = timer.autorange()
+    # autorange picks the smallest loop count that takes at least 0.2s
+    per_call = [total / number * 1e9 for total in timer.repeat(repeat, number)]
+    return {
+        "median_ns": round(statistics.median(per_call), 1),
+        "best_ns": round(min(per_call), 1),
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    regressions = []
+    limit = 1 + tolerance / 100
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before and result["median_ns"] > before["median_ns"] * limit:
+            regressions.append(
+                f"{name}: {before['median_ns']:,.0f}ns -> {result['median_ns']:,.0f}ns"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only cases containing this")
+    parser.add_argument("--save", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with saved results")
+    parser.add_argument(
+        "--tolerance", type=float, default=10.0, help="allowed slowdown, percent"
+    )
+    args = parser.parse_args()
+
+    # Handlers log every error; measure their string work, not the log output
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    for name, case in build_cases().items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(case, args.repeat)
+        print(
+            f"{name:<40} {results[name]['median_ns']:>12,.0f} ns/call  "
+            f"(best {results[name]['best_ns']:,.0f})"
+        )
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+        print(f"saved results to {args.save}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"no regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Per-request overhead of the middleware stack: BaseHTTPMiddleware vs pure ASGI.
+
+Builds two apps with the same trivial endpoint and calls them directly through
+the ASGI interface, so only routing and middleware are measured. "legacy" is
+the previous stack (BaseHTTPMiddleware security headers, TrustedHost, GZip,
+CORS); "asgi" is SecurityMiddleware with GZip and CORS. No database needed.
+
+    python -m benchmarks.middleware_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.security_middleware import SecurityMiddleware
+
+HOSTS = ["localhost", "127.0.0.1"]
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        return response
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if legacy:
+        app.add_middleware(LegacySecurityHeadersMiddleware)
+        app.add_middleware(TrustedHostMiddleware, allowed_hosts=HOSTS)
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    app.add_middleware(CORSMiddleware, allow_origins=["http://localhost:5173"])
+    if not legacy:
+        app.add_middleware(SecurityMiddleware, allowed_hosts=HOSTS)
+    return app
+
+
+async def call(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost:8080"), (b"accept-encoding", b"gzip")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8080),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(name: str, app: FastAPI, requests: int) -> None:
+    for _ in range(200):
+        await call(app)
+
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await call(app)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+
+    timings.sort()
+    print(
+        f"{name:<7} mean {statistics.fmean(timings):7.1f}us  "
+        f"p50 {statistics.median(timings):7.1f}us  "
+        f"p99 {timings[int(len(timings) * 0.99) - 1]:7.1f}us"
+    )
+
+
+async def run(requests: int) -> None:
+    await measure("legacy", build_app(legacy=True), requests)
+    await measure("asgi", build_app(legacy=False), requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Per-request cost of the rate limiter.
+
+Calls the configured backend's take() for a spread of users, the way
+require_auth does, and reports the cost per hit. Use RATE_LIMIT_BACKEND=redis
+to measure the shared backend (needs a running Redis at RATE_LIMIT_REDIS_URL).
+
+    python -m benchmarks.rate_limit --hits 100000 --users 10000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.config import settings
+from app.core.rate_limit import BUDGETS, RateLimitClass, backend
+
+
+async def run(hits: int, users: int) -> None:
+    budget = BUDGETS[RateLimitClass.READ]
+    timings = []
+    limited = 0
+    for i in range(hits):
+        started = time.perf_counter()
+        retry_after = await backend.take(f"read:user:{i % users}", budget)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+        limited += retry_after > 0
+
+    timings.sort()
+    print(
+        f"{settings.RATE_LIMIT_BACKEND:<6} mean {statistics.fmean(timings):7.2f}us  "
+        f"p50 {statistics.median(timings):7.2f}us  "
+        f"p99 {timings[int(len(timings) * 0.99) - 1]:7.2f}us  "
+        f"limited {limited}/{hits}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hits", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.hits, args.users))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compare reading-entry progress updates: ORM round trips vs UPDATE ... RETURNING.
+
+The legacy path is the previous service implementation (session.get, mutate
+through the domain method, commit, refresh). Runs against the configured
+database and removes the rows it creates.
+
+    python -m benchmarks.reading_entry_transitions --iterations 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import delete, event
+
+from app.core.database import engine, session_scope
+from app.models.domain.book import Book
+from app.models.domain.reading_entry import ReadingEntry
+from app.models.domain.reading_stats import UserReadingStats
+from app.models.domain.user import User
+from app.services.reading_entry_service import ReadingEntryService
+
+statement_count = 0
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statements(conn, cursor, statement, parameters, context, executemany):
+    global statement_count
+    statement_count += 1
+
+
+async def legacy_update_progress(session, entry_id, progress: Decimal) -> None:
+    entry = await session.get(ReadingEntry, entry_id)
+    entry.update_progress(progress)
+    session.add(entry)
+    await session.commit()
+    await session.refresh(entry)
+
+
+async def single_statement_update_progress(session, entry_id, progress) -> None:
+    await ReadingEntryService(session).update_reading_progress(entry_id, progress)
+
+
+async def measure(name: str, update, entry_id, iterations: int) -> None:
+    global statement_count
+    timings = []
+    statements_before = statement_count
+
+    for i in range(iterations):
+        progress = Decimal(1 + i % 98)
+        async with session_scope() as session:
+            started = time.perf_counter()
+            await update(session, entry_id, progress)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    statements = (statement_count - statements_before) / iterations
+    timings.sort()
+    print(
+        f"{name:<18} p50 {statistics.median(timings):6.2f}ms  "
+        f"p95 {timings[int(len(timings) * 0.95) - 1]:6.2f}ms  "
+        f"{statements:.1f} statements/update"
+    )
+
+
+async def run(iterations: int) -> None:
+    suffix = uuid4().hex[:8]
+    user = User(username=f"bench-{suffix}", email=f"bench-{suffix}@example.com")
+    book = Book(title=f"Benchmark {suffix}", author="Benchmark")
+    entry = ReadingEntry(user_id=user.id, book_id=book.id)
+
+    async with session_scope() as session:
+        session.add_all([user, book])
+        await session.flush()
+        session.add(entry)
+        await session.commit()
+
+    try:
+        async with session_scope() as session:
+            await ReadingEntryService(session).start_reading(entry.id)
+
+        await measure("legacy ORM", legacy_update_progress, entry.id, iterations)
+        await measure(
+            "UPDATE RETURNING", single_statement_update_progress, entry.id, iterations
+        )
+    finally:
+        async with session_scope() as session:
+            await session.execute(
+                delete(UserReadingStats).where(UserReadingStats.user_id == user.id)
+            )
+            await session.execute(delete(ReadingEntry).where(ReadingEntry.id == entry.id))
+            await session.execute(delete(Book).where(Book.id == book.id))
+            await session.execute(delete(User).where(User.id == user.id))
+            await session.commit()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
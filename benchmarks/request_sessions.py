@@ -0,0 +1,121 @@
+"""Pool occupancy per request with and without early session release.
+
+Drives the app in-process (httpx ASGI transport) with concurrent clients that
+list books, plus a share of unauthenticated requests that end in a 401. Every
+connection checkout is timed from checkout to checkin; "held" disables the
+release that SessionReleasingRoute performs when the endpoint returns. Needs
+httpx and a migrated database with some books; creates and removes an admin
+user.
+
+    python -m benchmarks.request_sessions --clients 500 --requests 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import delete, event
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import engine, session_scope
+from app.main import app
+from app.models.domain.user import RoleType, User
+from app.services.auth_service import AuthService
+
+hold_times: list[float] = []
+checkouts_in_use = 0
+peak_in_use = 0
+
+
+@event.listens_for(engine.sync_engine.pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    global checkouts_in_use, peak_in_use
+    connection_record.info["checked_out_at"] = time.perf_counter()
+    checkouts_in_use += 1
+    peak_in_use = max(peak_in_use, checkouts_in_use)
+
+
+@event.listens_for(engine.sync_engine.pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    global checkouts_in_use
+    started = connection_record.info.pop("checked_out_at", None)
+    if started is not None:
+        checkouts_in_use -= 1
+        hold_times.append((time.perf_counter() - started) * 1000)
+
+
+async def client(http: httpx.AsyncClient, token: str, requests: int) -> None:
+    for i in range(requests):
+        cookies = {settings.API_JWT_COOKIE_NAME: token} if i % 5 else {}
+        await http.get(
+            f"{settings.API_V1_STR}/books/", params={"limit": 100}, cookies=cookies
+        )
+
+
+async def measure(name: str, token: str, clients: int, requests: int) -> None:
+    global peak_in_use
+    hold_times.clear()
+    peak_in_use = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://localhost"
+    ) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http, token, requests) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    total = clients * requests
+    hold_times.sort()
+    print(
+        f"{name:<9} {total / elapsed:7.0f} req/s  checkouts/request "
+        f"{len(hold_times) / total:.2f}  "
+        f"hold p50 {statistics.median(hold_times):6.2f}ms  "
+        f"p95 {hold_times[int(len(hold_times) * 0.95) - 1]:6.2f}ms  "
+        f"peak in use {peak_in_use}"
+    )
+
+
+async def run(clients: int, requests: int) -> None:
+    suffix = uuid4().hex[:8]
+    admin = User(
+        username=f"bench-{suffix}",
+        email=f"bench-{suffix}@example.com",
+        role=RoleType.ADMIN,
+    )
+    async with session_scope() as session:
+        session.add(admin)
+        await session.commit()
+        token, _ = AuthService(session).create_api_jwt(admin.id)
+
+    release = database.release_request_session
+
+    async def keep_session():
+        return None
+
+    try:
+        database.release_request_session = keep_session
+        await measure("held", token, clients, requests)
+        database.release_request_session = release
+        await measure("released", token, clients, requests)
+    finally:
+        database.release_request_session = release
+        async with session_scope() as session:
+            await session.execute(delete(User).where(User.id == admin.id))
+            await session.commit()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Latency benchmark for BookService.search_books.
+
+Seeds the configured database with synthetic books through COPY and times
+ranked searches (exact words, prefixes and typos) against it. Point the
+POSTGRES_* settings at a scratch database before seeding.
+
+    python -m benchmarks.search_books --seed 3000000
+    python -m benchmarks.search_books --queries 500
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime
+from uuid import uuid4
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import engine
+from app.services.book_service import BookService
+
+WORDS = [
+    "shadow", "river", "empire", "garden", "winter", "silent", "crown", "ocean",
+    "memory", "glass", "stone", "fire", "night", "city", "letters", "journey",
+    "kingdom", "forest", "secret", "mountain", "harbor", "storm", "library", "light",
+]
+FIRST_NAMES = ["Anna", "Jan", "Maria", "Piotr", "Olga", "Tomasz", "Ewa", "Adam"]
+LAST_NAMES = ["Kowalski", "Nowak", "Tolkien", "Lem", "Le Guin", "Pratchett", "Austen"]
+QUERIES = [
+    "shadow river", "silent empire", "kingdom of glass", "lem", "pratchett",
+    "mountan", "librray light", "wintr garden", "tolkein", "le guin storm",
+]
+COPY_BATCH_SIZE = 50_000
+
+
+def _random_book(rng: random.Random) -> tuple:
+    now = datetime.utcnow()
+    title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).title()
+    author = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return (uuid4(), now, now, title, author, None, None, None, None)
+
+
+async def seed(count: int) -> None:
+    conn = await asyncpg.connect(
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+        database=settings.POSTGRES_DB,
+    )
+    rng = random.Random(42)
+    columns = [
+        "id", "created_at", "updated_at", "title", "author",
+        "isbn", "olid", "cover_url", "openlibrary_url",
+    ]
+    try:
+        started = time.perf_counter()
+        for offset in range(0, count, COPY_BATCH_SIZE):
+            batch = [
+                _random_book(rng) for _ in range(min(COPY_BATCH_SIZE, count - offset))
+            ]
+            await conn.copy_records_to_table("book", records=batch, columns=columns)
+            print(f"seeded {offset + len(batch):,}/{count:,} books")
+        await conn.execute("ANALYZE book")
+        print(f"seeding took {time.perf_counter() - started:.1f}s")
+    finally:
+        await conn.close()
+
+
+async def run(query_count: int, limit: int) -> None:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        total = await session.scalar(text("SELECT count(*) FROM book"))
+        service = BookService(session)
+
+        # Warm the plan cache and shared buffers before measuring
+        for query in QUERIES:
+            await service.search_books(query, limit=limit)
+
+        timings = []
+        for i in range(query_count):
+            query = QUERIES[i % len(QUERIES)]
+            started = time.perf_counter()
+            await service.search_books(query, limit=limit)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    print(f"books: {total:,}  queries: {query_count}  limit: {limit}")
+    print(f"p50: {statistics.median(timings):.2f}ms")
+    print(f"p95: {timings[int(len(timings) * 0.95) - 1]:.2f}ms")
+    print(f"p99: {timings[int(len(timings) * 0.99) - 1]:.2f}ms")
+    print(f"max: {timings[-1]:.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="books to insert first")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    async def _main() -> None:
+        if args.seed:
+            await seed(args.seed)
+        await run(args.queries, args.limit)
+        await engine.dispose()
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Microbenchmark for list/detail response serialization.
+
+"legacy" is what the controllers used to do: model_validate each ORM object,
+build the Page and return it, so FastAPI validates it against response_model
+again and dumps it with the route's response field. "single-pass" is
+app.core.responses.model_response. No database needed; books are built in
+memory.
+
+    python -m benchmarks.serialization --rounds 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.routing import APIRoute, serialize_response
+
+from app.core.pagination import PageResult
+from app.core.responses import model_response
+from app.models.domain.book import Book
+from app.models.responses.book_responses import BookPublic
+from app.models.responses.page_responses import Page
+
+PAGE_SIZES = (1, 100, 1000)
+
+
+def make_books(count: int) -> list[Book]:
+    created = datetime(2024, 1, 1)
+    return [
+        Book(
+            id=uuid4(),
+            title=f"Benchmark book {i}",
+            author=f"Author {i % 50}",
+            isbn=f"{9780000000000 + i}",
+            olid=f"OL{i}M",
+            cover_url=f"https://covers.openlibrary.org/b/id/{i}-M.jpg",
+            openlibrary_url=f"https://openlibrary.org/books/OL{i}M",
+            created_at=created + timedelta(seconds=i),
+            updated_at=created + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+async def list_books() -> Page[BookPublic]: ...
+
+
+# The same response field FastAPI builds for GET /books
+response_field = APIRoute("/books", list_books).response_field
+
+
+async def legacy(page: PageResult) -> bytes:
+    response = Page(
+        items=[BookPublic.model_validate(book) for book in page.items],
+        next_cursor=page.next_cursor,
+    )
+    return await serialize_response(
+        field=response_field, response_content=response, dump_json=True
+    )
+
+
+async def single_pass(page: PageResult) -> bytes:
+    return (await model_response(Page[BookPublic], page)).body
+
+
+async def measure(name: str, serialize, page: PageResult, rounds: int) -> float:
+    await serialize(page)
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await serialize(page)
+        timings.append((time.perf_counter() - started) * 1000)
+    median = statistics.median(timings)
+    print(f"  {name:<12} p50 {median:8.3f}ms  min {min(timings):8.3f}ms")
+    return median
+
+
+async def run(rounds: int) -> None:
+    for size in PAGE_SIZES:
+        page = PageResult(make_books(size), "next-cursor")
+        print(f"{size} items")
+        before = await measure("legacy", legacy, page, rounds)
+        after = await measure("single-pass", single_pass, page, rounds)
+        print(f"  speedup      {before / after:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+from pathlib import Path
+
+import pytest
+
+# Settings are read when app.core.config is first imported, so placeholders
+# for the required values go into the environment before any test module
+# imports the app. Database tests run only when TEST_POSTGRES_DB names a
+# scratch database; it is migrated to head and its tables are emptied.
+TEST_DATABASE = os.environ.get("TEST_POSTGRES_DB")
+if TEST_DATABASE:
+    os.environ["POSTGRES_DB"] = TEST_DATABASE
+
+TEST_SETTINGS = {
+    "ENVIRONMENT": "test",
+    "POSTGRES_DB": "booktracker_test",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "SUPABASE_URL": "http://localhost:54321",
+    "SUPABASE_ANON_KEY": "test-anon-key",
+    "SUPABASE_JWT_SECRET": "test-supabase-secret",
+    "API_JWT_SECRET": "test-api-secret",
+    "API_JWT_ALGORITHM": "HS256",
+    "API_JWT_EXPIRE_HOURS": "1",
+    "API_JWT_ISSUER": "book-tracker-test",
+    "API_JWT_COOKIE_NAME": "access_token",
+    "CORS_ORIGINS": '["http://localhost"]',
+    "CORS_ALLOW_CREDENTIALS": "true",
+    "CORS_ALLOW_METHODS": '["GET"]',
+    "CORS_ALLOW_HEADERS": '["*"]',
+    "TRUSTED_HOSTS": '["testserver"]',
+    "DB_POOL_WARMUP": "false",
+    "RATE_LIMIT_ENABLED": "false",
+    "METRICS_ENABLED": "false",
+    "SLOW_QUERY_SECONDS": "0",
+}
+for name, value in TEST_SETTINGS.items():
+    os.environ.setdefault(name, value)
+
+ROOT = Path(__file__).resolve().parent.parent
+TABLES = (
+    "usermonthlycompletions",
+    "userreadingstats",
+    "readingentry",
+    "book",
+    '"user"',
+)
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE:
+        return
+    skip = pytest.mark.skip(reason="set TEST_POSTGRES_DB to run database tests")
+    for item in items:
+        if "database" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def migrated_database() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "app" / "migrations"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture
+async def session(migrated_database):
+    """Session on an emptied scratch database.
+
+    Every test runs in its own event loop, so the engine's pool is disposed
+    afterwards rather than reused across loops.
+    """
+    from sqlalchemy import text
+
+    from app.core.database import engine, session_scope
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {', '.join(TABLES)} CASCADE"))
+    async with session_scope() as test_session:
+        yield test_session
+    await engine.dispose()
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from fastapi import Request
+
+from app.core.config import settings
+from app.models.domain.book import Book
+from app.services import book_catalog as catalog_module
+from app.services.book_catalog import BookCatalog, BookChangeListener, CatalogBook
+from app.services.book_service import BookService
+from app.services.book_suggestions import BookSuggestionIndex
+from app.services.dependencies import get_book_service
+
+
+@pytest.fixture
+def catalog() -> BookCatalog:
+    book_catalog = BookCatalog(max_bytes=2**30)
+    book_catalog.enabled = True
+    return book_catalog
+
+
+def make_book(number: int, title: str = "Title") -> Book:
+    created = datetime(2024, 1, 1)
+    return Book(
+        id=UUID(int=number),
+        title=title,
+        author="Author",
+        isbn=f"{9780000000000 + number}",
+        created_at=created,
+        updated_at=created,
+    )
+
+
+def total_size(catalog: BookCatalog) -> int:
+    return sum(entry.size() for entry in catalog._books.values())
+
+
+def test_size_follows_upserts_and_removals(catalog):
+    catalog.upsert(make_book(1))
+    catalog.upsert(make_book(2))
+    catalog.upsert(make_book(1, title="A much longer title than before"))
+
+    assert len(catalog) == 2
+    assert catalog._bytes == total_size(catalog)
+
+    catalog.remove(UUID(int=1))
+    catalog.remove(UUID(int=3))
+
+    assert len(catalog) == 1
+    assert catalog._bytes == total_size(catalog)
+
+
+def test_catalog_switches_off_past_its_budget(catalog):
+    catalog.upsert(make_book(1))
+    catalog.max_bytes = catalog._bytes + CatalogBook(make_book(2)).size() - 1
+
+    catalog.upsert(make_book(2))
+
+    assert not catalog.enabled
+    assert len(catalog) == 0 and catalog._bytes == 0
+    assert catalog.get(UUID(int=1)) is None
+
+    catalog.upsert(make_book(3))
+
+    assert len(catalog) == 0
+
+
+def test_disabled_catalog_serves_nothing():
+    catalog = BookCatalog(max_bytes=2**30)
+    catalog.upsert(make_book(1))
+
+    assert catalog.get(UUID(int=1)) is None
+
+
+@pytest.mark.parametrize(
+    "cookie, use_catalog",
+    [
+        (None, True),
+        (str(int(time.time()) + 60), False),
+        (str(int(time.time()) - 1), True),
+    ],
+)
+def test_catalog_is_skipped_inside_the_primary_window(cookie, use_catalog):
+    headers = []
+    if cookie is not None:
+        headers.append(
+            (b"cookie", f"{settings.DB_PRIMARY_COOKIE_NAME}={cookie}".encode())
+        )
+    request = Request({"type": "http", "method": "GET", "headers": headers})
+
+    assert get_book_service(request, session=None).use_catalog == use_catalog
+
+
+async def test_reloads_once_subscribed_after_loading_without_listen(monkeypatch):
+    monkeypatch.setattr(catalog_module, "LISTENER_RETRY_SECONDS", 0.01)
+    connected = asyncio.Event()
+
+    class Connection:
+        def add_termination_listener(self, callback):
+            pass
+
+        async def add_listener(self, channel, callback):
+            pass
+
+        async def close(self):
+            pass
+
+    async def connect(dsn):
+        await connected.wait()
+        return Connection()
+
+    monkeypatch.setattr(catalog_module.asyncpg, "connect", connect)
+    listener = BookChangeListener()
+    reloads = []
+
+    async def reload():
+        reloads.append(connected.is_set())
+
+    monkeypatch.setattr(listener, "_reload", reload)
+
+    await listener.start()
+    assert reloads == [False]
+
+    connected.set()
+    for _ in range(100):
+        if len(reloads) == 2:
+            break
+        await asyncio.sleep(0.01)
+    await listener.stop()
+
+    assert reloads == [False, True]
+
+
+@pytest.mark.database
+async def test_refresh_upserts_changed_and_removes_deleted_books(
+    monkeypatch, session, catalog
+):
+    suggestions = BookSuggestionIndex(max_bytes=2**30)
+    suggestions.enabled = True
+    monkeypatch.setattr(catalog_module, "book_catalog", catalog)
+    monkeypatch.setattr(catalog_module, "book_suggestions", suggestions)
+
+    changed = make_book(1, title="Renamed")
+    session.add(changed)
+    await session.commit()
+    catalog.upsert(make_book(1, title="Original"))
+    catalog.upsert(make_book(2, title="Deleted"))
+    suggestions.upsert(UUID(int=2), "Deleted", "Author")
+
+    await BookChangeListener()._refresh([UUID(int=1), UUID(int=2)])
+
+    assert catalog.get(UUID(int=1)).title == "Renamed"
+    assert catalog.get(UUID(int=2)) is None
+    assert catalog._bytes == total_size(catalog)
+    assert [book.title for book in suggestions.suggest("ren")] == ["Renamed"]
+    assert suggestions.suggest("del") == []
+
+
+@pytest.mark.database
+async def test_service_reads_the_database_inside_the_primary_window(
+    monkeypatch, session, catalog
+):
+    monkeypatch.setattr("app.services.book_service.book_catalog", catalog)
+    session.add(make_book(1, title="Current"))
+    await session.commit()
+    catalog.upsert(make_book(1, title="Stale"))
+
+    cached = BookService(session)
+    primary = BookService(session, use_catalog=False)
+
+    assert (await cached.get_book_by_id(UUID(int=1))).title == "Stale"
+    assert (await primary.get_book_by_id(UUID(int=1))).title == "Current"
+    books, _ = await primary.get_books_by_ids([UUID(int=1)])
+    assert books[0].title == "Current"
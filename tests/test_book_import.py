@@ -0,0 +1,98 @@
+import json
+
+import pytest
+from sqlmodel import select
+
+from app.core.exceptions import ValidationError
+from app.models.domain.book import Book
+from app.services.book_import_service import (
+    MAX_LINE_BYTES,
+    BookImportService,
+    _iter_lines,
+)
+
+
+async def chunked(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def ndjson(*rows: dict) -> bytes:
+    return "\n".join(json.dumps(row) for row in rows).encode()
+
+
+async def test_lines_split_across_chunks():
+    lines = [line async for line in _iter_lines(chunked(b"a\r\nb", b"c\n", b"d"))]
+
+    assert lines == ["a", "bc", "d"]
+
+
+async def test_line_without_newline_is_capped():
+    chunks = chunked(*(b"x" * 4096 for _ in range(MAX_LINE_BYTES // 4096 + 1)))
+
+    with pytest.raises(ValidationError, match="Line 1 is longer"):
+        async for _ in _iter_lines(chunks):
+            pass
+
+
+async def test_overlong_complete_line_is_rejected():
+    body = b"ok\n" + b"x" * (MAX_LINE_BYTES + 1) + b"\nok\n"
+
+    with pytest.raises(ValidationError, match="Line 2 is longer"):
+        async for _ in _iter_lines(chunked(body)):
+            pass
+
+
+@pytest.mark.database
+async def test_import_dedupes_on_isbn_and_olid_separately(session):
+    session.add(Book(title="Existing", author="A", isbn="9780000000001"))
+    session.add(Book(title="Existing olid", author="A", olid="OL9M"))
+    await session.commit()
+
+    body = ndjson(
+        {"title": "Same isbn as existing", "author": "A", "isbn": "9780000000001"},
+        # Skipped for its OLID, so its ISBN is still free for the next row
+        {
+            "title": "Same olid as existing",
+            "author": "A",
+            "isbn": "9780000000004",
+            "olid": "OL9M",
+        },
+        {"title": "Free isbn", "author": "A", "isbn": "9780000000004"},
+        {"title": "First", "author": "A", "isbn": "9780000000002", "olid": "OL1M"},
+        # Shares only the OLID with the row above, ISBN differs
+        {"title": "Same olid", "author": "A", "isbn": "9780000000003", "olid": "OL1M"},
+        # Shares only the OLID, no ISBN
+        {"title": "Same olid, no isbn", "author": "A", "olid": "OL1M"},
+        {"title": "Same isbn as first", "author": "A", "isbn": "9780000000002"},
+        {"title": "Unrelated", "author": "A", "olid": "OL2M"},
+        {"title": "No identifiers", "author": "A"},
+        {"title": "No identifiers", "author": "A"},
+    )
+
+    result = await BookImportService(session).import_books(chunked(body), "ndjson")
+
+    titles = (await session.execute(select(Book.title))).scalars().all()
+    assert sorted(titles) == [
+        "Existing",
+        "Existing olid",
+        "First",
+        "Free isbn",
+        "No identifiers",
+        "No identifiers",
+        "Unrelated",
+    ]
+    assert (result.inserted, result.duplicates, result.failed) == (5, 5, 0)
+
+
+@pytest.mark.database
+async def test_import_is_rolled_back_when_a_line_is_too_long(session):
+    body = ndjson({"title": "Kept out", "author": "A"}) + b"\n" + b"x" * (
+        MAX_LINE_BYTES + 1
+    )
+
+    with pytest.raises(ValidationError):
+        await BookImportService(session).import_books(chunked(body), "ndjson")
+    await session.rollback()
+
+    assert (await session.execute(select(Book))).first() is None
@@ -0,0 +1,113 @@
+import random
+from functools import lru_cache
+from uuid import UUID
+
+import pytest
+
+from app.services import book_suggestions as suggestions_module
+from app.services.book_suggestions import BookSuggestionIndex, normalize
+
+WORDS = ["the", "then", "theory", "thermal", "a", "an", "anchor", "zebra", "zen"]
+
+
+@pytest.fixture
+def index() -> BookSuggestionIndex:
+    book_index = BookSuggestionIndex(max_bytes=2**30)
+    book_index.enabled = True
+    return book_index
+
+
+cached_normalize = lru_cache(maxsize=None)(normalize)
+
+
+def expected(books: dict, prefix: str, limit: int) -> list[UUID]:
+    """Brute-force ranking the index has to agree with"""
+    needle = cached_normalize(prefix)
+    matches = [
+        (-popularity, title, book_id)
+        for book_id, (title, author, popularity) in books.items()
+        if cached_normalize(title).startswith(needle)
+        or cached_normalize(author).startswith(needle)
+    ]
+    return [book_id for _, _, book_id in sorted(matches)[:limit]]
+
+
+def test_short_prefix_returns_nothing(index):
+    index.upsert(UUID(int=1), "A", "Ann Author")
+
+    assert index.suggest("a") == []
+    assert [book.title for book in index.suggest("an")] == ["A"]
+
+
+def test_matches_title_and_author_ignoring_case_and_accents(index):
+    index.upsert(UUID(int=1), "Łódź Stories", "Zoë Writer")
+    index.upsert(UUID(int=2), "Other", "Someone")
+
+    assert [book.id for book in index.suggest("LODZ")] == [UUID(int=1)]
+    assert [book.id for book in index.suggest("zoe w")] == [UUID(int=1)]
+
+
+def test_ranks_by_popularity_then_title(index):
+    index.upsert(UUID(int=1), "Theory B", "X")
+    index.upsert(UUID(int=2), "Theory A", "X")
+    index.upsert(UUID(int=3), "Theory C", "X")
+    index.adjust_popularity(UUID(int=3), 2)
+
+    assert [book.title for book in index.suggest("theo")] == [
+        "Theory C",
+        "Theory A",
+        "Theory B",
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ranked_lists_stay_exact_under_changes(monkeypatch, index, seed):
+    # Small limits so common prefixes go through the per-prefix ranked lists
+    monkeypatch.setattr(suggestions_module, "MAX_SCAN_KEYS", 20)
+    monkeypatch.setattr(suggestions_module, "TOP_SIZE", 8)
+    rng = random.Random(seed)
+    books: dict[UUID, tuple[str, str, int]] = {}
+
+    def random_title() -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+
+    for number in range(300):
+        title, author = random_title(), random_title()
+        books[UUID(int=number)] = (title, author, 0)
+        index.upsert(UUID(int=number), title, author)
+
+    prefixes = ["th", "the", "then", "an", "anc", "ze", "zebra t"]
+    for _ in range(2000):
+        book_id = rng.choice(list(books))
+        title, author, popularity = books[book_id]
+        action = rng.random()
+        if action < 0.4:
+            delta = rng.choice([-2, -1, 1, 1, 3])
+            books[book_id] = (title, author, max(0, popularity + delta))
+            index.adjust_popularity(book_id, delta)
+        elif action < 0.55:
+            title = random_title()
+            books[book_id] = (title, author, popularity)
+            index.upsert(book_id, title, author)
+        elif action < 0.65:
+            del books[book_id]
+            index.remove(book_id)
+        elif action < 0.75:
+            new_id = UUID(int=rng.getrandbits(128))
+            books[new_id] = (random_title(), random_title(), 0)
+            index.upsert(new_id, *books[new_id][:2])
+
+        prefix = rng.choice(prefixes)
+        limit = rng.randint(1, 6)
+        assert [book.id for book in index.suggest(prefix, limit)] == expected(
+            books, prefix, limit
+        )
+
+
+def test_switches_off_over_memory_budget(index):
+    index.max_bytes = 2_000
+    for number in range(100):
+        index.upsert(UUID(int=number), f"Title {number}", "Author")
+
+    assert not index.enabled
+    assert len(index) == 0
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache's monotonic clock with one the test advances"""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_returns_value_until_ttl_expires(clock):
+    ttl_cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=30)
+    ttl_cache.set("a", 1)
+
+    clock.value += 29.9
+    assert ttl_cache.get("a") == 1
+
+    clock.value += 0.1
+    assert ttl_cache.get("a") is None
+    assert len(ttl_cache) == 0
+
+
+def test_set_restarts_ttl(clock):
+    ttl_cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=30)
+    ttl_cache.set("a", 1)
+    clock.value += 20
+    ttl_cache.set("a", 2)
+    clock.value += 20
+
+    assert ttl_cache.get("a") == 2
+
+
+def test_evicts_least_recently_used(clock):
+    ttl_cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=30)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    # Reading "a" makes "b" the least recently used entry
+    assert ttl_cache.get("a") == 1
+    ttl_cache.set("c", 3)
+
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("c") == 3
+    assert len(ttl_cache) == 2
+
+
+def test_overwrite_does_not_evict(clock):
+    ttl_cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=30)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.set("a", 3)
+
+    assert ttl_cache.get("a") == 3
+    assert ttl_cache.get("b") == 2
+
+
+def test_zero_size_disables_cache(clock):
+    ttl_cache: TTLCache[str, int] = TTLCache(max_size=0, ttl_seconds=30)
+    ttl_cache.set("a", 1)
+
+    assert ttl_cache.get("a") is None
+
+
+def test_invalidate_and_clear(clock):
+    ttl_cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=30)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+
+    ttl_cache.invalidate("a")
+    ttl_cache.invalidate("missing")
+    assert ttl_cache.get("a") is None
+    assert ttl_cache.get("b") == 2
+
+    ttl_cache.clear()
+    assert len(ttl_cache) == 0
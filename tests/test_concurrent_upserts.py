@@ -0,0 +1,103 @@
+"""Parallel library adds and Supabase logins have to converge on one row.
+
+Every call runs in its own session, so the requests race exactly as
+concurrent API calls would.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, text
+from sqlmodel import select
+
+from app.core.database import session_scope
+from app.models.domain.book import Book
+from app.models.domain.reading_entry import ReadingEntry
+from app.models.domain.reading_stats import UserReadingStats
+from app.models.domain.user import User
+from app.services.auth_service import AuthService
+from app.services.reading_entry_service import ReadingEntryService
+
+pytestmark = pytest.mark.database
+
+CONCURRENCY = 300
+
+
+async def add_book(user_id, book_id):
+    async with session_scope() as session:
+        entry = await ReadingEntryService(session).add_book_to_library(user_id, book_id)
+        return entry.id
+
+
+async def login(supabase_user):
+    async with session_scope() as session:
+        user = await AuthService(session).create_or_update_user_from_supabase(
+            supabase_user
+        )
+        return user.id
+
+
+async def row_version(session, table: str, row_id) -> str:
+    """xmin changes whenever a statement writes a new version of the row"""
+    return await session.scalar(
+        text(f'SELECT xmin::text FROM "{table}" WHERE id = :id'), {"id": row_id}
+    )
+
+
+async def test_repeated_login_and_add_leave_rows_untouched(session):
+    supabase_user = {"email": "racer@example.com", "user_metadata": {}}
+    book = Book(title="Contended", author="Author")
+    session.add(book)
+    await session.commit()
+    user_id = await login(supabase_user)
+    entry_id = await add_book(user_id, book.id)
+    versions = (
+        await row_version(session, "user", user_id),
+        await row_version(session, "readingentry", entry_id),
+    )
+
+    assert await login(supabase_user) == user_id
+    assert await add_book(user_id, book.id) == entry_id
+
+    assert versions == (
+        await row_version(session, "user", user_id),
+        await row_version(session, "readingentry", entry_id),
+    )
+
+
+async def test_concurrent_logins_create_one_user(session):
+    supabase_user = {
+        "email": "racer@example.com",
+        "user_metadata": {"user_name": "racer"},
+    }
+
+    user_ids = await asyncio.gather(
+        *(login(supabase_user) for _ in range(CONCURRENCY))
+    )
+
+    users = await session.scalar(
+        select(func.count()).select_from(User).where(User.email == "racer@example.com")
+    )
+    assert len(set(user_ids)) == 1
+    assert users == 1
+
+
+async def test_concurrent_adds_create_one_entry(session):
+    user = User(username="racer", email="racer@example.com")
+    book = Book(title="Contended", author="Author")
+    session.add_all([user, book])
+    await session.commit()
+
+    entry_ids = await asyncio.gather(
+        *(add_book(user.id, book.id) for _ in range(CONCURRENCY))
+    )
+
+    entries = await session.scalar(
+        select(func.count())
+        .select_from(ReadingEntry)
+        .where(ReadingEntry.user_id == user.id)
+    )
+    stats = await session.get(UserReadingStats, user.id)
+    assert len(set(entry_ids)) == 1
+    assert entries == 1
+    assert stats.want_to_read == 1
@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+import pytest
+from fastapi import Request
+
+from app.core.etag import compute_etag, etag_matches, not_modified
+
+ETAG = compute_etag(UUID(int=1), datetime(2026, 1, 1))
+
+
+def request_with(if_none_match: Optional[str]) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_etag_is_strong_quoted_and_stable():
+    assert ETAG.startswith('"') and ETAG.endswith('"')
+    assert compute_etag(UUID(int=1), datetime(2026, 1, 1)) == ETAG
+
+
+def test_etag_changes_with_any_part():
+    assert compute_etag(UUID(int=1), datetime(2026, 1, 2)) != ETAG
+    assert compute_etag(UUID(int=2), datetime(2026, 1, 1)) != ETAG
+    assert compute_etag(UUID(int=1), datetime(2026, 1, 1), True) != ETAG
+
+
+def test_parts_are_not_concatenated_ambiguously():
+    assert compute_etag("ab", "c") != compute_etag("a", "bc")
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        ETAG,
+        f"W/{ETAG}",
+        "*",
+        f'"other", {ETAG}',
+        f'"other",W/{ETAG} , "third"',
+    ],
+)
+def test_if_none_match_matches(header):
+    assert etag_matches(request_with(header), ETAG)
+
+
+@pytest.mark.parametrize(
+    "header",
+    [None, "", '"other"', '"other", W/"another"', ETAG.strip('"')],
+)
+def test_if_none_match_does_not_match(header):
+    assert not etag_matches(request_with(header), ETAG)
+
+
+def test_not_modified_carries_the_etag():
+    response = not_modified(ETAG)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == ETAG
+    assert response.body == b""
@@ -0,0 +1,106 @@
+import logging
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import logging as app_logging
+from app.core.logging import BoundedQueueHandler, SamplingFilter
+
+
+def make_record(name: str, level: int = logging.INFO, msg: str = "message"):
+    return logging.LogRecord(name, level, __file__, 0, msg, None, None)
+
+
+@pytest.fixture
+def draws(monkeypatch):
+    """Replace random.random() with a fixed sequence of draws"""
+    values: list[float] = []
+    monkeypatch.setattr(
+        app_logging, "random", SimpleNamespace(random=lambda: values.pop(0))
+    )
+    return values
+
+
+def test_unlisted_loggers_are_kept():
+    sampling = SamplingFilter({"app.services": 0.0})
+
+    assert sampling.filter(make_record("app.api"))
+    assert sampling.filter(make_record("uvicorn.access"))
+
+
+def test_rate_keeps_the_share_below_it(draws):
+    sampling = SamplingFilter({"app.services": 0.25})
+    draws.extend([0.1, 0.3, 0.24, 0.9])
+
+    kept = [sampling.filter(make_record("app.services")) for _ in range(4)]
+
+    assert kept == [True, False, True, False]
+
+
+def test_longest_matching_name_wins(draws):
+    sampling = SamplingFilter(
+        {"app": 0.0, "app.services.reading_entry_service": 1.0}
+    )
+
+    assert sampling.filter(make_record("app.services.reading_entry_service"))
+    assert sampling.filter(make_record("app.services.reading_entry_service.sub"))
+    draws.append(0.5)
+    assert not sampling.filter(make_record("app.services.book_service"))
+    assert draws == []
+
+
+@pytest.mark.parametrize("level", [logging.WARNING, logging.ERROR])
+def test_warnings_and_errors_are_always_kept(level):
+    sampling = SamplingFilter({"app": 0.0})
+
+    assert sampling.filter(make_record("app.services", level))
+
+
+def test_debug_records_are_sampled_too():
+    sampling = SamplingFilter({"app": 0.0})
+
+    assert not sampling.filter(make_record("app.services", logging.DEBUG))
+
+
+def test_queue_handler_counts_dropped_records():
+    log_queue: queue.Queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue)
+
+    for number in range(5):
+        handler.emit(make_record("app", msg=f"record {number}"))
+
+    assert handler.dropped == 3
+    assert [log_queue.get_nowait().msg for _ in range(2)] == [
+        "record 0",
+        "record 1",
+    ]
+
+
+def test_queue_handler_reports_drops_before_the_next_record():
+    log_queue: queue.Queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue)
+    for number in range(4):
+        handler.emit(make_record("app", msg=f"record {number}"))
+    log_queue.get_nowait()
+    log_queue.get_nowait()
+
+    handler.emit(make_record("app", msg="after"))
+
+    report = log_queue.get_nowait()
+    assert report.levelno == logging.WARNING
+    assert report.getMessage() == (
+        "Dropped 2 log records because the log queue was full (2 in total)"
+    )
+    assert log_queue.get_nowait().msg == "after"
+
+    # The next report covers only the records lost since the previous one
+    for number in range(4):
+        handler.emit(make_record("app", msg=f"again {number}"))
+    log_queue.get_nowait()
+    log_queue.get_nowait()
+    handler.emit(make_record("app", msg="last"))
+
+    assert log_queue.get_nowait().getMessage() == (
+        "Dropped 2 log records because the log queue was full (4 in total)"
+    )
@@ -0,0 +1,120 @@
+import base64
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.core.pagination import (
+    created_at_page,
+    decode_created_at_cursor,
+    decode_cursor,
+    encode_cursor,
+)
+from app.services.book_service import BookService
+
+
+def raw_cursor(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def test_created_at_cursor_round_trip():
+    created_at = datetime(2024, 5, 17, 13, 45, 12, 123456)
+    entity_id = uuid4()
+
+    cursor = encode_cursor(created_at, entity_id)
+
+    assert decode_created_at_cursor(cursor) == (created_at, entity_id)
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor("a" * 7, "?/+")
+
+    assert "=" not in cursor
+    assert set(cursor) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )
+    assert decode_cursor(cursor) == ["a" * 7, "?/+"]
+
+
+def test_search_cursor_round_trip():
+    book_id = uuid4()
+
+    cursor = encode_cursor(0.0607927, book_id)
+
+    assert BookService._decode_search_cursor(cursor) == (0.0607927, book_id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor",
+        "%%%%",
+        raw_cursor(b"\xff\xfe\xfd"),
+        raw_cursor(b"{not json"),
+        raw_cursor(b'{"created_at": "2024-01-01"}'),
+        raw_cursor(b'["2024-01-01T00:00:00", 42]'),
+        raw_cursor(b"null"),
+    ],
+)
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        ["2024-01-01T00:00:00"],
+        ["2024-01-01T00:00:00", str(uuid4()), "extra"],
+        ["yesterday", str(uuid4())],
+        ["2024-01-01T00:00:00", "not-a-uuid"],
+    ],
+)
+def test_tampered_created_at_cursor_is_rejected(values):
+    cursor = raw_cursor(json.dumps(values).encode())
+
+    with pytest.raises(ValidationError):
+        decode_created_at_cursor(cursor)
+
+
+def test_tampered_search_cursor_is_rejected():
+    cursor = raw_cursor(json.dumps(["high", str(uuid4())]).encode())
+
+    with pytest.raises(ValidationError):
+        BookService._decode_search_cursor(cursor)
+
+
+def test_truncated_cursor_is_rejected():
+    cursor = encode_cursor(datetime(2024, 1, 1), uuid4())
+
+    with pytest.raises(ValidationError):
+        decode_created_at_cursor(cursor[: len(cursor) // 2])
+
+
+def test_created_at_page_points_at_last_item():
+    rows = [
+        SimpleNamespace(created_at=datetime(2024, 1, day), id=UUID(int=day))
+        for day in range(1, 5)
+    ]
+
+    page = created_at_page(rows, limit=3)
+
+    assert page.items == rows[:3]
+    assert decode_created_at_cursor(page.next_cursor) == (
+        datetime(2024, 1, 3),
+        UUID(int=3),
+    )
+
+
+def test_created_at_page_without_extra_row_is_last():
+    rows = [SimpleNamespace(created_at=datetime(2024, 1, 1), id=UUID(int=1))]
+
+    page = created_at_page(rows, limit=1)
+
+    assert page.items == rows
+    assert page.next_cursor is None
@@ -0,0 +1,88 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, func, text, update
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.query_monitor import NPlusOneError, QueryMonitor
+from app.core.timing import RequestTimings, request_timings
+from app.models.domain.book import Book
+from app.models.domain.reading_entry import ReadingEntry, ReadingStatus
+from app.models.domain.user import User
+
+pytestmark = pytest.mark.database
+
+
+@pytest.fixture
+def analyzable():
+    """can_analyze() of each statement executed while the test runs"""
+    decisions: list[bool] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        decisions.append(QueryMonitor.can_analyze(context))
+
+    event.listen(engine.sync_engine, "after_cursor_execute", record)
+    yield decisions
+    event.remove(engine.sync_engine, "after_cursor_execute", record)
+
+
+@pytest.fixture
+def request_scope():
+    token = request_timings.set(RequestTimings())
+    yield
+    request_timings.reset(token)
+
+
+async def test_only_plain_reads_are_analyzed(session, analyzable):
+    changed = (
+        update(Book)
+        .where(Book.id == uuid4())
+        .values(title="Changed")
+        .returning(Book.id)
+        .cte("changed")
+    )
+    statements = [
+        (select(Book).where(Book.title == "x"), True),
+        (select(func.count()).select_from(select(Book.id).cte("books")), True),
+        (update(Book).where(Book.id == uuid4()).values(title="Changed"), False),
+        (select(changed.c.id), False),
+        (select(Book).where(Book.id == uuid4()).with_for_update(), False),
+        (select(func.pg_notify("book_changes", "{}")), False),
+        (text("SELECT 1"), False),
+    ]
+
+    for statement, _ in statements:
+        await session.execute(statement)
+    await session.rollback()
+
+    assert analyzable == [expected for _, expected in statements]
+
+
+async def test_repeated_statement_raises_when_configured(
+    monkeypatch, session, request_scope
+):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "N_PLUS_ONE_RAISE", True)
+    user = User(username="reader", email="reader@example.com")
+    books = [Book(title=f"Book {number}", author="Author") for number in range(5)]
+    session.add(user)
+    session.add_all(books)
+    await session.flush()
+    session.add_all(
+        ReadingEntry(user_id=user.id, book_id=book.id, status=ReadingStatus.COMPLETED)
+        for book in books
+    )
+    await session.commit()
+    session.expunge_all()
+    entries = (
+        await session.scalars(
+            select(ReadingEntry).where(ReadingEntry.user_id == user.id)
+        )
+    ).all()
+
+    # One query per entry for its book, the loop the detector exists for
+    with pytest.raises(NPlusOneError):
+        for entry in entries:
+            await session.get(Book, entry.book_id)
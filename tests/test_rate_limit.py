@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+import redis.asyncio as redis
+from pydantic import ValidationError
+
+from app.core import rate_limit
+from app.core.config import Settings
+from app.core.rate_limit import Budget, MemoryBackend, RedisBackend
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(
+        rate_limit, "time", SimpleNamespace(monotonic=lambda: now.value)
+    )
+    return now
+
+
+async def test_memory_bucket_allows_a_burst_then_refills(clock):
+    backend = MemoryBackend()
+    budget = Budget.per_minute(3)
+
+    assert [await backend.take("user", budget) for _ in range(3)] == [0, 0, 0]
+    assert await backend.take("user", budget) == pytest.approx(20)
+
+    clock.value += 20
+    assert await backend.take("user", budget) == 0
+
+
+async def test_memory_buckets_are_per_key(clock):
+    backend = MemoryBackend()
+    budget = Budget.per_minute(1)
+
+    assert await backend.take("first", budget) == 0
+    assert await backend.take("first", budget) > 0
+    assert await backend.take("second", budget) == 0
+
+
+async def test_memory_budget_is_shared_across_workers(clock):
+    backend = MemoryBackend(workers=4)
+    budget = Budget.per_minute(8)
+
+    assert [await backend.take("user", budget) for _ in range(2)] == [0, 0]
+    assert await backend.take("user", budget) == pytest.approx(30)
+
+
+async def test_memory_share_is_at_least_one_token(clock):
+    backend = MemoryBackend(workers=12)
+    budget = Budget.per_minute(10)
+
+    assert await backend.take("user", budget) == 0
+    assert await backend.take("user", budget) == pytest.approx(72)
+
+
+@pytest.mark.parametrize("limit", ["AUTH", "READ", "WRITE", "BULK"])
+def test_limits_must_be_positive(monkeypatch, limit):
+    monkeypatch.setenv(f"RATE_LIMIT_{limit}_PER_MINUTE", "0")
+
+    with pytest.raises(ValidationError, match="greater than 0"):
+        Settings()
+
+
+async def test_redis_errors_fail_open(caplog):
+    backend = RedisBackend("redis://localhost:6379/0")
+
+    async def unavailable(**kwargs):
+        raise redis.ConnectionError("connection refused")
+
+    backend.script = unavailable
+
+    assert await backend.take("user", Budget.per_minute(1)) == 0
+    assert "Redis unavailable" in caplog.text
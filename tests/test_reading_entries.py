@@ -0,0 +1,188 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import engine, session_scope
+from app.core.exceptions import NotFoundError, ValidationError
+from app.models.domain.book import Book
+from app.models.domain.reading_entry import ReadingEntry, ReadingStatus
+from app.models.domain.user import User
+from app.services.reading_entry_service import ReadingEntryService
+from app.services.reading_stats_service import ReadingStatsService
+
+pytestmark = pytest.mark.database
+
+
+@pytest.fixture
+async def entry(session) -> ReadingEntry:
+    """A freshly added WANT_TO_READ entry"""
+    user = User(username="reader", email="reader@example.com")
+    book = Book(title="Book", author="Author")
+    session.add_all([user, book])
+    await session.commit()
+    return await ReadingEntryService(session).add_book_to_library(user.id, book.id)
+
+
+async def assert_stats_match_entries(session, user_id) -> None:
+    """The incrementally kept stats equal a rebuild from the entries"""
+    stats = ReadingStatsService(session)
+    kept = await stats.get_user_stats(user_id)
+    await stats.rebuild(user_id)
+    assert kept == await stats.get_user_stats(user_id)
+
+
+@pytest.fixture
+def statements():
+    """SQL statements sent to the database while the test runs"""
+    executed: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def test_include_book_loads_entries_with_one_select(session, statements):
+    user = User(username="reader", email="reader@example.com")
+    books = [Book(title=f"Book {number}", author="Author") for number in range(5)]
+    session.add(user)
+    session.add_all(books)
+    await session.flush()
+    session.add_all(
+        ReadingEntry(user_id=user.id, book_id=book.id, status=ReadingStatus.COMPLETED)
+        for book in books
+    )
+    await session.commit()
+    session.expunge_all()
+    statements.clear()
+
+    page = await ReadingEntryService(session).get_user_entries(
+        user.id, include_book=True
+    )
+
+    assert sorted(entry.book.title for entry in page.items) == [
+        book.title for book in books
+    ]
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 1, selects
+
+
+async def test_adding_unknown_book_is_not_found(session):
+    user = User(username="reader", email="reader@example.com")
+    session.add(user)
+    await session.commit()
+
+    with pytest.raises(NotFoundError) as error:
+        await ReadingEntryService(session).add_book_to_library(user.id, uuid4())
+    assert error.value.resource == "Book"
+
+
+async def test_adding_book_for_unknown_user_is_not_found(session):
+    book = Book(title="Book", author="Author")
+    session.add(book)
+    await session.commit()
+
+    with pytest.raises(NotFoundError) as error:
+        await ReadingEntryService(session).add_book_to_library(uuid4(), book.id)
+    assert error.value.resource == "User"
+
+
+async def test_start_reading_sets_start_date_once(session, entry):
+    service = ReadingEntryService(session)
+
+    started = await service.start_reading(entry.id)
+    assert started.status == ReadingStatus.IN_PROGRESS
+    assert started.start_date is not None
+
+    again = await service.start_reading(entry.id)
+    assert again.start_date == started.start_date
+    await assert_stats_match_entries(session, entry.user_id)
+
+
+async def test_progress_moves_between_statuses(session, entry):
+    service = ReadingEntryService(session)
+
+    reading = await service.update_reading_progress(entry.id, Decimal("40"))
+    assert (reading.status, reading.progress) == (ReadingStatus.IN_PROGRESS, 40)
+    assert reading.start_date is not None
+
+    reset = await service.update_reading_progress(entry.id, Decimal("0"))
+    assert (reset.status, reset.progress) == (ReadingStatus.WANT_TO_READ, 0)
+    assert reset.start_date is None
+
+    done = await service.update_reading_progress(entry.id, Decimal("100"))
+    assert (done.status, done.progress) == (ReadingStatus.COMPLETED, 100)
+    assert done.start_date is not None
+    assert done.end_date is not None
+    await assert_stats_match_entries(session, entry.user_id)
+
+
+async def test_complete_keeps_the_first_end_date(session, entry):
+    service = ReadingEntryService(session)
+
+    completed = await service.complete_reading(entry.id)
+    assert (completed.status, completed.progress) == (ReadingStatus.COMPLETED, 100)
+    assert completed.start_date == completed.created_at
+    assert completed.end_date is not None
+
+    again = await service.complete_reading(entry.id)
+    assert again.end_date == completed.end_date
+    await assert_stats_match_entries(session, entry.user_id)
+
+
+async def test_abandon_keeps_progress_and_dates(session, entry):
+    service = ReadingEntryService(session)
+    reading = await service.update_reading_progress(entry.id, Decimal("30"))
+
+    abandoned = await service.abandon_reading(entry.id)
+
+    assert abandoned.status == ReadingStatus.ABANDONED
+    assert abandoned.progress == 30
+    assert abandoned.start_date == reading.start_date
+    await assert_stats_match_entries(session, entry.user_id)
+
+
+@pytest.mark.parametrize("progress", ["-1", "100.5"])
+async def test_out_of_range_progress_is_rejected(session, entry, progress):
+    with pytest.raises(ValidationError) as error:
+        await ReadingEntryService(session).update_reading_progress(
+            entry.id, Decimal(progress)
+        )
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "transition",
+    [
+        lambda service, entry_id: service.start_reading(entry_id),
+        lambda service, entry_id: service.update_reading_progress(entry_id, 50),
+        lambda service, entry_id: service.complete_reading(entry_id),
+        lambda service, entry_id: service.abandon_reading(entry_id),
+        lambda service, entry_id: service.update_review(entry_id, 4),
+    ],
+)
+async def test_transition_of_unknown_entry_is_not_found(session, transition):
+    with pytest.raises(NotFoundError) as error:
+        await transition(ReadingEntryService(session), uuid4())
+    assert error.value.resource == "Reading entry"
+
+
+async def test_stats_delta_comes_from_the_row_being_replaced(session, entry):
+    # Another request completes the entry; this session's copy is now stale
+    async with session_scope() as other:
+        await ReadingEntryService(other).complete_reading(entry.id)
+    assert entry.status == ReadingStatus.WANT_TO_READ
+
+    await ReadingEntryService(session).update_review(entry.id, 4)
+    abandoned = await ReadingEntryService(session).abandon_reading(entry.id)
+
+    assert abandoned.rating == 4
+    stats = await ReadingStatsService(session).get_user_stats(entry.user_id)
+    assert (stats.want_to_read, stats.completed, stats.abandoned) == (0, 0, 1)
+    assert (stats.rating_count, stats.average_rating) == (1, 4)
+    assert stats.completed_by_month == []
+    await assert_stats_match_entries(session, entry.user_id)
@@ -0,0 +1,26 @@
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import NotFoundError
+from app.models.domain.user import User
+from app.services.reading_stats_service import ReadingStatsService
+
+pytestmark = pytest.mark.database
+
+
+async def test_unknown_user_is_not_found(session):
+    with pytest.raises(NotFoundError):
+        await ReadingStatsService(session).get_user_stats(uuid4())
+
+
+async def test_user_without_entries_has_empty_stats(session):
+    user = User(username="reader", email="reader@example.com")
+    session.add(user)
+    await session.commit()
+
+    stats = await ReadingStatsService(session).get_user_stats(user.id)
+
+    assert stats.total == 0
+    assert stats.average_rating is None
+    assert stats.completed_by_month == []
@@ -0,0 +1,106 @@
+import time
+from typing import Annotated
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import get_session, is_read_only, reads_from_replica
+from app.core.routing import SessionReleasingRoute
+
+COOKIE = settings.DB_PRIMARY_COOKIE_NAME
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    # Sessions connect lazily, so the primary engine can stand in for a
+    # replica without any statement being run
+    monkeypatch.setattr(database, "replica_engine", database.engine)
+
+
+def request_for(method: str, openapi_extra=None) -> Request:
+    route = SessionReleasingRoute("/", lambda: None, openapi_extra=openapi_extra)
+    return Request({"type": "http", "method": method, "headers": [], "route": route})
+
+
+def test_without_replica_everything_uses_the_primary():
+    assert database.replica_engine is None
+    assert not reads_from_replica(True, {})
+
+
+def test_reads_use_the_replica_without_a_cookie(replica):
+    assert reads_from_replica(True, {})
+
+
+def test_open_window_keeps_reads_on_the_primary(replica):
+    cookies = {COOKIE: str(int(time.time()) + 60)}
+
+    assert not reads_from_replica(True, cookies)
+
+
+def test_expired_window_returns_reads_to_the_replica(replica):
+    cookies = {COOKIE: str(int(time.time()) - 1)}
+
+    assert reads_from_replica(True, cookies)
+
+
+def test_malformed_cookie_is_ignored(replica):
+    assert reads_from_replica(True, {COOKIE: "soon"})
+
+
+def test_writes_always_use_the_primary(replica):
+    assert not reads_from_replica(False, {})
+
+
+@pytest.mark.parametrize(
+    "method, openapi_extra, read_only",
+    [
+        ("GET", None, True),
+        ("HEAD", None, True),
+        ("POST", None, False),
+        ("PATCH", None, False),
+        ("DELETE", None, False),
+        ("POST", {"x-read-only": True}, True),
+        ("GET", {"x-read-only": False}, False),
+    ],
+)
+def test_read_only_by_method_unless_the_route_says_otherwise(
+    method, openapi_extra, read_only
+):
+    assert is_read_only(request_for(method, openapi_extra)) == read_only
+
+
+@pytest.fixture
+def client(replica) -> TestClient:
+    router = APIRouter(route_class=SessionReleasingRoute)
+
+    # Endpoints returning their own Response, as model_response routes do
+    @router.post("/write")
+    async def write(session: Annotated[AsyncSession, Depends(get_session)]):
+        return JSONResponse({})
+
+    @router.post("/read", openapi_extra={"x-read-only": True})
+    async def read(session: Annotated[AsyncSession, Depends(get_session)]):
+        return JSONResponse({})
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_write_response_opens_the_primary_window(client):
+    response = client.post("/write")
+
+    until = int(response.cookies[COOKIE])
+    window = settings.DB_READ_YOUR_WRITES_SECONDS
+    assert time.time() < until <= time.time() + window
+
+
+def test_read_only_post_sets_no_cookie(client):
+    response = client.post("/read")
+
+    assert COOKIE not in response.cookies
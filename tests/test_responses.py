@@ -0,0 +1,49 @@
+import time
+
+from pydantic import BaseModel
+
+from app.core import database, timing
+from app.core.responses import model_response
+from app.core.routing import _release_session_after
+
+
+class Item(BaseModel):
+    name: str
+
+
+class RequestSession:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+async def test_session_is_released_before_serializing():
+    session = RequestSession()
+    database.request_session.set(session)
+
+    class Row:
+        @property
+        def name(self):
+            assert session.closed, "serialized while holding the connection"
+            return "row"
+
+    response = await model_response(list[Item], [Row()])
+
+    assert response.body == b'[{"name":"row"}]'
+
+
+async def test_serialize_time_is_not_counted_as_app_time():
+    timings = timing.RequestTimings()
+    timing.request_timings.set(timings)
+
+    @_release_session_after
+    async def endpoint():
+        with timing.measure("serialize"):
+            time.sleep(0.05)
+
+    await endpoint()
+
+    assert timings.durations["serialize"] >= 0.05
+    assert timings.durations["app"] < 0.05